@@ -0,0 +1,122 @@
+# audio_codec_benchmark.py
+# Question audio size and cost per output format (mp3 = the TTS output as is, mp3-low, opus):
+# - payload bytes and the time to download them over a slow link (--link-kbps)
+# - server transcoding time (AudioTranscoder, ffmpeg) and time to the first transcoded chunk
+# - decode time of the delivered audio (ffmpeg -benchmark), a proxy for client decode cost
+#
+# The source is synthesized with gTTS (--text, needs network access), read from --source, or by
+# default generated with ffmpeg as a 24 kHz mono 32 kbps MP3 like gTTS output.
+#
+# Usage (from the Backend directory):
+#   python -m benchmarks.audio_codec_benchmark --repeats 10
+#   python -m benchmarks.audio_codec_benchmark --text "Walk me through a system you designed end to end." --link-kbps 250
+#   FFMPEG_PATH=/path/to/ffmpeg python -m benchmarks.audio_codec_benchmark --source question.mp3
+import argparse
+import asyncio
+import io
+import os
+import re
+import statistics
+import subprocess
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.audio_codec import AUDIO_FORMATS, SOURCE_FORMAT, AudioTranscoder
+from services.audio_store import AudioClip
+
+SOURCE_CHUNK_BYTES = 4096 # Source chunk size fed to the transcoder, as TTS produces it
+
+
+def generate_source(ffmpeg_path: str, seconds: float) -> bytes:
+    """A speech-like (amplitude modulated) tone encoded like gTTS output."""
+    return subprocess.run(
+        [ffmpeg_path, "-nostdin", "-loglevel", "error", "-f", "lavfi", "-i", f"sine=frequency=200:duration={seconds}",
+         "-af", "volume='0.5+0.5*sin(2*PI*3*t)':eval=frame", "-ar", "24000", "-ac", "1", "-b:a", "32k", "-f", "mp3", "pipe:1"],
+        check=True, capture_output=True).stdout
+
+
+def synthesize_source(text: str) -> bytes:
+    from gtts import gTTS
+
+    buffer = io.BytesIO()
+    gTTS(text=text, lang="en").write_to_fp(buffer)
+    return buffer.getvalue()
+
+
+def decode_seconds(ffmpeg_path: str, audio: bytes) -> float:
+    """Decode time reported by ffmpeg -benchmark (excludes process startup)."""
+    result = subprocess.run([ffmpeg_path, "-nostdin", "-hide_banner", "-benchmark", "-i", "pipe:0", "-f", "s16le", "-"],
+                            input=audio, capture_output=True, check=True)
+    match = re.search(rb"bench: utime=([\d.]+)s stime=([\d.]+)s", result.stderr)
+    return float(match.group(1)) + float(match.group(2)) if match else float("nan")
+
+
+async def transcode_once(transcoder: AudioTranscoder, source: bytes, audio_format: str):
+    """Returns (output bytes, seconds to the first output chunk, total seconds)."""
+    source_clip, target = AudioClip(), AudioClip(media_type=AUDIO_FORMATS[audio_format].media_type)
+    for offset in range(0, len(source), SOURCE_CHUNK_BYTES):
+        await source_clip.append(source[offset:offset + SOURCE_CHUNK_BYTES])
+    await source_clip.finish()
+    started = time.perf_counter()
+    first_chunk_seconds = None
+
+    async def watch_first_chunk():
+        nonlocal first_chunk_seconds
+        async for _ in target.iter_chunks():
+            if first_chunk_seconds is None:
+                first_chunk_seconds = time.perf_counter() - started
+
+    watcher = asyncio.create_task(watch_first_chunk())
+    await transcoder.transcode(source_clip, target, audio_format)
+    total_seconds = time.perf_counter() - started
+    await watcher
+    return b"".join(target.chunks), first_chunk_seconds or total_seconds, total_seconds
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Question audio payload size, transcoding and decode time per format.")
+    parser.add_argument("--source", help="MP3 file to use as the TTS output")
+    parser.add_argument("--text", help="Synthesize the source with gTTS (needs network access)")
+    parser.add_argument("--seconds", type=float, default=12.0, help="Length of the generated source (s)")
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--link-kbps", type=float, default=400.0, help="Link speed for the download time column")
+    parser.add_argument("--mp3-low-kbps", type=int, default=AUDIO_FORMATS["mp3-low"].default_bitrate_kbps)
+    parser.add_argument("--opus-kbps", type=int, default=AUDIO_FORMATS["opus"].default_bitrate_kbps)
+    args = parser.parse_args()
+
+    transcoder = AudioTranscoder(ffmpeg_path=os.environ.get("FFMPEG_PATH") or None,
+                                 bitrates_kbps={"mp3-low": args.mp3_low_kbps, "opus": args.opus_kbps})
+    if transcoder.ffmpeg_path is None:
+        sys.exit("ffmpeg not found: install it or set FFMPEG_PATH.")
+    if args.source:
+        with open(args.source, "rb") as f:
+            source = f.read()
+    elif args.text:
+        source = synthesize_source(args.text)
+    else:
+        source = generate_source(transcoder.ffmpeg_path, args.seconds)
+
+    print(f"\nSource: {len(source)} bytes ({args.source or ('gTTS' if args.text else f'generated {args.seconds:g}s tone')}), "
+          f"link {args.link_kbps:g} kbps, {args.repeats} repeats\n")
+    print(f"{'format':<9}{'media type':<12}{'bytes':>9}{'vs mp3':>8}{'download (s)':>14}"
+          f"{'first chunk (ms)':>18}{'transcode (ms)':>16}{'decode (ms)':>13}")
+    for audio_format in AUDIO_FORMATS:
+        first_chunk_ms, transcode_ms = [], []
+        if audio_format == SOURCE_FORMAT:
+            output = source
+        else:
+            for _ in range(args.repeats):
+                output, first_chunk, total = await transcode_once(transcoder, source, audio_format)
+                first_chunk_ms.append(1000 * first_chunk)
+                transcode_ms.append(1000 * total)
+        decode_ms = statistics.median(1000 * decode_seconds(transcoder.ffmpeg_path, output) for _ in range(args.repeats))
+        print(f"{audio_format:<9}{AUDIO_FORMATS[audio_format].media_type:<12}{len(output):>9}{len(output) / len(source):>8.2f}"
+              f"{8 * len(output) / 1000 / args.link_kbps:>14.2f}"
+              f"{statistics.median(first_chunk_ms) if first_chunk_ms else 0.0:>18.1f}"
+              f"{statistics.median(transcode_ms) if transcode_ms else 0.0:>16.1f}{decode_ms:>13.1f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
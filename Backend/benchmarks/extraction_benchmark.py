@@ -0,0 +1,108 @@
+# extraction_benchmark.py
+# Benchmarks resume text extraction on synthetic 1-50 page PDFs: inline on the event loop
+# vs. in the DocumentExtractionPool. Reports per-document latency, throughput for a burst of
+# concurrent documents, and the worst event loop stall seen while extracting.
+#
+# Usage (from the Backend directory):
+#   python -m benchmarks.extraction_benchmark --pages 1 5 10 25 50 --concurrency 8
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.resume_parser import extract_text
+from services.extraction_pool import DocumentExtractionPool
+
+LINES_PER_PAGE = 55
+
+
+def build_pdf(num_pages: int) -> bytes:
+    """Builds a minimal multi-page text PDF (Helvetica, ~55 resume-like lines per page)."""
+    objects = []
+    page_ids = [4 + 2 * i for i in range(num_pages)]
+    objects.append(b"<< /Type /Catalog /Pages 2 0 R >>")
+    kids = " ".join(f"{page_id} 0 R" for page_id in page_ids)
+    objects.append(f"<< /Type /Pages /Kids [{kids}] /Count {num_pages} >>".encode())
+    objects.append(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+    for page in range(num_pages):
+        lines = [f"({page + 1}.{line} Built a Python and AWS data pipeline processing 2M events per day with Kafka.) Tj T*"
+                 for line in range(LINES_PER_PAGE)]
+        stream = ("BT /F1 9 Tf 12 TL 40 760 Td " + " ".join(lines) + " ET").encode()
+        content_id = page_ids[page] + 1
+        objects.append(f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Contents {content_id} 0 R "
+                       f"/Resources << /Font << /F1 3 0 R >> >> >>".encode())
+        objects.append(b"<< /Length " + str(len(stream)).encode() + b" >>\nstream\n" + stream + b"\nendstream")
+
+    pdf = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(pdf))
+        pdf += f"{number} 0 obj\n".encode() + body + b"\nendobj\n"
+    xref_offset = len(pdf)
+    pdf += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+    for offset in offsets:
+        pdf += f"{offset:010d} 00000 n \n".encode()
+    pdf += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref_offset}\n%%EOF\n".encode()
+    return bytes(pdf)
+
+
+async def measure_loop_stall(stop: asyncio.Event, interval: float = 0.005) -> float:
+    """Returns the worst delay (s) of a periodic timer on the event loop until stop is set."""
+    worst = 0.0
+    while not stop.is_set():
+        expected = time.perf_counter() + interval
+        await asyncio.sleep(interval)
+        worst = max(worst, time.perf_counter() - expected)
+    return worst
+
+
+async def run_burst(documents, pool):
+    """Extracts all documents concurrently; returns (elapsed seconds, worst loop stall seconds)."""
+    stop = asyncio.Event()
+    stall_task = asyncio.create_task(measure_loop_stall(stop))
+    started = time.perf_counter()
+
+    async def extract_one(document):
+        if pool is None:
+            return extract_text(document, "pdf") # Inline: blocks the event loop
+        return await pool.run(extract_text, document, "pdf")
+
+    await asyncio.gather(*(extract_one(document) for document in documents))
+    elapsed = time.perf_counter() - started
+    stop.set()
+    return elapsed, await stall_task
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Resume extraction benchmark: inline vs process pool.")
+    parser.add_argument("--pages", type=int, nargs="+", default=[1, 5, 10, 25, 50])
+    parser.add_argument("--concurrency", type=int, default=8, help="Documents extracted at once per burst")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 2)
+    args = parser.parse_args()
+
+    pool = DocumentExtractionPool(max_workers=args.workers, timeout_seconds=120)
+    await pool.run(extract_text, build_pdf(1), "pdf") # Warm up worker processes
+
+    print(f"{'pages':>6}{'size KB':>9}{'single ms':>11}"
+          f"{'inline docs/s':>15}{'inline stall ms':>17}{'pool docs/s':>13}{'pool stall ms':>15}")
+    for num_pages in args.pages:
+        document = build_pdf(num_pages)
+        started = time.perf_counter()
+        text = extract_text(document, "pdf")
+        single_ms = 1000 * (time.perf_counter() - started)
+        assert text, "extraction produced no text"
+
+        documents = [document] * args.concurrency
+        inline_elapsed, inline_stall = await run_burst(documents, None)
+        pool_elapsed, pool_stall = await run_burst(documents, pool)
+        print(f"{num_pages:>6}{len(document) / 1024:>9.1f}{single_ms:>11.1f}"
+              f"{args.concurrency / inline_elapsed:>15.1f}{1000 * inline_stall:>17.1f}"
+              f"{args.concurrency / pool_elapsed:>13.1f}{1000 * pool_stall:>15.1f}")
+    pool.shutdown()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,246 @@
+# load_test.py
+# Load generator for full interview flows: /start-interview, then /submit-answer (or
+# /submit-answer/stream) until the interview ends. Runs a number of interviews with bounded
+# concurrency and reports throughput plus p50/p95/p99 latency per endpoint.
+#
+# Without --base-url, the backend and the mock Groq API (benchmarks/mock_groq.py) are started
+# in-process with the stub TTS backend, so no API key or network access is needed.
+#
+# Usage (from the Backend directory):
+#   python -m benchmarks.load_test --interviews 50 --concurrency 10
+#   python -m benchmarks.load_test --interviews 50 --concurrency 10 --stream --fetch-audio
+#   python -m benchmarks.load_test --interviews 20 --answer-segments 3 --segment-seconds 2 --stt-seconds-per-mb 30 [--upload-segments]
+#   python -m benchmarks.load_test --base-url http://127.0.0.1:8000 --interviews 200 --concurrency 40
+import argparse
+import asyncio
+import json
+import math
+import os
+import sys
+import threading
+import time
+from collections import defaultdict
+from typing import Dict, List, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx
+
+from benchmarks.extraction_benchmark import build_pdf
+
+ANSWER_AUDIO = b"\x1a\x45\xdf\xa3" + b"\x00" * 16 * 1024 # WebM magic + ~16 KB of filler
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(0, math.ceil(fraction * len(sorted_values)) - 1)
+    return sorted_values[rank]
+
+
+class Recorder:
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Dict[str, int] = defaultdict(int)
+        self.interviews_completed = 0
+
+    def record(self, endpoint: str, seconds: float, ok: bool = True):
+        self.latencies[endpoint].append(seconds)
+        if not ok:
+            self.errors[endpoint] += 1
+
+
+def resume_pdf(index: int) -> bytes:
+    # A trailing comment makes every resume unique, so the resume parse cache does not hide the parsing cost.
+    return build_pdf(1) + f"% load-test candidate {index}\n".encode()
+
+
+async def read_sse(response: httpx.Response) -> Dict[str, dict]:
+    """Collects the events of a /submit-answer/stream response by name (the last one of each name wins)."""
+    events = {}
+    event_name = None
+    async for line in response.aiter_lines():
+        if line.startswith("event:"):
+            event_name = line[len("event:"):].strip()
+        elif line.startswith("data:") and event_name:
+            events[event_name] = json.loads(line[len("data:"):].strip())
+    return events
+
+
+async def fetch_audio(client: httpx.AsyncClient, recorder: Recorder, audio_url: Optional[str]):
+    if not audio_url:
+        return
+    started = time.perf_counter()
+    try:
+        response = await client.get(audio_url)
+        recorder.record("GET /audio", time.perf_counter() - started, response.status_code == 200)
+    except httpx.HTTPError:
+        recorder.record("GET /audio", time.perf_counter() - started, ok=False)
+
+
+async def record_answer(client: httpx.AsyncClient, recorder: Recorder, session_id: str, question_id: str,
+                        segments: int, segment_seconds: float, upload: bool) -> int:
+    """
+    Simulates a candidate speaking for `segments` segments of segment_seconds plus a tail. With upload,
+    each segment is uploaded as soon as it is recorded. Returns the number of segments uploaded.
+    """
+    for index in range(segments):
+        await asyncio.sleep(segment_seconds) # The candidate is speaking
+        if not upload:
+            continue
+        started = time.perf_counter()
+        try:
+            response = await client.post("/answer-audio/segment",
+                                         data={"session_id": session_id, "question_id": question_id, "index": str(index)},
+                                         files={"audio_file": (f"segment-{index}.webm", ANSWER_AUDIO, "audio/webm")})
+            ok = response.status_code == 200
+        except httpx.HTTPError:
+            ok = False
+        recorder.record("POST /answer-audio/segment", time.perf_counter() - started, ok)
+        if not ok:
+            return index
+    await asyncio.sleep(segment_seconds / 2) # The tail of the answer
+    return segments if upload else 0
+
+
+async def submit_answer(client: httpx.AsyncClient, recorder: Recorder, session_id: str, question_id: str,
+                        stream: bool, audio: bytes = ANSWER_AUDIO, segment_count: int = 0) -> Optional[dict]:
+    """Submits one answer. Returns {"next_action", "question", "audio_url"} or None on failure."""
+    endpoint = "/submit-answer/stream" if stream else "/submit-answer"
+    data = {"session_id": session_id, "question_id": question_id, "is_timeout": "false", "force_end": "false",
+            "segment_count": str(segment_count)}
+    files = {"audio_file": ("answer.webm", audio, "audio/webm")}
+    started = time.perf_counter()
+    try:
+        if stream:
+            async with client.stream("POST", endpoint, data=data, files=files) as response:
+                events = await read_sse(response) if response.status_code == 200 else {}
+            result = events.get("question") or events.get("overall_evaluation")
+        else:
+            response = await client.post(endpoint, data=data, files=files)
+            result = response.json() if response.status_code == 200 else None
+    except httpx.HTTPError:
+        result = None
+    recorder.record(f"POST {endpoint}", time.perf_counter() - started, result is not None)
+    return result
+
+
+async def run_interview(client: httpx.AsyncClient, recorder: Recorder, index: int, max_answers: int,
+                        stream: bool, audio: bool, segments: int = 0, segment_seconds: float = 0.0,
+                        upload_segments: bool = False):
+    started = time.perf_counter()
+    try:
+        response = await client.post("/start-interview", data={"domain": "Software Engineering"},
+                                     files={"resume": (f"candidate-{index}.pdf", resume_pdf(index), "application/pdf")})
+        ok = response.status_code == 200
+    except httpx.HTTPError:
+        ok = False
+    recorder.record("POST /start-interview", time.perf_counter() - started, ok)
+    if not ok:
+        return
+    body = response.json()
+    session_id, question = body["session_id"], body["question"]
+    if audio:
+        await fetch_audio(client, recorder, body.get("audio_url"))
+
+    for _ in range(max_answers):
+        segment_count = await record_answer(client, recorder, session_id, question["id"], segments, segment_seconds, upload_segments)
+        # Without segment uploads, the whole answer (every segment plus the tail) is uploaded at the end.
+        answer_audio = ANSWER_AUDIO + b"\x00" * (len(ANSWER_AUDIO) * (segments - segment_count))
+        result = await submit_answer(client, recorder, session_id, question["id"], stream, answer_audio, segment_count)
+        if result is None:
+            return
+        if result["next_action"] == "end_interview":
+            recorder.interviews_completed += 1
+            return
+        question = result["question"]
+        if audio:
+            await fetch_audio(client, recorder, result.get("audio_url"))
+
+
+def start_server(app, port: int):
+    """Runs an ASGI app with uvicorn on its own thread and event loop."""
+    import uvicorn
+
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+    return server
+
+
+def start_in_process(args) -> str:
+    """Starts the mock Groq API and the backend (pointed at it, with stub TTS). Returns the backend URL."""
+    from benchmarks.mock_groq import LatencyModel, create_app
+
+    mock_app = create_app(LatencyModel.parse(args.chat_latency), LatencyModel.parse(args.stt_latency),
+                          token_delay=args.token_delay, error_rate=args.error_rate, stt_seconds_per_mb=args.stt_seconds_per_mb)
+    start_server(mock_app, args.mock_port)
+
+    # Settings are read when dakshy is imported, so they are passed as environment variables.
+    os.environ.update({
+        "GROQ_API_KEY": "mock",
+        "GROQ_API_BASE_URL": f"http://127.0.0.1:{args.mock_port}/openai/v1",
+        "GROQ_REQUESTS_PER_MINUTE": "1000000", # Measure the service, not the client-side Groq quota
+        "GROQ_TOKENS_PER_MINUTE": "1000000000",
+        "TTS_BACKEND": "stub",
+        "TTS_STUB_LATENCY_SECONDS": str(args.tts_latency),
+        "LOG_LEVEL": "WARNING",
+    })
+    import dakshy
+
+    start_server(dakshy.app, args.port)
+    return f"http://127.0.0.1:{args.port}"
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Load test of full interview flows with per-endpoint latency percentiles.")
+    parser.add_argument("--base-url", help="Backend to test. Default: start backend + mock Groq in-process")
+    parser.add_argument("--interviews", type=int, default=20)
+    parser.add_argument("--concurrency", type=int, default=5, help="Interviews running at once")
+    parser.add_argument("--answers", type=int, default=5, help="Maximum answers submitted per interview")
+    parser.add_argument("--stream", action="store_true", help="Use /submit-answer/stream instead of /submit-answer")
+    parser.add_argument("--fetch-audio", action="store_true", help="Download every question's audio")
+    parser.add_argument("--answer-segments", type=int, default=0, help="Answer length in segments of ANSWER_AUDIO size (plus a tail)")
+    parser.add_argument("--segment-seconds", type=float, default=0.0, help="Simulated speaking time per segment (s)")
+    parser.add_argument("--upload-segments", action="store_true", help="Upload segments to /answer-audio/segment while speaking")
+    parser.add_argument("--port", type=int, default=8901, help="In-process backend port")
+    parser.add_argument("--mock-port", type=int, default=8900, help="In-process mock Groq port")
+    parser.add_argument("--chat-latency", default="0.8,2.0", help="Mock time to first token: median,p95 (s)")
+    parser.add_argument("--stt-latency", default="0.5,1.2", help="Mock transcription latency: median,p95 (s)")
+    parser.add_argument("--stt-seconds-per-mb", type=float, default=0.0, help="Mock extra transcription latency per MB of audio")
+    parser.add_argument("--token-delay", type=float, default=0.01, help="Mock delay between streamed words (s)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of mock Groq calls failing with 429/503")
+    parser.add_argument("--tts-latency", type=float, default=0.3, help="Stub TTS latency per 100 characters (s)")
+    args = parser.parse_args()
+
+    base_url = args.base_url or start_in_process(args)
+    recorder = Recorder()
+    semaphore = asyncio.Semaphore(args.concurrency)
+
+    async def limited(client, index):
+        async with semaphore:
+            await run_interview(client, recorder, index, args.answers, args.stream, args.fetch_audio,
+                                args.answer_segments, args.segment_seconds, args.upload_segments)
+
+    limits = httpx.Limits(max_connections=args.concurrency * 2, max_keepalive_connections=args.concurrency * 2)
+    async with httpx.AsyncClient(base_url=base_url, timeout=300, limits=limits) as client:
+        started = time.perf_counter()
+        await asyncio.gather(*(limited(client, index) for index in range(args.interviews)))
+        elapsed = time.perf_counter() - started
+
+    total_requests = sum(len(latencies) for latencies in recorder.latencies.values())
+    print(f"\n{args.interviews} interviews at concurrency {args.concurrency} in {elapsed:.2f}s "
+          f"({recorder.interviews_completed} completed): {recorder.interviews_completed / elapsed:.2f} interviews/s, "
+          f"{total_requests / elapsed:.2f} requests/s\n")
+    print(f"{'endpoint':<28}{'count':>7}{'errors':>8}{'p50 (s)':>10}{'p95 (s)':>10}{'p99 (s)':>10}{'max (s)':>10}")
+    for endpoint, latencies in recorder.latencies.items():
+        latencies = sorted(latencies)
+        print(f"{endpoint:<28}{len(latencies):>7}{recorder.errors[endpoint]:>8}"
+              f"{percentile(latencies, 0.50):>10.3f}{percentile(latencies, 0.95):>10.3f}"
+              f"{percentile(latencies, 0.99):>10.3f}{latencies[-1]:>10.3f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,218 @@
+# mock_groq.py
+# Local stand-in for the Groq API endpoints GroqService uses: chat completions (JSON and
+# server-sent event streams) and Whisper transcriptions. Responses are canned but shaped like
+# Groq's, and each call waits for a latency drawn from a log-normal distribution given by its
+# median and p95, so load tests see realistic upstream behaviour without an API key.
+#
+# Usage (from the Backend directory):
+#   python -m benchmarks.mock_groq --port 8900 --chat-latency 0.8,2.0 --stt-latency 0.5,1.2
+#   python -m benchmarks.mock_groq --model-latency llama3-8b-8192=0.3 --model-invalid-rate llama3-8b-8192=0.1
+#   GROQ_API_BASE_URL=http://127.0.0.1:8900/openai/v1 TTS_BACKEND=stub uvicorn dakshy:app
+import argparse
+import asyncio
+import json
+import math
+import random
+import time
+import uuid
+from typing import Any, Dict, Optional
+
+from fastapi import FastAPI, File, Form, Request, UploadFile
+from fastapi.responses import JSONResponse, StreamingResponse
+
+RESUME_JSON = {
+    "name": "Alex Mock",
+    "email": "alex.mock@example.com",
+    "phone": "+1-555-0100",
+    "experience": "4 years as Backend Engineer, 1 year as Data Engineer",
+    "skills": ["Python", "FastAPI", "PostgreSQL", "Kafka", "AWS", "Docker"],
+    "projects": [
+        {"title": "Event pipeline", "description": "Built a Kafka and Python pipeline processing 2M events per day on AWS."},
+        {"title": "Interview API", "description": "Designed a FastAPI service with PostgreSQL and Redis caching."},
+    ],
+    "education": "B.Sc. Computer Science",
+}
+
+FEEDBACK = ("You gave a clear overview and tied it to a concrete project. "
+            "Quantifying the impact and naming the trade-offs you considered would make the answer stronger.")
+
+QUESTIONS = [
+    "You mentioned an event pipeline processing two million events per day. How did you handle back-pressure when a consumer fell behind?",
+    "Walk me through how you would design rate limiting for a public API serving thousands of clients.",
+    "Tell me about a time you disagreed with a teammate on a technical decision. How did you resolve it?",
+    "How would you find the cause of a sudden increase in p99 latency in a FastAPI service?",
+]
+
+
+class LatencyModel:
+    """Log-normal latency parameterized by its median and 95th percentile (seconds)."""
+    def __init__(self, median: float, p95: float):
+        self.median = median
+        self.sigma = math.log(p95 / median) / 1.645 if p95 > median > 0 else 0.0
+
+    @classmethod
+    def parse(cls, value: str) -> "LatencyModel":
+        median, _, p95 = value.partition(",")
+        return cls(float(median), float(p95 or median))
+
+    def sample(self) -> float:
+        if self.median <= 0:
+            return 0.0
+        return random.lognormvariate(math.log(self.median), self.sigma)
+
+
+def completion_text(prompt: str) -> str:
+    """Picks a canned completion matching the prompt GroqService sent."""
+    if '"overall_performance"' in prompt:
+        return json.dumps({
+            "overall_performance": "The candidate communicated clearly and backed most answers with project experience.",
+            "weak_points": "- Limited depth on failure handling.\n- Few quantified results.",
+            "improvements": "- Practice explaining trade-offs with numbers.\n- Review back-pressure and retry patterns.",
+        })
+    if '"feedback"' in prompt and '"score"' in prompt:
+        return json.dumps({"feedback": FEEDBACK, "score": round(random.uniform(0.4, 0.9), 1)})
+    if "SCORE:" in prompt:
+        return f"{FEEDBACK}\nSCORE: {random.uniform(0.4, 0.9):.1f}"
+    if "expert resume parser" in prompt:
+        # Full or gap-only extraction: answer with the requested fields.
+        return json.dumps({field: value for field, value in RESUME_JSON.items() if f'"{field}"' in prompt})
+    return random.choice(QUESTIONS)
+
+
+def invalid_completion(completion: str) -> str:
+    """A completion that fails GroqService's output validation: truncated JSON, or a question with a preamble."""
+    if completion.startswith("{"):
+        return completion[:len(completion) // 2]
+    return f"Sure! Here is the next question for the candidate: {completion}"
+
+
+def parse_model_values(value: str) -> Dict[str, float]:
+    """Parses "model=value,model=value" (e.g. --model-latency llama3-8b-8192=0.3)."""
+    values = {}
+    for entry in filter(None, value.split(",")):
+        model, _, number = entry.partition("=")
+        values[model.strip()] = float(number)
+    return values
+
+
+def usage(prompt: str, completion: str) -> Dict[str, int]:
+    prompt_tokens, completion_tokens = len(prompt) // 4, len(completion) // 4
+    return {"prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens}
+
+
+def create_app(chat_latency: LatencyModel, stt_latency: LatencyModel, token_delay: float = 0.01,
+               error_rate: float = 0.0, prefill_tokens_per_second: float = 0.0, stt_seconds_per_mb: float = 0.0,
+               model_latency: Optional[Dict[str, float]] = None, model_invalid_rate: Optional[Dict[str, float]] = None) -> FastAPI:
+    """
+    chat_latency is the time to the first token of a completion; streamed completions then emit
+    one word every token_delay seconds, non-streamed ones wait for the same total time.
+    With prefill_tokens_per_second, the time to the first token also grows with the prompt length;
+    with stt_seconds_per_mb, transcription latency grows with the uploaded audio size.
+    error_rate is the fraction of calls answered with a 429 (Retry-After: 1) or a 503.
+    model_latency scales all chat latencies per requested model (e.g. a small model at 0.3), and
+    model_invalid_rate is the fraction of a model's completions that fail validation (see invalid_completion).
+    """
+    model_latency = model_latency or {}
+    model_invalid_rate = model_invalid_rate or {}
+    app = FastAPI(title="Mock Groq API")
+    app.state.calls = {"chat": 0, "chat_stream": 0, "stt": 0, "errors": 0, "invalid": 0, "models": {}}
+
+    def injected_error() -> Optional[JSONResponse]:
+        if error_rate and random.random() < error_rate:
+            app.state.calls["errors"] += 1
+            if random.random() < 0.5:
+                return JSONResponse({"error": {"message": "Rate limit reached (mock)."}}, status_code=429,
+                                    headers={"retry-after": "1"})
+            return JSONResponse({"error": {"message": "Service unavailable (mock)."}}, status_code=503)
+        return None
+
+    @app.post("/openai/v1/chat/completions")
+    async def chat_completions(request: Request):
+        payload = await request.json()
+        error = injected_error()
+        if error is not None:
+            return error
+        prompt = " ".join(str(message.get("content", "")) for message in payload.get("messages", []))
+        model = payload.get("model", "llama3-70b-8192")
+        app.state.calls["models"][model] = app.state.calls["models"].get(model, 0) + 1
+        completion = completion_text(prompt)
+        if random.random() < model_invalid_rate.get(model, 0.0):
+            app.state.calls["invalid"] += 1
+            completion = invalid_completion(completion)
+        words = completion.split(" ")
+        completion_id = f"chatcmpl-{uuid.uuid4().hex[:24]}"
+        latency_factor = model_latency.get(model, 1.0)
+        prefill = len(prompt) / 4 / prefill_tokens_per_second if prefill_tokens_per_second else 0.0
+        await asyncio.sleep(latency_factor * (chat_latency.sample() + prefill))
+
+        if not payload.get("stream"):
+            app.state.calls["chat"] += 1
+            await asyncio.sleep(latency_factor * token_delay * len(words))
+            return {
+                "id": completion_id, "object": "chat.completion", "created": int(time.time()), "model": model,
+                "choices": [{"index": 0, "message": {"role": "assistant", "content": completion}, "finish_reason": "stop"}],
+                "usage": usage(prompt, completion),
+            }
+
+        app.state.calls["chat_stream"] += 1
+
+        def chunk(delta: Dict[str, Any], finish_reason: Optional[str] = None, **extra: Any) -> str:
+            event = {"id": completion_id, "object": "chat.completion.chunk", "created": int(time.time()), "model": model,
+                     "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}], **extra}
+            return f"data: {json.dumps(event)}\n\n"
+
+        async def events():
+            yield chunk({"role": "assistant", "content": ""})
+            for position, word in enumerate(words):
+                yield chunk({"content": word if position == 0 else f" {word}"})
+                await asyncio.sleep(latency_factor * token_delay)
+            yield chunk({}, "stop", x_groq={"usage": usage(prompt, completion)})
+            yield "data: [DONE]\n\n"
+
+        return StreamingResponse(events(), media_type="text/event-stream")
+
+    @app.post("/openai/v1/audio/transcriptions")
+    async def transcriptions(file: UploadFile = File(...), model: str = Form("whisper-large-v3"),
+                             response_format: str = Form("json")):
+        audio = await file.read()
+        error = injected_error()
+        if error is not None:
+            return error
+        app.state.calls["stt"] += 1
+        await asyncio.sleep(stt_latency.sample() + stt_seconds_per_mb * len(audio) / 1e6)
+        return {"text": "I built an event pipeline in Python and Kafka and focused on keeping consumer lag low.",
+                "x_groq": {"id": f"req_{uuid.uuid4().hex[:24]}"}}
+
+    @app.get("/calls")
+    async def calls():
+        return app.state.calls
+
+    return app
+
+
+def main():
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="Local mock of the Groq chat completion and transcription API.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8900)
+    parser.add_argument("--chat-latency", default="0.8,2.0", help="Time to first token: median,p95 in seconds")
+    parser.add_argument("--stt-latency", default="0.5,1.2", help="Transcription latency: median,p95 in seconds")
+    parser.add_argument("--token-delay", type=float, default=0.01, help="Delay between streamed words (s)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of calls answered with 429/503")
+    parser.add_argument("--prefill-rate", type=float, default=0.0, help="Prompt tokens processed per second (0: no prompt-length cost)")
+    parser.add_argument("--stt-seconds-per-mb", type=float, default=0.0, help="Extra transcription latency per MB of audio")
+    parser.add_argument("--model-latency", default="", help="Chat latency factor per model: model=factor,...")
+    parser.add_argument("--model-invalid-rate", default="", help="Fraction of invalid completions per model: model=rate,...")
+    args = parser.parse_args()
+
+    app = create_app(LatencyModel.parse(args.chat_latency), LatencyModel.parse(args.stt_latency),
+                     token_delay=args.token_delay, error_rate=args.error_rate, prefill_tokens_per_second=args.prefill_rate,
+                     stt_seconds_per_mb=args.stt_seconds_per_mb, model_latency=parse_model_values(args.model_latency),
+                     model_invalid_rate=parse_model_values(args.model_invalid_rate))
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
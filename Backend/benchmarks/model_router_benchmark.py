@@ -0,0 +1,138 @@
+# model_router_benchmark.py
+# Latency and escalation rate of LLM calls per model routing configuration:
+# - large: every call on the large model (no routes)
+# - routed: the LLM_ROUTES table (or --routes), fast-model output failing validation escalated to the large model
+# - routed-no-escalation: the same routes, fast-model output used as is
+# Reports p50/p95 latency per call type (time to the first delta for stream_question), the escalation
+# rate, and the share of outputs that still failed validation (unusable questions or JSON).
+#
+# LLM calls go to the in-process mock Groq API, where the fast model answers --fast-latency times faster
+# and --fast-invalid-rate of its completions fail validation, unless --real is given (needs GROQ_API_KEY).
+#
+# Usage (from the Backend directory):
+#   python -m benchmarks.model_router_benchmark --repeats 20
+#   python -m benchmarks.model_router_benchmark --fast-invalid-rate 0.3 --routes "generate_question=fast,evaluate_answer=fast"
+#   python -m benchmarks.model_router_benchmark --real --repeats 5
+import argparse
+import asyncio
+import os
+import sys
+import time
+from typing import Dict, List, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.load_test import percentile, start_server
+from benchmarks.mock_groq import RESUME_JSON
+
+QUESTION_TYPES = ["resume_deep_dive", "technical_foundational", "technical_problem_solving", "technical_advanced"]
+QUESTION_TEXTS = ["Tell me about yourself and walk me through your resume.",
+                  "Your resume mentions an event pipeline on Kafka. What was your role in building it?",
+                  "Can you explain how consumer groups distribute partitions in Kafka?",
+                  "How would you troubleshoot growing consumer lag in a pipeline like yours?"]
+TRANSCRIPT = ("I owned the ingestion service. We saw consumer lag at peak hours, so I profiled the consumers, "
+              "switched to batched offset commits with idempotent writes, and lag dropped from minutes to seconds.")
+
+
+async def run_config(groq_service, repeats: int, domain: str, resume_summary: dict) -> Dict[str, dict]:
+    """Runs every measured call type repeats times per question type. Returns latencies and invalid outputs per call type."""
+    from services.model_router import json_problem, question_problem
+
+    results: Dict[str, dict] = {}
+
+    def record(call_type: str, seconds: float, problem: Optional[str]):
+        result = results.setdefault(call_type, {"seconds": [], "invalid": 0})
+        result["seconds"].append(seconds)
+        result["invalid"] += bool(problem)
+
+    resume_info = dict(RESUME_JSON, raw_text="")
+    for _ in range(repeats):
+        for index, question_type in enumerate(QUESTION_TYPES):
+            previous = [{"id": f"q{i}", "text": QUESTION_TEXTS[i], "type": "generic_intro" if i == 0 else QUESTION_TYPES[i - 1]}
+                        for i in range(index + 1)]
+            started = time.perf_counter()
+            question = await groq_service.generate_question(resume_info, domain, previous, resume_summary, question_type=question_type)
+            record("generate_question", time.perf_counter() - started, question_problem(question))
+
+            started = time.perf_counter()
+            first_delta, parts = None, []
+            async for delta in groq_service.stream_question(resume_info, domain, previous, resume_summary, question_type=question_type):
+                if first_delta is None:
+                    first_delta = time.perf_counter() - started
+                parts.append(delta)
+            record("stream_question", first_delta or time.perf_counter() - started, question_problem("".join(parts)))
+
+            started = time.perf_counter()
+            evaluation = await groq_service.evaluate_answer(QUESTION_TEXTS[index], TRANSCRIPT, resume_info, domain,
+                                                            resume_summary, question_type=question_type)
+            record("evaluate_answer", time.perf_counter() - started,
+                   "invalid" if evaluation["feedback"].startswith("Could not parse") else None)
+
+        started = time.perf_counter()
+        response = await groq_service.generate_structured_response(
+            f"You are an expert resume parser. Extract \"name\" and \"skills\" as JSON.\n{TRANSCRIPT}", "resume_extraction")
+        record("resume_extraction", time.perf_counter() - started, json_problem(response))
+    return results
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="LLM latency and escalation rate per model routing configuration.")
+    parser.add_argument("--repeats", type=int, default=10, help="Rounds of calls per configuration")
+    parser.add_argument("--routes", help="Route table for the routed configurations (default: LLM_ROUTES)")
+    parser.add_argument("--real", action="store_true", help="Call the real Groq API (GROQ_API_KEY) instead of the mock")
+    parser.add_argument("--mock-port", type=int, default=8906)
+    parser.add_argument("--chat-latency", default="0.5,1.0", help="Mock large-model time to first token: median,p95 (s)")
+    parser.add_argument("--token-delay", type=float, default=0.01, help="Mock large-model delay between streamed words (s)")
+    parser.add_argument("--fast-latency", type=float, default=0.35, help="Mock fast-model latency as a fraction of the large model's")
+    parser.add_argument("--fast-invalid-rate", type=float, default=0.1, help="Mock fraction of fast-model completions failing validation")
+    args = parser.parse_args()
+
+    from config import settings
+    from services.groq_http import GroqHTTPClient
+    from services.groq_service import GroqService
+    from services.model_router import ModelRouter, parse_routes
+    from services.resume_summary import build_resume_summary
+
+    if args.real:
+        http_client = GroqHTTPClient(api_key=settings.GROQ_API_KEY)
+    else:
+        from benchmarks.mock_groq import LatencyModel, create_app
+
+        start_server(create_app(LatencyModel.parse(args.chat_latency), LatencyModel.parse("0.1"), token_delay=args.token_delay,
+                                model_latency={settings.LLM_FAST_MODEL: args.fast_latency},
+                                model_invalid_rate={settings.LLM_FAST_MODEL: args.fast_invalid_rate}), args.mock_port)
+        http_client = GroqHTTPClient(api_key="mock", base_url=f"http://127.0.0.1:{args.mock_port}/openai/v1",
+                                     requests_per_minute=1_000_000, tokens_per_minute=1_000_000_000)
+
+    routes = parse_routes(args.routes if args.routes is not None else settings.LLM_ROUTES)
+    configs = {
+        "large": ModelRouter(settings.LLM_FAST_MODEL, settings.LLM_LARGE_MODEL),
+        "routed": ModelRouter(settings.LLM_FAST_MODEL, settings.LLM_LARGE_MODEL, routes),
+        "routed-no-escalation": ModelRouter(settings.LLM_FAST_MODEL, settings.LLM_LARGE_MODEL, routes, escalation=False),
+    }
+    domain = "Software Engineering"
+    resume_summary = build_resume_summary(dict(RESUME_JSON, raw_text=""), domain)
+
+    print(f"\nFast model {settings.LLM_FAST_MODEL}, large model {settings.LLM_LARGE_MODEL}; routes: {routes}")
+    if not args.real:
+        print(f"Mock: large {args.chat_latency}s to first token, fast x{args.fast_latency:g}, "
+              f"{100 * args.fast_invalid_rate:g}% of fast completions invalid")
+    print(f"\n{'config':<22}{'call type':<19}{'calls':>6}{'p50 (s)':>9}{'p95 (s)':>9}{'escalated':>11}{'invalid':>9}")
+    for name, router in configs.items():
+        groq_service = GroqService(api_key=http_client.api_key, http_client=http_client, model_router=router)
+        results = await run_config(groq_service, args.repeats, domain, resume_summary)
+        escalations: Dict[str, List[int]] = {}
+        for key, route_stats in router.stats()["routes"].items():
+            totals = escalations.setdefault(key.split(":")[0], [0, 0])
+            totals[0] += round(route_stats["escalation_rate"] * route_stats["calls"])
+            totals[1] += route_stats["calls"]
+        for call_type, result in results.items():
+            seconds = sorted(result["seconds"])
+            escalated, calls = escalations.get(call_type, [0, 0])
+            print(f"{name:<22}{call_type:<19}{len(seconds):>6}{percentile(seconds, 0.5):>9.3f}{percentile(seconds, 0.95):>9.3f}"
+                  f"{100 * escalated / max(1, calls):>10.1f}%{100 * result['invalid'] / len(seconds):>8.1f}%")
+    await http_client.aclose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,130 @@
+# overall_evaluation_benchmark.py
+# Overall evaluation cost by interview length for each OVERALL_EVALUATION_MODE:
+# - full: the prompt holds every question, answer transcript and feedback
+# - compact: the prompt holds the running evaluation kept after each answer
+# - fast: the report is built from the running evaluation without an LLM call
+# Reports prompt size and report latency per mode and length, plus the per-answer cost of
+# updating the running evaluation.
+#
+# LLM calls go to the in-process mock Groq API, whose time to first token grows with the prompt
+# length (--prefill-rate), unless --real is given (needs GROQ_API_KEY).
+#
+# Usage (from the Backend directory):
+#   python -m benchmarks.overall_evaluation_benchmark --lengths 5,10,20 --repeats 5
+#   python -m benchmarks.overall_evaluation_benchmark --lengths 5,10,20 --real
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+from typing import Any, Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.load_test import percentile, start_server
+from benchmarks.mock_groq import RESUME_JSON
+
+QUESTION_TYPES = ["generic_intro", "resume_deep_dive", "technical_foundational", "technical_problem_solving",
+                  "technical_advanced"] # Then technical_system_design, as in dakshy.get_next_question_type_tag
+TRANSCRIPT = ("In my last role I owned the ingestion service. We were seeing consumer lag during peak hours, so I "
+              "profiled the consumers, found that we were committing offsets after every message, and switched to "
+              "batched commits with an idempotent write path. Lag dropped from minutes to seconds and we could remove "
+              "two of the six consumer instances. I also added alerts on lag so we would notice regressions early, "
+              "and documented the trade-off we made between throughput and reprocessing on failure. ")
+FEEDBACK_GOOD = ("Clear, well structured answer with a concrete example and measurable results. You explained the root "
+                 "cause and the fix. Mentioning how you validated the idempotency would make it even stronger.")
+FEEDBACK_WEAK = ("The answer stays at a high level and does not address the question directly. You could explain the "
+                 "trade-offs involved and give a specific example from your own work. More depth on failure handling "
+                 "would also help.")
+
+
+def synthetic_answers(length: int, rng: random.Random) -> List[Dict[str, Any]]:
+    answers = []
+    for index in range(length):
+        score = round(rng.uniform(0.2, 0.95), 1)
+        answers.append({
+            "question_id": f"q{index}",
+            "question_text": f"Question {index + 1}: how would you handle back-pressure between services in a high-throughput pipeline?",
+            "question_type": QUESTION_TYPES[index] if index < len(QUESTION_TYPES) else "technical_system_design",
+            "answer_transcript": TRANSCRIPT,
+            "feedback": FEEDBACK_GOOD if score >= 0.6 else FEEDBACK_WEAK,
+            "score": score,
+            "is_timeout": False,
+        })
+    return answers
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Overall evaluation latency and prompt size by interview length and mode.")
+    parser.add_argument("--lengths", default="5,10,20", help="Comma-separated numbers of answers per interview")
+    parser.add_argument("--repeats", type=int, default=5, help="Evaluations per mode and length")
+    parser.add_argument("--real", action="store_true", help="Call the real Groq API (GROQ_API_KEY) instead of the mock")
+    parser.add_argument("--mock-port", type=int, default=8903)
+    parser.add_argument("--chat-latency", default="0.6,1.2", help="Mock time to first token for an empty prompt: median,p95 (s)")
+    parser.add_argument("--prefill-rate", type=float, default=2000, help="Mock prompt tokens processed per second")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    from config import settings
+    from services.groq_http import GroqHTTPClient
+    from services.groq_service import GroqService
+    from services.evaluation_summary import build_running_evaluation, update_running_evaluation, new_running_evaluation, local_overall_evaluation
+    from services.resume_summary import build_resume_summary
+
+    if args.real:
+        http_client = GroqHTTPClient(api_key=settings.GROQ_API_KEY)
+    else:
+        from benchmarks.mock_groq import LatencyModel, create_app
+
+        start_server(create_app(LatencyModel.parse(args.chat_latency), LatencyModel.parse("0.1"),
+                                prefill_tokens_per_second=args.prefill_rate), args.mock_port)
+        http_client = GroqHTTPClient(api_key="mock", base_url=f"http://127.0.0.1:{args.mock_port}/openai/v1",
+                                     requests_per_minute=1_000_000, tokens_per_minute=1_000_000_000)
+
+    prompt_chars: List[int] = []
+
+    class MeasuredGroqService(GroqService):
+        async def generate_structured_response(self, prompt: str, *args, **kwargs) -> str:
+            prompt_chars.append(len(prompt))
+            return await super().generate_structured_response(prompt, *args, **kwargs)
+
+    groq_service = MeasuredGroqService(api_key=http_client.api_key, http_client=http_client)
+    resume_info = dict(RESUME_JSON, raw_text="")
+    domain = "Software Engineering"
+    resume_summary = build_resume_summary(resume_info, domain)
+    rng = random.Random(args.seed)
+
+    print(f"\nLLM: {'Groq API' if args.real else f'mock {args.chat_latency}s + prompt tokens / {args.prefill_rate:g} per s'}\n")
+    print(f"{'answers':>8}  {'mode':<8}{'prompt chars':>14}{'p50 (s)':>10}{'max (s)':>10}")
+    for length in [int(value) for value in args.lengths.split(",")]:
+        answers = synthetic_answers(length, rng)
+        running_evaluation = build_running_evaluation(answers)
+        for mode in ("full", "compact", "fast"):
+            latencies = []
+            prompt_chars.clear()
+            for _ in range(args.repeats):
+                started = time.perf_counter()
+                if mode == "fast":
+                    local_overall_evaluation(running_evaluation, domain)
+                else:
+                    await groq_service.get_overall_evaluation(
+                        interview_history=answers, resume_info=resume_info, domain=domain, resume_summary=resume_summary,
+                        running_evaluation=running_evaluation if mode == "compact" else None)
+                latencies.append(time.perf_counter() - started)
+            latencies.sort()
+            chars = prompt_chars[0] if prompt_chars else 0
+            print(f"{length:>8}  {mode:<8}{chars:>14}{percentile(latencies, 0.5):>10.3f}{latencies[-1]:>10.3f}")
+
+    # Per-answer cost of keeping the running evaluation
+    answers = synthetic_answers(1000, rng)
+    state = new_running_evaluation()
+    started = time.perf_counter()
+    for answer in answers:
+        update_running_evaluation(state, answer)
+    print(f"\nRunning evaluation update: {1e6 * (time.perf_counter() - started) / len(answers):.1f} µs per answer")
+    await http_client.aclose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,110 @@
+# pipeline_latency.py
+# Measures the per-turn latency of /submit-answer in sequential vs pipelined mode.
+# Upstream calls are replaced by a fake service with fixed latencies, so no API key is needed.
+#
+# Usage (from the Backend directory):
+#   python -m benchmarks.pipeline_latency --turns 20
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx
+
+import dakshy
+from config import settings
+from models.interview_models import ResumeInfo, Question
+
+
+class FakeGroqService:
+    """Stand-in for GroqService that only sleeps for the configured latencies."""
+    def __init__(self, stt: float, evaluation: float, question: float, tts: float):
+        self.stt, self.evaluation, self.question, self.tts = stt, evaluation, question, tts
+
+    async def speech_to_text(self, audio_content: bytes) -> str:
+        await asyncio.sleep(self.stt)
+        return "I worked on a recommendation system using Python."
+
+    async def evaluate_answer(self, question, answer_transcript, resume_info, domain, resume_summary=None, question_type=None):
+        await asyncio.sleep(self.evaluation)
+        return {"feedback": "Good answer with concrete details.", "score": 0.8}
+
+    async def generate_question(self, resume_info, domain, previous_questions, resume_summary=None,
+                                rejected_question=None, similar_to=None, question_type=None):
+        await asyncio.sleep(self.question)
+        return f"Question number {len(previous_questions) + 1}?"
+
+    async def stream_question(self, resume_info, domain, previous_questions, resume_summary=None,
+                              rejected_question=None, similar_to=None, question_type=None):
+        words = f"Question number {len(previous_questions) + 1}?".split()
+        for word in words:
+            await asyncio.sleep(self.question / len(words))
+            yield word + " "
+
+    async def get_overall_evaluation(self, interview_history, resume_info, domain, resume_summary=None):
+        await asyncio.sleep(self.evaluation)
+        return {"overall_performance": "Solid.", "weak_points": "- None.", "improvements": "- Keep practicing."}
+
+    async def stream_speech(self, text: str):
+        await asyncio.sleep(self.tts)
+        yield b"fake-mp3"
+
+
+async def seed_session(session_id: str) -> str:
+    question = Question(id=f"{session_id}-q1", text="Tell me about yourself.", type="generic_intro")
+    await dakshy.session_store.create(session_id, {
+        "session_id": session_id,
+        "resume_info": ResumeInfo(name="Bench", skills=["Python"], raw_text="Bench resume").dict(),
+        "domain": "Software Engineering",
+        "current_question": question.dict(),
+        "questions_asked": [{"id": question.id, "text": question.text, "type": question.type}],
+        "answers": [],
+    })
+    return question.id
+
+
+async def run_turns(client: httpx.AsyncClient, turns: int, pipelined: bool) -> list:
+    settings.PIPELINE_SUBMIT_ANSWER = pipelined
+    latencies = []
+    for i in range(turns):
+        session_id = f"bench-{'p' if pipelined else 's'}-{i}"
+        question_id = await seed_session(session_id)
+        started = time.perf_counter()
+        response = await client.post("/submit-answer", data={
+            "session_id": session_id, "question_id": question_id, "is_timeout": "false", "force_end": "false"
+        }, files={"audio_file": ("answer.webm", b"\x1a\x45\xdf\xa3", "audio/webm")})
+        latencies.append(time.perf_counter() - started)
+        response.raise_for_status()
+    return latencies
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Per-turn latency of /submit-answer, sequential vs pipelined.")
+    parser.add_argument("--turns", type=int, default=20)
+    parser.add_argument("--stt", type=float, default=0.6, help="Simulated Whisper latency (s)")
+    parser.add_argument("--evaluation", type=float, default=1.5, help="Simulated evaluation LLM latency (s)")
+    parser.add_argument("--question", type=float, default=0.8, help="Simulated question LLM latency (s)")
+    parser.add_argument("--tts", type=float, default=0.7, help="Simulated gTTS latency (s)")
+    args = parser.parse_args()
+
+    dakshy.groq_service = FakeGroqService(args.stt, args.evaluation, args.question, args.tts)
+    transport = httpx.ASGITransport(app=dakshy.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        results = {
+            "sequential": await run_turns(client, args.turns, pipelined=False),
+            "pipelined": await run_turns(client, args.turns, pipelined=True),
+        }
+
+    print(f"\n{'mode':<12}{'mean (s)':>10}{'p50 (s)':>10}{'max (s)':>10}")
+    for mode, latencies in results.items():
+        print(f"{mode:<12}{statistics.mean(latencies):>10.3f}{statistics.median(latencies):>10.3f}{max(latencies):>10.3f}")
+    saved = statistics.mean(results["sequential"]) - statistics.mean(results["pipelined"])
+    print(f"\nPipelining saves {saved:.3f}s per turn on average.")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,179 @@
+# resume_extraction_benchmark.py
+# Compares resume field extraction strategies on a sample corpus:
+# - local: regexes + section headers only (extract_info_locally)
+# - llm: the full-resume LLM extraction (extract_info_with_groq)
+# - hybrid: local extraction plus an LLM call for low-confidence fields only (extract_info_hybrid)
+# Reports latency percentiles, LLM calls and prompt sizes, and how often each field was found locally.
+#
+# The corpus is generated (varied layouts and section names) unless --corpus points to a directory of
+# PDF/DOCX resumes. LLM calls go to the in-process mock Groq API unless --real is given (needs GROQ_API_KEY).
+#
+# Usage (from the Backend directory):
+#   python -m benchmarks.resume_extraction_benchmark --resumes 40
+#   python -m benchmarks.resume_extraction_benchmark --corpus ~/resumes --real
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+from collections import defaultdict
+from typing import List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.load_test import percentile, start_server
+
+FIRST_NAMES = ["Priya", "Daniel", "Aisha", "Marco", "Chen", "Olivia", "Rahul", "Sofia", "Kwame", "Elena"]
+LAST_NAMES = ["Sharma", "Okafor", "Rossi", "Nguyen", "Smith", "Kowalski", "Haddad", "Garcia", "Mensah", "Ivanova"]
+SKILLS = ["Python", "Java", "Go", "TypeScript", "React", "Node.js", "PostgreSQL", "MySQL", "Redis", "Kafka",
+          "Docker", "Kubernetes", "AWS", "GCP", "Terraform", "Pandas", "PyTorch", "FastAPI", "Django", "Git"]
+ROLES = ["Software Engineer", "Backend Developer", "Data Engineer", "Full Stack Developer", "ML Engineer"]
+COMPANIES = ["Acme Corp", "Globex", "Initech", "Umbrella Labs", "Stark Analytics", "Wayne Systems"]
+DEGREES = ["B.Tech in Computer Science, IIT Delhi (2016)", "M.Sc. Data Science, University of Milan (2019)",
+           "Bachelor of Engineering, University of Lagos (2015)", "B.S. Computer Science, State University (2017)"]
+PROJECTS = [("Event pipeline", "Built a Kafka and Python pipeline processing 2M events per day."),
+            ("Interview bot", "Designed a FastAPI service that runs mock interviews with speech synthesis."),
+            ("Demand forecasting", "Trained PyTorch models forecasting weekly demand for 300 stores."),
+            ("Infra as code", "Migrated 40 services to Terraform-managed AWS infrastructure.")]
+
+
+def generate_resume(rng: random.Random) -> str:
+    """A synthetic plain-text resume with randomized content, header names and layout."""
+    first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+    name = f"{first} {last}".upper() if rng.random() < 0.3 else f"{first} {last}"
+    email = f"{first.lower()}.{last.lower()}@example.com"
+    phone = rng.choice(["+1 415 555 0134", "(020) 7946 0958", "+91-98765-43210", "555.867.5309"])
+    lines = [name, f"{email} | {phone} | linkedin.com/in/{first.lower()}{last.lower()}"]
+    years = rng.randint(1, 12)
+    if rng.random() < 0.6:
+        lines += ["", rng.choice(["SUMMARY", "Profile", "Professional Summary"]),
+                  f"{rng.choice(ROLES)} with {years}+ years of experience building data-heavy backend systems."]
+    skills = rng.sample(SKILLS, rng.randint(4, 10))
+    lines += ["", rng.choice(["SKILLS", "Technical Skills", "Skills:", "TECH STACK"])]
+    if rng.random() < 0.5:
+        lines.append(", ".join(skills))
+    else:
+        half = len(skills) // 2
+        lines += [f"Languages: {', '.join(skills[:half])}", f"Tools: {' | '.join(skills[half:])}"]
+    lines += ["", rng.choice(["EXPERIENCE", "Work Experience", "Professional Experience"])]
+    year = 2024
+    for _ in range(rng.randint(1, 3)):
+        start = year - rng.randint(1, 4)
+        end = "Present" if year == 2024 else str(year)
+        lines += [f"{rng.choice(ROLES)}, {rng.choice(COMPANIES)} ({start} - {end})",
+                  "- Led the migration of a monolith to services, cutting p95 latency by 40%.",
+                  "- Mentored two junior engineers."]
+        year = start
+    if rng.random() < 0.7:
+        lines += ["", rng.choice(["PROJECTS", "Personal Projects", "Key Projects"])]
+        for title, description in rng.sample(PROJECTS, rng.randint(1, 3)):
+            lines += [title, f"- {description}"]
+    lines += ["", rng.choice(["EDUCATION", "Education", "Academic Background"]), rng.choice(DEGREES)]
+    return "\n".join(lines)
+
+
+def load_corpus(directory: str) -> List[str]:
+    from services.resume_parser import extract_text
+
+    texts = []
+    for filename in sorted(os.listdir(directory)):
+        file_type = filename.rsplit(".", 1)[-1].lower()
+        if file_type in ("pdf", "docx"):
+            with open(os.path.join(directory, filename), "rb") as f:
+                texts.append(extract_text(f.read(), file_type))
+    return texts
+
+
+class CountingGroqService:
+    """Wraps GroqService to count structured LLM calls and their prompt sizes."""
+    def __init__(self, service):
+        self.service = service
+        self.calls = 0
+        self.prompt_chars = 0
+
+    async def generate_structured_response(self, prompt: str, *args, **kwargs) -> str:
+        self.calls += 1
+        self.prompt_chars += len(prompt)
+        return await self.service.generate_structured_response(prompt, *args, **kwargs)
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Local vs LLM vs hybrid resume field extraction.")
+    parser.add_argument("--resumes", type=int, default=40, help="Generated resumes (ignored with --corpus)")
+    parser.add_argument("--corpus", help="Directory of PDF/DOCX resumes to use instead of generated ones")
+    parser.add_argument("--min-confidence", type=float, default=0.75)
+    parser.add_argument("--concurrency", type=int, default=4, help="LLM extractions running at once")
+    parser.add_argument("--real", action="store_true", help="Call the real Groq API (GROQ_API_KEY) instead of the mock")
+    parser.add_argument("--mock-port", type=int, default=8902)
+    parser.add_argument("--chat-latency", default="1.2,2.5", help="Mock completion latency: median,p95 (s)")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    from config import settings
+    from services.groq_http import GroqHTTPClient
+    from services.groq_service import GroqService
+    from services.resume_parser import RESUME_FIELDS, extract_info_locally, extract_info_with_groq, extract_info_hybrid
+
+    rng = random.Random(args.seed)
+    texts = load_corpus(args.corpus) if args.corpus else [generate_resume(rng) for _ in range(args.resumes)]
+
+    if args.real:
+        http_client = GroqHTTPClient(api_key=settings.GROQ_API_KEY)
+    else:
+        from benchmarks.mock_groq import LatencyModel, create_app
+
+        start_server(create_app(LatencyModel.parse(args.chat_latency), LatencyModel.parse("0.1")), args.mock_port)
+        http_client = GroqHTTPClient(api_key="mock", base_url=f"http://127.0.0.1:{args.mock_port}/openai/v1",
+                                     requests_per_minute=1_000_000, tokens_per_minute=1_000_000_000)
+    groq_service = GroqService(api_key=http_client.api_key, http_client=http_client)
+
+    # Local extraction
+    local_ms = []
+    found = defaultdict(int)
+    for text in texts:
+        started = time.perf_counter()
+        _, confidence = extract_info_locally(text)
+        local_ms.append(1000 * (time.perf_counter() - started))
+        for field in RESUME_FIELDS:
+            found[field] += confidence[field] >= args.min_confidence
+
+    semaphore = asyncio.Semaphore(args.concurrency)
+
+    async def timed(coro_factory, latencies):
+        async with semaphore:
+            started = time.perf_counter()
+            await coro_factory()
+            latencies.append(1000 * (time.perf_counter() - started))
+
+    local_ms.sort()
+    results = {}
+    for mode in ("llm", "hybrid"):
+        counting = CountingGroqService(groq_service)
+        latencies: List[float] = []
+        if mode == "llm":
+            factories = [lambda text=text: extract_info_with_groq(text, counting) for text in texts]
+        else:
+            factories = [lambda text=text: extract_info_hybrid(text, counting, args.min_confidence) for text in texts]
+        started = time.perf_counter()
+        await asyncio.gather(*(timed(factory, latencies) for factory in factories))
+        results[mode] = (sorted(latencies), counting, time.perf_counter() - started)
+    await http_client.aclose()
+
+    print(f"\n{len(texts)} resumes ({'corpus ' + args.corpus if args.corpus else 'generated'}), "
+          f"LLM: {'Groq API' if args.real else 'mock ' + args.chat_latency + 's'}, min confidence {args.min_confidence}\n")
+    print(f"{'mode':<8}{'p50 (ms)':>10}{'p95 (ms)':>10}{'max (ms)':>10}{'LLM calls':>11}{'prompt chars/call':>19}{'total (s)':>11}")
+    print(f"{'local':<8}{percentile(local_ms, 0.5):>10.2f}{percentile(local_ms, 0.95):>10.2f}{max(local_ms):>10.2f}"
+          f"{0:>11}{'-':>19}{'-':>11}")
+    for mode, (latencies, counting, elapsed) in results.items():
+        per_call = counting.prompt_chars // counting.calls if counting.calls else 0
+        print(f"{mode:<8}{percentile(latencies, 0.5):>10.1f}{percentile(latencies, 0.95):>10.1f}{max(latencies):>10.1f}"
+              f"{counting.calls:>11}{per_call:>19}{elapsed:>11.2f}")
+
+    print("\nFields extracted locally with sufficient confidence:")
+    for field in RESUME_FIELDS:
+        print(f"  {field:<12}{found[field]:>4}/{len(texts)}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,211 @@
+# transport_benchmark.py
+# Turn latency and server CPU of the interview transports:
+# - rest: POST /submit-answer (multipart) per turn, then GET /audio for the next question
+# - sse: POST /submit-answer/stream per turn, then GET /audio
+# - ws: one /ws/interview/{session_id} connection per interview; answer audio goes up as binary
+#   frames, question text and audio come down on the same connection
+# Every interview starts with POST /start-interview. A turn ends when the next question's audio has
+# been received completely; "text" is the time until the next question's text arrived.
+#
+# The backend runs in a subprocess (so its CPU time, read from /stats, excludes this client) against
+# the in-process mock Groq API, with the stub TTS backend.
+#
+# Usage (from the Backend directory):
+#   python -m benchmarks.transport_benchmark --interviews 40 --concurrency 10
+#   python -m benchmarks.transport_benchmark --transports rest,ws --chat-latency 0.05 --stt-latency 0.05
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import time
+from typing import Dict, List, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx
+
+from benchmarks.load_test import ANSWER_AUDIO, percentile, resume_pdf, start_server, submit_answer, Recorder
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+WS_FRAME_BYTES = 4096 # Answer audio frame size, as a MediaRecorder with a timeslice would send it
+
+
+class TurnRecorder:
+    def __init__(self):
+        self.text_seconds: List[float] = []
+        self.turn_seconds: List[float] = []
+        self.failures = 0
+
+
+async def start_interview(client: httpx.AsyncClient, index: int) -> Optional[dict]:
+    try:
+        response = await client.post("/start-interview", data={"domain": "Software Engineering"},
+                                     files={"resume": (f"candidate-{index}.pdf", resume_pdf(index), "application/pdf")})
+    except httpx.HTTPError:
+        return None
+    return response.json() if response.status_code == 200 else None
+
+
+async def rest_interview(client: httpx.AsyncClient, turns: TurnRecorder, index: int, stream: bool):
+    body = await start_interview(client, index)
+    if body is None:
+        turns.failures += 1
+        return
+    session_id, question = body["session_id"], body["question"]
+    await client.get(body["audio_url"])
+    ignored = Recorder()
+    while True:
+        started = time.perf_counter()
+        result = await submit_answer(client, ignored, session_id, question["id"], stream)
+        if result is None:
+            turns.failures += 1
+            return
+        turns.text_seconds.append(time.perf_counter() - started)
+        if result["next_action"] == "end_interview":
+            turns.turn_seconds.append(time.perf_counter() - started)
+            return
+        question = result["question"]
+        response = await client.get(result["audio_url"])
+        if response.status_code != 200:
+            turns.failures += 1
+            return
+        turns.turn_seconds.append(time.perf_counter() - started)
+
+
+async def receive_question(websocket) -> Optional[dict]:
+    """Reads messages until a question's audio has been received. Returns the last JSON message."""
+    message = None
+    while True:
+        frame = await websocket.recv()
+        if isinstance(frame, bytes):
+            continue
+        message = json.loads(frame)
+        if message["type"] in ("audio_end", "overall_evaluation", "error"):
+            return message
+
+
+async def ws_interview(client: httpx.AsyncClient, ws_url: str, turns: TurnRecorder, index: int):
+    from websockets.asyncio.client import connect
+
+    body = await start_interview(client, index)
+    if body is None:
+        turns.failures += 1
+        return
+    async with connect(f"{ws_url}/ws/interview/{body['session_id']}", max_size=None) as websocket:
+        if (await receive_question(websocket))["type"] != "audio_end":
+            turns.failures += 1
+            return
+        while True:
+            started = time.perf_counter()
+            for offset in range(0, len(ANSWER_AUDIO), WS_FRAME_BYTES):
+                await websocket.send(ANSWER_AUDIO[offset:offset + WS_FRAME_BYTES])
+            await websocket.send(json.dumps({"type": "answer", "is_timeout": False, "force_end": False}))
+            while True:
+                frame = await websocket.recv()
+                if isinstance(frame, bytes):
+                    continue
+                message = json.loads(frame)
+                if message["type"] in ("question", "overall_evaluation", "error"):
+                    break
+            if message["type"] == "error":
+                turns.failures += 1
+                return
+            turns.text_seconds.append(time.perf_counter() - started)
+            if message["type"] == "overall_evaluation":
+                turns.turn_seconds.append(time.perf_counter() - started)
+                return
+            if (await receive_question(websocket))["type"] != "audio_end":
+                turns.failures += 1
+                return
+            turns.turn_seconds.append(time.perf_counter() - started)
+
+
+def start_backend(args) -> subprocess.Popen:
+    """Starts the backend with uvicorn in a subprocess, pointed at the mock Groq API."""
+    env = dict(os.environ,
+               GROQ_API_KEY="mock",
+               GROQ_API_BASE_URL=f"http://127.0.0.1:{args.mock_port}/openai/v1",
+               GROQ_REQUESTS_PER_MINUTE="1000000", # Measure the service, not the client-side Groq quota
+               GROQ_TOKENS_PER_MINUTE="1000000000",
+               TTS_BACKEND="stub",
+               TTS_STUB_LATENCY_SECONDS=str(args.tts_latency),
+               LOG_LEVEL="WARNING")
+    return subprocess.Popen([sys.executable, "-m", "uvicorn", "dakshy:app", "--host", "127.0.0.1", "--port", str(args.port),
+                             "--log-level", "warning"], cwd=BACKEND_DIR, env=env)
+
+
+async def wait_for_backend(client: httpx.AsyncClient, backend: subprocess.Popen):
+    while True:
+        if backend.poll() is not None:
+            raise RuntimeError("The backend exited during startup.")
+        try:
+            if (await client.get("/")).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        await asyncio.sleep(0.2)
+
+
+async def server_cpu_seconds(client: httpx.AsyncClient) -> float:
+    return (await client.get("/stats")).json()["process_cpu_seconds"]
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Turn latency and server CPU: REST vs SSE vs WebSocket interviews.")
+    parser.add_argument("--transports", default="rest,sse,ws", help="Comma-separated: rest, sse, ws")
+    parser.add_argument("--interviews", type=int, default=40, help="Interviews per transport")
+    parser.add_argument("--concurrency", type=int, default=10, help="Interviews running at once")
+    parser.add_argument("--port", type=int, default=8904, help="Backend port")
+    parser.add_argument("--mock-port", type=int, default=8905, help="In-process mock Groq port")
+    parser.add_argument("--chat-latency", default="0.3,0.6", help="Mock time to first token: median,p95 (s)")
+    parser.add_argument("--stt-latency", default="0.2,0.4", help="Mock transcription latency: median,p95 (s)")
+    parser.add_argument("--token-delay", type=float, default=0.002, help="Mock delay between streamed words (s)")
+    parser.add_argument("--tts-latency", type=float, default=0.05, help="Stub TTS latency per 100 characters (s)")
+    args = parser.parse_args()
+
+    from benchmarks.mock_groq import LatencyModel, create_app
+
+    start_server(create_app(LatencyModel.parse(args.chat_latency), LatencyModel.parse(args.stt_latency),
+                            token_delay=args.token_delay), args.mock_port)
+    backend = start_backend(args)
+    base_url = f"http://127.0.0.1:{args.port}"
+    limits = httpx.Limits(max_connections=args.concurrency * 2, max_keepalive_connections=args.concurrency * 2)
+    results: Dict[str, tuple] = {}
+    try:
+        async with httpx.AsyncClient(base_url=base_url, timeout=300, limits=limits) as client:
+            await wait_for_backend(client, backend)
+            for transport in args.transports.split(","):
+                turns = TurnRecorder()
+                semaphore = asyncio.Semaphore(args.concurrency)
+
+                async def limited(index):
+                    async with semaphore:
+                        if transport == "ws":
+                            await ws_interview(client, f"ws://127.0.0.1:{args.port}", turns, index)
+                        else:
+                            await rest_interview(client, turns, index, stream=transport == "sse")
+
+                cpu_before = await server_cpu_seconds(client)
+                started = time.perf_counter()
+                await asyncio.gather(*(limited(index) for index in range(args.interviews)))
+                elapsed = time.perf_counter() - started
+                cpu = await server_cpu_seconds(client) - cpu_before
+                results[transport] = (turns, elapsed, cpu)
+    finally:
+        backend.terminate()
+        backend.wait()
+
+    print(f"\n{args.interviews} interviews per transport at concurrency {args.concurrency}, "
+          f"mock LLM {args.chat_latency}s, STT {args.stt_latency}s\n")
+    print(f"{'transport':<10}{'turns':>7}{'failed':>8}{'text p50':>10}{'turn p50':>10}{'turn p95':>10}"
+          f"{'elapsed (s)':>13}{'server CPU (s)':>16}{'CPU/turn (ms)':>15}")
+    for transport, (turns, elapsed, cpu) in results.items():
+        text, turn = sorted(turns.text_seconds), sorted(turns.turn_seconds)
+        print(f"{transport:<10}{len(turn):>7}{turns.failures:>8}{percentile(text, 0.5):>10.3f}{percentile(turn, 0.5):>10.3f}"
+              f"{percentile(turn, 0.95):>10.3f}{elapsed:>13.2f}{cpu:>16.2f}{1000 * cpu / max(1, len(turn)):>15.1f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -8,6 +8,167 @@ class Settings(BaseSettings):
     """
     GROQ_API_KEY: str = "" # Keep this empty string for Canvas environment; it's injected automatically.
 
+    # Run answer evaluation concurrently with next question generation + TTS in /submit-answer.
+    # Set to False to fall back to the sequential (evaluate, then generate) execution.
+    PIPELINE_SUBMIT_ANSWER: bool = True
+
+    # Number of threads used for blocking gTTS calls per worker.
+    BLOCKING_IO_POOL_SIZE: int = 8
+
+    # Shared Groq HTTP client (LLM + Whisper). GROQ_MAX_INFLIGHT caps concurrent Groq calls per worker.
+    # Requests and tokens are rate limited per model, starting from GROQ_TOKENS_PER_MINUTE and following the
+    # x-ratelimit-* response headers. Groq only reports a daily request limit, which the request budget follows
+    # unless a per-minute cap is set: GROQ_REQUESTS_PER_MINUTE for every model (0: none), or per model with
+    # GROQ_MODEL_REQUESTS_PER_MINUTE ("model=rpm,..."). 429/5xx responses are retried with jittered backoff.
+    # Point GROQ_API_BASE_URL at benchmarks/mock_groq.py to run without Groq.
+    GROQ_API_BASE_URL: str = "https://api.groq.com/openai/v1"
+    GROQ_MAX_INFLIGHT: int = 32
+    GROQ_MAX_CONNECTIONS: int = 64
+    GROQ_MAX_KEEPALIVE_CONNECTIONS: int = 32
+    GROQ_HTTP2: bool = True
+    GROQ_REQUESTS_PER_MINUTE: float = 0
+    GROQ_MODEL_REQUESTS_PER_MINUTE: str = ""
+    GROQ_TOKENS_PER_MINUTE: float = 6000
+    GROQ_MAX_RETRIES: int = 3
+
+    # LLM model routing (services/model_router.py). LLM_ROUTES sends calls to LLM_FAST_MODEL or LLM_LARGE_MODEL:
+    # comma-separated call_type[:question_type]=fast|large entries, the most specific one wins; unlisted calls
+    # use the large model. Call types: generate_question, stream_question, evaluate_answer, stream_evaluation,
+    # overall_evaluation, resume_extraction. With LLM_ESCALATION, fast-model output that fails validation
+    # (not the expected JSON, or a preamble instead of a question) is regenerated by the large model.
+    LLM_FAST_MODEL: str = "llama3-8b-8192"
+    LLM_LARGE_MODEL: str = "llama3-70b-8192"
+    LLM_ROUTES: str = "generate_question=fast,stream_question=fast,resume_extraction=fast,evaluate_answer:generic_intro=fast"
+    LLM_ESCALATION: bool = True
+
+    # TTS audio cache. Memory tier is an LRU bounded by entries and bytes;
+    # set TTS_CACHE_DIR to a directory to enable the persistent disk tier.
+    TTS_CACHE_MAX_ENTRIES: int = 256
+    TTS_CACHE_MAX_BYTES: int = 64 * 1024 * 1024
+    TTS_CACHE_DIR: str = ""
+
+    # Speech synthesis backend: "gtts", or "stub" (silent audio after TTS_STUB_LATENCY_SECONDS per
+    # gTTS-sized part) for load tests that must not call Google TTS. See benchmarks/load_test.py.
+    TTS_BACKEND: str = "gtts"
+    TTS_STUB_LATENCY_SECONDS: float = 0.3
+
+    # Stream the next question from the LLM and synthesize it sentence by sentence while it is
+    # still being generated (lower time-to-first-audio). False waits for the full text first.
+    STREAM_QUESTION_GENERATION: bool = True
+
+    # Question bank: "serve" answers bankable question types (see services/question_bank.py) from
+    # data/question_bank.json when an unasked question matches the resume skills, falling back to the LLM;
+    # "fill" also adds reusable LLM-generated questions to QUESTION_BANK_LEARNED_PATH; "off" always uses the LLM.
+    QUESTION_BANK_MODE: str = "serve"
+    QUESTION_BANK_PATH: str = "data/question_bank.json"
+    QUESTION_BANK_LEARNED_PATH: str = ""
+    QUESTION_BANK_MIN_SKILL_OVERLAP: int = 1
+
+    # Generated and bank questions whose keyword similarity to an already asked question reaches
+    # QUESTION_DEDUP_THRESHOLD are rejected before TTS, and the LLM is asked again (up to
+    # QUESTION_DEDUP_MAX_RETRIES times) with the rejected draft in the prompt. 0 disables the check.
+    # With QUESTION_HISTORY_TOPICS, prompts list a few topic keywords per previous question instead of its text.
+    QUESTION_DEDUP_THRESHOLD: float = 0.45
+    QUESTION_DEDUP_MAX_RETRIES: int = 1
+    QUESTION_HISTORY_TOPICS: bool = True
+
+    # Questions per interview, including the introduction. Questions after the fifth use the
+    # hr_advanced_situational / technical_system_design types.
+    MAX_QUESTIONS_PER_INTERVIEW: int = 5
+
+    # Overall evaluation at the end of the interview. Score aggregates and the best and worst answers
+    # are kept after each answer (services/evaluation_summary.py). "compact" prompts the LLM with those
+    # aggregates, "full" with every question, answer and feedback, and "fast" builds the report
+    # from the aggregates without an LLM call.
+    OVERALL_EVALUATION_MODE: str = "compact"
+
+    # Maximum number of question audio clips kept per worker for /audio/{session_id}/{question_id}.
+    AUDIO_STORE_MAX_CLIPS: int = 512
+
+    # Question audio formats besides the TTS MP3 ("mp3"): "mp3-low" (16 kHz mono MP3) and "opus" (Opus in WebM),
+    # transcoded with ffmpeg when a client asks for them (?format= on /audio, ?audio_format= on the WebSocket).
+    # Clients sending "Save-Data: on" get AUDIO_SAVE_DATA_FORMAT unless they ask for a format.
+    # FFMPEG_PATH defaults to ffmpeg on the PATH; without ffmpeg, only "mp3" is served.
+    FFMPEG_PATH: str = ""
+    AUDIO_MP3_LOW_BITRATE_KBPS: int = 16
+    AUDIO_OPUS_BITRATE_KBPS: int = 12
+    AUDIO_SAVE_DATA_FORMAT: str = "mp3-low"
+
+    # Answer audio uploaded in segments while the candidate speaks (/answer-audio/segment) is transcribed
+    # in the background, so /submit-answer only transcribes the tail. Limits per worker.
+    # With SESSION_STORE_BACKEND="redis", finished segment transcripts are shared through the session store, so
+    # segments and the submit may reach different workers (the submit waits up to ANSWER_SEGMENTS_SHARED_WAIT_SECONDS
+    # for segments still transcribed elsewhere); with "memory", run one worker or route each session to one worker.
+    # Segments still missing at submit are rejected (409) and uploaded again by the client.
+    ANSWER_SEGMENTS_MAX_PENDING_ANSWERS: int = 1024
+    ANSWER_SEGMENTS_MAX_PER_ANSWER: int = 64
+    ANSWER_SEGMENT_MAX_BYTES: int = 5 * 1024 * 1024
+    ANSWER_SEGMENTS_SHARED_WAIT_SECONDS: float = 5.0
+
+    # WebSocket interview channel (/ws/interview/{session_id}): messages queued per connection before the
+    # server waits for the client to read (backpressure), and the largest answer audio accepted per answer.
+    WS_SEND_QUEUE_SIZE: int = 32
+    WS_MAX_ANSWER_BYTES: int = 25 * 1024 * 1024
+
+    # Local voice activity detection on answer audio (WebM needs ffmpeg, see FFMPEG_PATH; WAV is decoded natively).
+    # Answers without speech skip STT and the evaluation LLM call and get a fixed low score; leading and
+    # trailing silence longer than VAD_MIN_TRIM_SECONDS is cut before STT (keeping VAD_PADDING_SECONDS).
+    VAD_ENABLED: bool = True
+    VAD_THRESHOLD_DBFS: float = -45.0
+    VAD_MIN_SPEECH_SECONDS: float = 0.3
+    VAD_PADDING_SECONDS: float = 0.3
+    VAD_MIN_TRIM_SECONDS: float = 1.0
+
+    # Speculatively generate the next question (and its audio) while the candidate answers.
+    # Opt-in; SPECULATIVE_MAX_INFLIGHT caps concurrently running speculations per worker. Speculations that
+    # are never used (abandoned sessions) are dropped after SESSION_TTL_SECONDS, or beyond SESSION_MAX_IN_MEMORY.
+    SPECULATIVE_NEXT_QUESTION: bool = False
+    SPECULATIVE_MAX_INFLIGHT: int = 16
+
+    # Session storage: "memory" (single worker, idle TTL + LRU bound) or "redis"
+    # (shared by all workers/replicas, required when running more than one worker).
+    SESSION_STORE_BACKEND: str = "memory"
+    SESSION_TTL_SECONDS: int = 3600
+    SESSION_MAX_IN_MEMORY: int = 10000
+    REDIS_URL: str = "redis://localhost:6379/0"
+
+    # Token budget (~4 characters per token) of the resume summary sent with every interview prompt.
+    # Skills and projects are ranked by relevance and trimmed to fit.
+    RESUME_SUMMARY_TOKEN_BUDGET: int = 400
+
+    # Parsed resumes are cached by content hash (skips parsing and the LLM extraction call).
+    RESUME_CACHE_MAX_ENTRIES: int = 512
+
+    # Resume fields are extracted locally (regexes + section headers); only fields with a confidence
+    # below RESUME_LOCAL_MIN_CONFIDENCE are requested from the LLM. False sends every resume to the LLM.
+    RESUME_LOCAL_EXTRACTION: bool = True
+    RESUME_LOCAL_MIN_CONFIDENCE: float = 0.75
+
+    # Resume text extraction runs in a process pool with per-document guards.
+    # The wall-clock timeout (which kills the extracting process) is twice the CPU limit, counted from when
+    # a worker picks the document up; documents wait for one of the RESUME_EXTRACTION_WORKERS.
+    RESUME_EXTRACTION_WORKERS: int = 2
+    RESUME_MAX_BYTES: int = 5 * 1024 * 1024
+    RESUME_MAX_PAGES: int = 20
+    RESUME_EXTRACTION_CPU_SECONDS: float = 10.0
+
+    # /bulk-parse-resumes: default and maximum number of resumes parsed concurrently per request.
+    BULK_PARSE_CONCURRENCY: int = 4
+    BULK_PARSE_MAX_CONCURRENCY: int = 16
+    BULK_MAX_FILES: int = 500
+    # Caps on the uploaded bytes per request and on the bytes decompressed from a ZIP archive.
+    BULK_MAX_UPLOAD_BYTES: int = 100 * 1024 * 1024
+    BULK_MAX_EXTRACTED_BYTES: int = 200 * 1024 * 1024
+
+    # Logging goes through a bounded queue to a background writer thread ("json" or "text" lines).
+    # Fields are truncated to LOG_MAX_FIELD_CHARS; verbose payloads (raw LLM responses) are only
+    # kept for LOG_PAYLOAD_SAMPLE_RATE of the records. Records are dropped if the queue is full.
+    LOG_LEVEL: str = "INFO"
+    LOG_FORMAT: str = "json"
+    LOG_MAX_FIELD_CHARS: int = 500
+    LOG_PAYLOAD_SAMPLE_RATE: float = 0.01
+    LOG_QUEUE_SIZE: int = 10000
+
     class Config:
         env_file = ".env"
         env_file_encoding = "utf-8"
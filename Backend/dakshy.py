@@ -1,22 +1,58 @@
 # dakshy.py
-print("--- LOADING MAIN.PY WITH UNIQUE ID: 20250613_Backend_Local_V1_FullAudio_FinalNoSpaces_EnhancedInterview ---")
-
-from fastapi import FastAPI, UploadFile, File, Form, HTTPException
-from fastapi.responses import JSONResponse
+# UNIQUE ID: 20250613_Backend_Local_V1_FullAudio_FinalNoSpaces_EnhancedInterview
+from fastapi import FastAPI, UploadFile, File, Form, Query, HTTPException, Request, WebSocket, WebSocketDisconnect
+from fastapi.responses import JSONResponse, Response, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, AsyncIterator, Tuple
+import copy
 import json
+import os
 import uuid
 import base64
+import time
+import asyncio
+import logging
 
 from config import settings
+from services.structured_logging import setup_logging, bind_session, logging_stats
 from services.resume_parser import parse_resume
-from services.groq_service import GroqService
+from services.groq_service import GroqService, DUMMY_MP3_BASE64
+from services.groq_http import GroqHTTPClient, parse_model_limits
+from services.model_router import ModelRouter, parse_routes
+from services.tts_cache import TTSCache
+from services.audio_store import AudioStore, AudioClip, parse_range_header
+from services.audio_codec import AudioTranscoder, AUDIO_FORMATS, SOURCE_FORMAT, negotiate_audio_format
+from services.answer_segments import AnswerSegmentStore, MissingAnswerSegmentsError
+from services.ws_channel import WebSocketSender
+from services.voice_activity import VoiceActivityDetector
+from services.speculation import SpeculativeQuestionManager
+from services.session_store import create_session_store, SessionNotFoundError
+from services.resume_cache import ResumeParseCache
+from services.extraction_pool import DocumentExtractionPool
+from services.bulk_intake import extract_resumes_from_zip, stream_bulk_parse
+from services.text_stream import SentenceBuffer
+from services.resume_summary import build_resume_summary
+from services.question_bank import QuestionBank
+from services.question_similarity import QuestionSimilarityIndex, DuplicateQuestionError
+from services.evaluation_summary import new_running_evaluation, update_running_evaluation, build_running_evaluation, local_overall_evaluation
+from services.metrics import (
+    REGISTRY, CONTENT_TYPE as METRICS_CONTENT_TYPE, HTTPMetricsMiddleware, STAGE_SECONDS, TIME_TO_FIRST_AUDIO_SECONDS,
+    PAYLOAD_BYTES, VAD_RESULTS, QUESTION_BANK_LOOKUPS, QUESTION_DUPLICATES, SESSIONS_ACTIVE, WEBSOCKETS_ACTIVE, TURNS_IN_FLIGHT, AUDIO_CLIPS_IN_PROGRESS, GROQ_INFLIGHT, BLOCKING_POOL_QUEUED
+)
 from models.interview_models import (
     ResumeInfo, Question, InterviewStartResponse, SubmitAnswerRequest, SubmitAnswerResponse,
     OverallEvaluation, GetNextQuestionRequest, GetQuestionResponse
 )
 
+setup_logging(
+    level=settings.LOG_LEVEL,
+    log_format=settings.LOG_FORMAT,
+    max_field_chars=settings.LOG_MAX_FIELD_CHARS,
+    payload_sample_rate=settings.LOG_PAYLOAD_SAMPLE_RATE,
+    queue_size=settings.LOG_QUEUE_SIZE
+)
+logger = logging.getLogger("dakshy")
+
 app = FastAPI(
     title="AI Interviewer Backend",
     description="Backend API for managing AI-powered interviews.",
@@ -30,6 +66,7 @@ origins = [
     "*"
 ]
 
+app.add_middleware(HTTPMetricsMiddleware)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=origins,
@@ -38,11 +75,731 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-groq_service = GroqService(api_key=settings.GROQ_API_KEY)
+tts_cache = TTSCache(
+    max_entries=settings.TTS_CACHE_MAX_ENTRIES,
+    max_bytes=settings.TTS_CACHE_MAX_BYTES,
+    disk_dir=settings.TTS_CACHE_DIR or None
+)
+groq_http = GroqHTTPClient(
+    api_key=settings.GROQ_API_KEY,
+    base_url=settings.GROQ_API_BASE_URL,
+    max_inflight=settings.GROQ_MAX_INFLIGHT,
+    max_connections=settings.GROQ_MAX_CONNECTIONS,
+    max_keepalive_connections=settings.GROQ_MAX_KEEPALIVE_CONNECTIONS,
+    requests_per_minute=settings.GROQ_REQUESTS_PER_MINUTE,
+    model_requests_per_minute=parse_model_limits(settings.GROQ_MODEL_REQUESTS_PER_MINUTE),
+    tokens_per_minute=settings.GROQ_TOKENS_PER_MINUTE,
+    max_retries=settings.GROQ_MAX_RETRIES,
+    http2=settings.GROQ_HTTP2
+)
+# Latency-sensitive LLM calls go to the fast model, escalating to the large one when the output fails validation.
+model_router = ModelRouter(
+    fast_model=settings.LLM_FAST_MODEL,
+    large_model=settings.LLM_LARGE_MODEL,
+    routes=parse_routes(settings.LLM_ROUTES),
+    escalation=settings.LLM_ESCALATION
+)
+groq_service = GroqService(
+    api_key=settings.GROQ_API_KEY,
+    blocking_pool_size=settings.BLOCKING_IO_POOL_SIZE,
+    tts_cache=tts_cache,
+    http_client=groq_http,
+    resume_summary_token_budget=settings.RESUME_SUMMARY_TOKEN_BUDGET,
+    tts_backend=settings.TTS_BACKEND,
+    tts_stub_latency_seconds=settings.TTS_STUB_LATENCY_SECONDS,
+    question_history_topics=settings.QUESTION_HISTORY_TOPICS,
+    model_router=model_router
+)
+
+# Parsed resumes by content hash, so retries and reuse across domains skip parsing and the LLM call.
+resume_cache = ResumeParseCache(max_entries=settings.RESUME_CACHE_MAX_ENTRIES)
+# PDF/DOCX text extraction is CPU-bound; it runs in worker processes, not on the event loop.
+extraction_pool = DocumentExtractionPool(
+    max_workers=settings.RESUME_EXTRACTION_WORKERS,
+    timeout_seconds=2 * settings.RESUME_EXTRACTION_CPU_SECONDS
+)
+
+# Question audio is synthesized in the background and served by /audio/{session_id}/{question_id}.
+audio_store = AudioStore(max_clips=settings.AUDIO_STORE_MAX_CLIPS)
+# Smaller question audio formats for clients on slow links, transcoded on demand and kept with the clip.
+audio_transcoder = AudioTranscoder(
+    ffmpeg_path=settings.FFMPEG_PATH or None,
+    bitrates_kbps={"mp3-low": settings.AUDIO_MP3_LOW_BITRATE_KBPS, "opus": settings.AUDIO_OPUS_BITRATE_KBPS}
+)
+
+# Silent answers are detected locally and skip STT and evaluation; silence around speech is trimmed before STT.
+voice_activity = None
+if settings.VAD_ENABLED:
+    voice_activity = VoiceActivityDetector(
+        threshold_dbfs=settings.VAD_THRESHOLD_DBFS,
+        min_speech_seconds=settings.VAD_MIN_SPEECH_SECONDS,
+        padding_seconds=settings.VAD_PADDING_SECONDS,
+        min_trim_seconds=settings.VAD_MIN_TRIM_SECONDS,
+        blocking_pool=groq_service.blocking_pool,
+        ffmpeg_path=settings.FFMPEG_PATH or None
+    )
+
+# Opt-in (SPECULATIVE_NEXT_QUESTION): the next question is generated while the candidate is answering.
+# An unused speculative question's audio is dropped from the audio store.
+speculation = SpeculativeQuestionManager(
+    max_inflight=settings.SPECULATIVE_MAX_INFLIGHT,
+    on_discard=lambda session_id, result: audio_store.discard(session_id, result[0].id),
+    ttl_seconds=settings.SESSION_TTL_SECONDS,
+    max_entries=settings.SESSION_MAX_IN_MEMORY
+)
+
+# Interview sessions (resume, domain, questions asked, answers) live in a pluggable store:
+# in-process with TTL/LRU eviction by default, or Redis so several workers/replicas share them.
+session_store = create_session_store(
+    backend=settings.SESSION_STORE_BACKEND,
+    ttl_seconds=settings.SESSION_TTL_SECONDS,
+    max_sessions=settings.SESSION_MAX_IN_MEMORY,
+    redis_url=settings.REDIS_URL
+)
+
+
+async def save_segment_transcript(session_id: str, question_id: str, index: int, transcript: str):
+    def add_transcript(session: Dict[str, Any]):
+        session.setdefault("segment_transcripts", {}).setdefault(question_id, {})[str(index)] = transcript
+    await session_store.update(session_id, add_transcript)
+
+
+async def load_segment_transcripts(session_id: str, question_id: str) -> Dict[int, str]:
+    session = await session_store.get(session_id) or {}
+    return {int(index): transcript for index, transcript in session.get("segment_transcripts", {}).get(question_id, {}).items()}
+
+
+# Answer audio segments uploaded during recording, transcribed in the background until the answer is submitted.
+# Shared sessions (Redis) also share the finished transcripts, since the submit may reach another worker.
+shared_segments = settings.SESSION_STORE_BACKEND == "redis"
+answer_segments = AnswerSegmentStore(
+    max_answers=settings.ANSWER_SEGMENTS_MAX_PENDING_ANSWERS,
+    max_segments_per_answer=settings.ANSWER_SEGMENTS_MAX_PER_ANSWER,
+    save_transcript=save_segment_transcript if shared_segments else None,
+    load_transcripts=load_segment_transcripts if shared_segments else None,
+    shared_wait_seconds=settings.ANSWER_SEGMENTS_SHARED_WAIT_SECONDS
+)
+
+# Precomputed questions for the generic stages; the LLM is only called when the bank has no good match.
+question_bank = None
+if settings.QUESTION_BANK_MODE in ("serve", "fill"):
+    question_bank = QuestionBank(
+        path=os.path.join(os.path.dirname(os.path.abspath(__file__)), settings.QUESTION_BANK_PATH),
+        learned_path=settings.QUESTION_BANK_LEARNED_PATH if settings.QUESTION_BANK_MODE == "fill" else None,
+        min_skill_overlap=settings.QUESTION_BANK_MIN_SKILL_OVERLAP
+    )
+# Background writes of learned bank questions; referenced so they are not garbage collected mid-write.
+background_tasks = set()
+
+MAX_QUESTIONS_PER_INTERVIEW = settings.MAX_QUESTIONS_PER_INTERVIEW # This includes the initial "Tell me about yourself"
+HR_DOMAINS = ["hr", "human resources", "recruitment", "managerial", "non-technical"]
+# Transcript and evaluation of an answer without speech (timed out, empty or silent recording).
+NO_ANSWER_TRANSCRIPT = "No answer provided (timeout)."
+NO_ANSWER_FEEDBACK = ("No speech was detected in your answer, so it could not be evaluated. Check that your microphone "
+                      "is working and answer the question out loud before the time runs out.")
+# Fixed part of the first question. Synthesized separately from the name segment so its audio is cached once.
+GREETING_SUFFIX = "thank you for joining. To start, could you please tell me a bit about yourself and walk me through your resume?"
+
+
+def get_next_question_type_tag(num_prev_q: int, domain_str: str) -> str:
+    """Determine the question type tag based on the number of previous questions."""
+    is_hr_domain = domain_str.lower() in HR_DOMAINS
+    if num_prev_q == 1: return "resume_deep_dive"
+    elif num_prev_q == 2: return "hr_behavioral_foundational" if is_hr_domain else "technical_foundational"
+    elif num_prev_q == 3: return "hr_behavioral_deep" if is_hr_domain else "technical_problem_solving"
+    elif num_prev_q == 4: return "hr_concluding" if is_hr_domain else "technical_advanced"
+    else: # Fallback for more questions
+        return "hr_advanced_situational" if is_hr_domain else "technical_system_design"
+
+
+async def parse_uploaded_resume(file_content: bytes, filename: str) -> Dict[str, Any]:
+    """Parses a resume with the configured cache, extraction pool and size guards."""
+    return await parse_resume(
+        file_content, filename, groq_service,
+        cache=resume_cache,
+        extraction_pool=extraction_pool,
+        max_bytes=settings.RESUME_MAX_BYTES,
+        max_pages=settings.RESUME_MAX_PAGES,
+        cpu_time_limit=settings.RESUME_EXTRACTION_CPU_SECONDS,
+        local_min_confidence=settings.RESUME_LOCAL_MIN_CONFIDENCE if settings.RESUME_LOCAL_EXTRACTION else None
+    )
+
+
+def add_question_to_session(session: Dict[str, Any], question: Question) -> List[Dict[str, Any]]:
+    """Session mutator: records a delivered question. Returns the updated question history."""
+    session["current_question"] = question.dict()
+    session["questions_asked"].append({"id": question.id, "text": question.text, "type": question.type})
+    return list(session["questions_asked"])
+
+
+async def end_session(session_id: str):
+    """Removes all state of a finished interview."""
+    await session_store.delete(session_id)
+    audio_store.drop_session(session_id)
+    answer_segments.drop_session(session_id)
+    speculation.cancel(session_id)
+    logger.info("Session data cleaned up.")
+
+
+def question_audio_url(session_id: str, question_id: str) -> str:
+    return f"/audio/{session_id}/{question_id}"
+
+
+def question_audio_segments(question: Dict[str, Any]) -> List[str]:
+    """Text segments to synthesize for a question (the greeting is split so its fixed part is cached)."""
+    text = question["text"]
+    if question.get("type") == "generic_intro" and text.endswith(f" {GREETING_SUFFIX}"):
+        return [text[:-len(GREETING_SUFFIX) - 1], GREETING_SUFFIX]
+    return [text]
+
+
+async def iterate_segments(segments: List[str]) -> AsyncIterator[str]:
+    for segment in segments:
+        yield segment
+
+
+async def queue_segments(queue: asyncio.Queue) -> AsyncIterator[str]:
+    """Yields segments put on the queue until a None sentinel."""
+    while (segment := await queue.get()) is not None:
+        yield segment
+
+
+async def produce_question_audio(clip: AudioClip, segments: AsyncIterator[str],
+                                 started: Optional[float] = None, mode: str = "buffered"):
+    """
+    Synthesizes the text segments into the clip chunk by chunk, so it can be streamed while in progress.
+    If `started` (a perf_counter timestamp) is given, the time to the first audio chunk is recorded.
+    """
+    synthesis_started = time.perf_counter()
+    try:
+        async for segment in segments:
+            async for chunk in groq_service.stream_speech(segment):
+                if started is not None and not clip.chunks:
+                    audio_store.record_first_audio(time.perf_counter() - started, mode)
+                    TIME_TO_FIRST_AUDIO_SECONDS.observe(time.perf_counter() - started, mode=mode)
+                await clip.append(chunk)
+        STAGE_SECONDS.observe(time.perf_counter() - synthesis_started, stage="tts")
+        PAYLOAD_BYTES.observe(sum(len(chunk) for chunk in clip.chunks), kind="question_audio")
+    except asyncio.CancelledError:
+        raise
+    except Exception as e:
+        logger.error("Question audio synthesis failed: %s", e)
+        if not clip.chunks:
+            # Fallback to a dummy audio if gTTS fails
+            logger.warning("Falling back to dummy TTS audio.")
+            await clip.append(base64.b64decode(DUMMY_MP3_BASE64))
+    finally:
+        await clip.finish()
+
+
+async def question_audio_clip(session_id: str, question_id: str) -> Optional[AudioClip]:
+    """A question's audio clip, or None if the question is not in the session."""
+    clip = audio_store.get(session_id, question_id)
+    if clip is None:
+        # The question may have been delivered by another worker (shared session store):
+        # synthesize it here from the stored question text (usually a TTS cache hit).
+        session = await session_store.get(session_id)
+        question = next((q for q in session["questions_asked"] if q["id"] == question_id), None) if session else None
+        if question is None:
+            return None
+        start_question_audio(session_id, question_id, question_audio_segments(question))
+        clip = audio_store.get(session_id, question_id)
+    return clip
+
+
+async def question_audio_variant(session_id: str, question_id: str, audio_format: str) -> Optional[AudioClip]:
+    """A question's audio in the given format, transcoding it (once per clip) if needed."""
+    clip = await question_audio_clip(session_id, question_id)
+    if clip is None or audio_format == SOURCE_FORMAT:
+        return clip
+    variant = clip.variants.get(audio_format)
+    if variant is None:
+        variant = AudioClip(media_type=AUDIO_FORMATS[audio_format].media_type)
+        clip.variants[audio_format] = variant
+        variant.producer_task = asyncio.create_task(transcode_question_audio(clip, variant, audio_format))
+    return variant
+
+
+async def transcode_question_audio(clip: AudioClip, variant: AudioClip, audio_format: str):
+    started = time.perf_counter()
+    try:
+        await audio_transcoder.transcode(clip, variant, audio_format)
+    except asyncio.CancelledError:
+        raise
+    except Exception as e:
+        logger.error("Question audio transcoding failed: %s", e, extra={"format": audio_format})
+        clip.variants.pop(audio_format, None) # Retried on the next request
+        return
+    STAGE_SECONDS.observe(time.perf_counter() - started, stage="transcode")
+    PAYLOAD_BYTES.observe(sum(len(chunk) for chunk in variant.chunks), kind=f"question_audio_{audio_format}")
+
+
+def start_question_audio(session_id: str, question_id: str, segments: List[str], started: Optional[float] = None) -> str:
+    """Starts background synthesis of a question's audio and returns the URL it is served from."""
+    clip = audio_store.create(session_id, question_id)
+    clip.producer_task = asyncio.create_task(produce_question_audio(clip, iterate_segments(segments), started))
+    return question_audio_url(session_id, question_id)
+
+
+async def stream_question_with_audio(session: Dict[str, Any], question_id: str, started: float,
+                                    similarity_index: Optional[QuestionSimilarityIndex] = None,
+                                    rejected: Optional[DuplicateQuestionError] = None,
+                                    question_type: Optional[str] = None) -> str:
+    """
+    Streams the next question from the LLM and synthesizes it sentence by sentence:
+    each completed sentence is handed to TTS while the following one is still being
+    generated, and its audio is appended to the clip (and streamed to the client) right away.
+    With similarity_index, the text so far is checked before each sentence goes to TTS, and
+    DuplicateQuestionError is raised (dropping the clip) for a near-duplicate question.
+    Returns the full question text.
+    """
+    session_id = session["session_id"]
+    sentences: asyncio.Queue = asyncio.Queue()
+    clip = audio_store.create(session_id, question_id)
+    clip.producer_task = asyncio.create_task(
+        produce_question_audio(clip, queue_segments(sentences), started, mode="streamed")
+    )
+    sentence_buffer = SentenceBuffer()
+    text_parts = []
+    question_stream = groq_service.stream_question(
+        resume_info=session["resume_info"],
+        resume_summary=session.get("resume_summary"),
+        domain=session["domain"],
+        previous_questions=list(session["questions_asked"]),
+        rejected_question=rejected.question_text if rejected else None,
+        similar_to=rejected.similar_to if rejected else None,
+        question_type=question_type
+    )
+    try:
+        async for delta in question_stream:
+            text_parts.append(delta)
+            for sentence in sentence_buffer.feed(delta):
+                if similarity_index is not None:
+                    similarity_index.check("".join(text_parts))
+                sentences.put_nowait(sentence)
+        remainder = sentence_buffer.flush()
+        if similarity_index is not None:
+            similarity_index.check("".join(text_parts))
+    except BaseException:
+        audio_store.discard(session_id, question_id)
+        raise
+    finally:
+        await question_stream.aclose()
+    if remainder:
+        sentences.put_nowait(remainder)
+    sentences.put_nowait(None)
+    return "".join(text_parts).strip()
+
+
+async def prepare_next_question(session: Dict[str, Any]):
+    """
+    Returns the next question for a session and its audio URL, using the speculatively
+    generated question if one was prepared for the current question history.
+    """
+    if settings.SPECULATIVE_NEXT_QUESTION:
+        speculative_result = await speculation.take(session["session_id"], len(session["questions_asked"]))
+        if speculative_result is not None:
+            logger.info("Using speculatively generated question.")
+            return speculative_result
+    return await generate_next_question(session)
+
+
+def schedule_speculative_question(session: Dict[str, Any], questions_asked: List[Dict[str, Any]]):
+    """
+    Starts generating the next question (text and audio) in the background right after a
+    question is delivered. The prompt only depends on the resume, domain and question
+    history, not on the answer being recorded.
+    """
+    if not settings.SPECULATIVE_NEXT_QUESTION:
+        return
+    if len(questions_asked) >= MAX_QUESTIONS_PER_INTERVIEW:
+        return # The answer to this question ends the interview
+    snapshot = {**session, "questions_asked": questions_asked}
+    speculation.schedule(snapshot["session_id"], len(questions_asked), lambda: generate_next_question(snapshot))
+
+
+async def generate_next_question(session: Dict[str, Any]):
+    """
+    Generates the next question for a session snapshot and starts synthesizing its TTS audio.
+    Does not modify any session state, so it can safely run concurrently with the
+    evaluation of the previous answer.
+    """
+    session_id = session["session_id"]
+    domain_str = session["domain"]
+    previous_questions = list(session["questions_asked"])
+    next_question_type_tag = get_next_question_type_tag(len(previous_questions), domain_str)
+    next_question_id = str(uuid.uuid4())
+    started = time.perf_counter()
+
+    similarity_index = question_similarity_index(session)
+    next_question_text = select_bank_question(session, next_question_type_tag, similarity_index)
+    from_bank = next_question_text is not None
+    if from_bank:
+        next_question_audio_url = start_question_audio(session_id, next_question_id, [next_question_text], started=started)
+    else:
+        next_question_text = await generate_llm_question(session, next_question_id, started, similarity_index, next_question_type_tag)
+        if settings.STREAM_QUESTION_GENERATION:
+            next_question_audio_url = question_audio_url(session_id, next_question_id)
+        else:
+            next_question_audio_url = start_question_audio(session_id, next_question_id, [next_question_text], started=started)
+    if not from_bank:
+        learn_bank_question(session, next_question_type_tag, next_question_text)
+    STAGE_SECONDS.observe(time.perf_counter() - started, stage="question_generation")
+    next_question = Question(id=next_question_id, text=next_question_text, type=next_question_type_tag)
+    logger.info("Next question generated.", extra={"question_type": next_question.type, "question_id": next_question.id,
+                                                   "source": "bank" if from_bank else "llm"})
+    return next_question, next_question_audio_url
+
+
+def question_similarity_index(session: Dict[str, Any]) -> Optional[QuestionSimilarityIndex]:
+    """Near-duplicate index of the session's asked questions (None if the check is disabled)."""
+    if settings.QUESTION_DEDUP_THRESHOLD <= 0:
+        return None
+    return QuestionSimilarityIndex([q["text"] for q in session["questions_asked"]], threshold=settings.QUESTION_DEDUP_THRESHOLD)
+
+
+async def generate_llm_question(session: Dict[str, Any], question_id: str, started: float,
+                                similarity_index: Optional[QuestionSimilarityIndex], question_type: Optional[str] = None) -> str:
+    """
+    Generates the next question with the LLM (streaming its audio with STREAM_QUESTION_GENERATION).
+    A near-duplicate of an asked question is regenerated with the rejected draft in the prompt,
+    up to QUESTION_DEDUP_MAX_RETRIES times; the last attempt is accepted as is.
+    """
+    rejected = None
+    for attempt in range(settings.QUESTION_DEDUP_MAX_RETRIES + 1):
+        check = similarity_index if attempt < settings.QUESTION_DEDUP_MAX_RETRIES else None
+        try:
+            if settings.STREAM_QUESTION_GENERATION:
+                return await stream_question_with_audio(session, question_id, started, check, rejected, question_type)
+            question_text = await groq_service.generate_question(
+                resume_info=session["resume_info"],
+                resume_summary=session.get("resume_summary"),
+                domain=session["domain"],
+                previous_questions=list(session["questions_asked"]), # Pass full history
+                rejected_question=rejected.question_text if rejected else None,
+                similar_to=rejected.similar_to if rejected else None,
+                question_type=question_type
+            )
+            if check is not None:
+                check.check(question_text)
+            return question_text
+        except DuplicateQuestionError as e:
+            QUESTION_DUPLICATES.inc(source="llm")
+            logger.info("Rejected near-duplicate question; regenerating.", extra={"similarity": round(e.similarity, 2), "attempt": attempt + 1})
+            rejected = e
+
+
+def select_bank_question(session: Dict[str, Any], question_type: str,
+                         similarity_index: Optional[QuestionSimilarityIndex] = None) -> Optional[str]:
+    """An unasked bank question matching the session's domain, question type and resume skills, if any."""
+    if question_bank is None:
+        return None
+    question_text = question_bank.select(
+        session["domain"], question_type, session["resume_info"].get("skills", []),
+        asked_texts=[q["text"] for q in session["questions_asked"]]
+    )
+    if question_text is not None and similarity_index is not None:
+        try:
+            similarity_index.check(question_text)
+        except DuplicateQuestionError:
+            QUESTION_DUPLICATES.inc(source="bank")
+            question_text = None
+    QUESTION_BANK_LOOKUPS.inc(question_type=question_type, result="miss" if question_text is None else "hit")
+    return question_text
+
+
+def learn_bank_question(session: Dict[str, Any], question_type: str, question_text: str):
+    """In fill mode, adds a reusable LLM-generated question to the bank and persists it in the background."""
+    if settings.QUESTION_BANK_MODE != "fill" or question_bank is None:
+        return
+    if question_bank.learn(session["domain"], question_type, question_text, session["resume_info"].get("skills", [])):
+        task = asyncio.create_task(groq_service.blocking_pool.run(question_bank.save_learned))
+        background_tasks.add(task)
+        task.add_done_callback(background_tasks.discard)
+
+
+async def cancel_next_question(next_question_task: asyncio.Task, session_id: str):
+    """Cancels a next-question task whose question will never be delivered, dropping its audio."""
+    next_question_task.cancel()
+    await asyncio.gather(next_question_task, return_exceptions=True)
+    if not next_question_task.cancelled() and next_question_task.exception() is None:
+        # The question was generated before the cancellation; drop its audio.
+        audio_store.discard(session_id, next_question_task.result()[0].id)
+
+
+async def load_answered_question(session_id: str, question_id: str):
+    """Returns (session, question_text, question_type) for an answer submission, or raises 404."""
+    session = await session_store.get(session_id)
+    if session is None:
+        raise HTTPException(status_code=404, detail=f"Interview session {session_id} not found.")
+    for q_entry in session["questions_asked"]:
+        if q_entry["id"] == question_id:
+            return session, q_entry["text"], q_entry.get("type", "unknown") # Get type from history
+    raise HTTPException(status_code=404, detail=f"Question with ID {question_id} not found in session history for session {session_id}.")
+
+
+async def prepare_stt_audio(audio_content: bytes) -> Optional[bytes]:
+    """Answer audio to transcribe, with silence trimmed, or None if it contains no speech."""
+    if voice_activity is None:
+        return audio_content
+    with STAGE_SECONDS.time(stage="vad"):
+        audio_content, has_speech = await voice_activity.prepare(audio_content)
+    VAD_RESULTS.inc(result="undecoded" if has_speech is None else "speech" if has_speech else "silent")
+    return audio_content if has_speech is not False else None
+
+
+async def transcribe_segment(audio_content: bytes) -> str:
+    """Background transcription of an answer audio segment uploaded during recording."""
+    audio_content = await prepare_stt_audio(audio_content)
+    if audio_content is None:
+        return ""
+    with STAGE_SECONDS.time(stage="stt_segment"):
+        return await groq_service.speech_to_text(audio_content)
+
+
+async def transcribe_answer(session_id: str, audio_content: Optional[bytes], question_id: Optional[str] = None,
+                            segment_count: int = 0) -> str:
+    """
+    Transcribes an answer. With segment_count, the first segment_count segments were uploaded to
+    /answer-audio/segment during recording and audio_content is only the tail after them.
+    Raises MissingAnswerSegmentsError if some of those segments never arrived.
+    """
+    if not segment_count:
+        if audio_content is None:
+            return NO_ANSWER_TRANSCRIPT
+        if not audio_content:
+            logger.warning("audio_file was provided but its content was empty.")
+            return NO_ANSWER_TRANSCRIPT
+    if audio_content:
+        PAYLOAD_BYTES.observe(len(audio_content), kind="answer_audio")
+        audio_content = await prepare_stt_audio(audio_content)
+        if audio_content is None and not segment_count:
+            return NO_ANSWER_TRANSCRIPT
+    with STAGE_SECONDS.time(stage="stt"):
+        # Usually the segment transcriptions have finished while the candidate was still speaking.
+        segment_transcripts, tail_transcript = await asyncio.gather(
+            answer_segments.take(session_id, question_id, segment_count) if segment_count else asyncio.sleep(0, []),
+            groq_service.speech_to_text(audio_content) if audio_content else asyncio.sleep(0, "")
+        )
+    answer_transcript = " ".join(text.strip() for text in [*segment_transcripts, tail_transcript] if text and text.strip())
+    if not answer_transcript:
+        return NO_ANSWER_TRANSCRIPT
+    logger.info("Transcribed answer.", extra={"chars": len(answer_transcript), "segments": segment_count})
+    return answer_transcript
+
+
+async def evaluate_answer(session: Dict[str, Any], question_text: str, answer_transcript: str,
+                          question_type: Optional[str] = None) -> Dict[str, Any]:
+    """Evaluates an answer with the LLM; answers without speech get a fixed evaluation without any call."""
+    if answer_transcript == NO_ANSWER_TRANSCRIPT:
+        logger.info("No speech in answer; skipping evaluation.")
+        return {"feedback": NO_ANSWER_FEEDBACK, "score": 0.0}
+    return await groq_service.evaluate_answer(
+        question=question_text,
+        answer_transcript=answer_transcript,
+        resume_info=session["resume_info"],
+        resume_summary=session.get("resume_summary"),
+        domain=session["domain"],
+        question_type=question_type
+    )
+
+
+def make_answer_recorder(session_id: str, question_id: str, question_text: str, question_type: str,
+                         answer_transcript: str, is_timeout: bool):
+    """
+    Returns an async callback that stores an evaluated answer, folds it into the session's running
+    evaluation, and returns the answer history and the running evaluation.
+    """
+    async def record_answer(evaluation_result: Dict[str, Any]) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+        logger.info("Answer evaluated.", extra={"question_id": question_id, "score": evaluation_result["score"]})
+        answer_entry = {
+            "question_id": question_id,
+            "question_text": question_text,
+            "question_type": question_type, # Store question type
+            "answer_transcript": answer_transcript,
+            "feedback": evaluation_result["feedback"],
+            "score": evaluation_result["score"],
+            "is_timeout": is_timeout
+        }
+
+        def add_answer(session_to_update: Dict[str, Any]) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+            session_to_update["answers"].append(answer_entry)
+            session_to_update.get("segment_transcripts", {}).pop(question_id, None)
+            if "running_evaluation" not in session_to_update: # Session started before running evaluations
+                session_to_update["running_evaluation"] = build_running_evaluation(session_to_update["answers"][:-1])
+            running_evaluation = update_running_evaluation(session_to_update["running_evaluation"], answer_entry)
+            return list(session_to_update["answers"]), copy.deepcopy(running_evaluation)
+
+        with STAGE_SECONDS.time(stage="session_update"):
+            answers, running_evaluation = await session_store.update(session_id, add_answer)
+        logger.debug("Answer recorded.", extra={"answers": len(answers)})
+        return answers, running_evaluation
+    return record_answer
+
+
+def has_next_question(session: Dict[str, Any], force_end: bool) -> bool:
+    """Whether another question follows the answer being submitted. Known before the evaluation finishes."""
+    current_answered_questions_count = len(session["answers"]) + 1
+    return not force_end and current_answered_questions_count < MAX_QUESTIONS_PER_INTERVIEW
+
+
+async def deliver_next_question(session: Dict[str, Any], next_question: Question):
+    """Records the next question as delivered and starts speculating on the one after it."""
+    questions_asked = await session_store.update(session["session_id"], lambda s: add_question_to_session(s, next_question))
+    schedule_speculative_question(session, questions_asked)
+
+
+async def generate_overall_evaluation(session: Dict[str, Any], answers: List[Dict[str, Any]],
+                                      running_evaluation: Optional[Dict[str, Any]] = None) -> OverallEvaluation:
+    """Overall evaluation in the configured OVERALL_EVALUATION_MODE (full, compact or fast)."""
+    mode = settings.OVERALL_EVALUATION_MODE
+    if running_evaluation is None:
+        running_evaluation = session.get("running_evaluation") or build_running_evaluation(answers)
+    with STAGE_SECONDS.time(stage="overall_evaluation"):
+        if mode == "fast":
+            overall_evaluation_data = local_overall_evaluation(running_evaluation, session["domain"])
+        else:
+            overall_evaluation_data = await groq_service.get_overall_evaluation(
+                interview_history=answers, # Pass full answer history
+                resume_info=session["resume_info"],
+                resume_summary=session.get("resume_summary"),
+                domain=session["domain"],
+                running_evaluation=running_evaluation if mode == "compact" else None
+            )
+    logger.info("Overall evaluation generated.", extra={"mode": mode, "answers": len(answers)})
+    return OverallEvaluation(**overall_evaluation_data)
+
+
+async def finish_interview(session: Dict[str, Any], answers: List[Dict[str, Any]],
+                           running_evaluation: Dict[str, Any]) -> OverallEvaluation:
+    """Generates the overall evaluation and cleans up the session."""
+    session_id = session["session_id"]
+    overall_evaluation_model = await generate_overall_evaluation(session, answers, running_evaluation)
+
+    # Clean up session data
+    await end_session(session_id)
+    return overall_evaluation_model
+
+
+async def timed_stage(stage: str, awaitable):
+    """Awaits and records the duration of a pipeline stage."""
+    with STAGE_SECONDS.time(stage=stage):
+        return await awaitable
+
 
-interview_sessions: Dict[str, Dict[str, Any]] = {}
-questions_asked_history: Dict[str, List[Dict[str, Any]]] = {} # Stores {"id": str, "text": str, "type": str}
-answers_history: Dict[str, List[Dict[str, Any]]] = {}
+def json_response(content: Dict[str, Any]) -> JSONResponse:
+    """JSONResponse that records serialization time and response size."""
+    with STAGE_SECONDS.time(stage="serialization"):
+        response = JSONResponse(content=content)
+    PAYLOAD_BYTES.observe(len(response.body), kind="json_response")
+    return response
+
+
+def format_sse(event: str, data: Dict[str, Any]) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+async def evaluate_and_prepare_next(evaluation_coro, session: Dict[str, Any], record_answer):
+    """
+    Pipelined execution of the two independent branches of a turn: evaluating the
+    answer, and generating the next question plus its audio.
+    The evaluation is recorded (via record_answer) as soon as it finishes.
+    - If the evaluation fails, the question branch is cancelled and the error is raised,
+      leaving the session untouched (same as the sequential path).
+    - If the question branch fails, the evaluation is still awaited and recorded before
+      the error is raised (same as the sequential path, where the answer is recorded first).
+    """
+    evaluation_task = asyncio.create_task(evaluation_coro)
+    next_question_task = asyncio.create_task(prepare_next_question(session))
+    try:
+        evaluation_result = await evaluation_task
+    except BaseException:
+        await cancel_next_question(next_question_task, session["session_id"])
+        raise
+    await record_answer(evaluation_result)
+    next_question, next_question_audio_url = await next_question_task
+    return evaluation_result, next_question, next_question_audio_url
+
+
+async def answer_turn_events(session: Dict[str, Any], question_id: str, question_text: str, question_type: str,
+                             audio_content: Optional[bytes], is_timeout: bool, force_end: bool, segment_count: int,
+                             channel: str) -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
+    """
+    Processes an answer and yields the turn's (event, data) pairs, for /submit-answer/stream (as SSE)
+    and the interview WebSocket: transcript, feedback deltas, score, then question or
+    overall_evaluation; error if the turn fails. `channel` names the endpoint in logs.
+    Closing the generator early (client disconnect) cancels the prepared next question.
+    """
+    session_id = session["session_id"]
+    turn_started_at = time.perf_counter()
+    next_question_task = None
+    TURNS_IN_FLIGHT.inc()
+    try:
+        answer_transcript = await transcribe_answer(session_id, audio_content, question_id, segment_count)
+        yield "transcript", {"transcript": answer_transcript}
+
+        more_questions = has_next_question(session, force_end)
+        if more_questions and settings.PIPELINE_SUBMIT_ANSWER:
+            next_question_task = asyncio.create_task(prepare_next_question(session))
+
+        evaluation_result = None
+        if answer_transcript == NO_ANSWER_TRANSCRIPT:
+            evaluation_result = await evaluate_answer(session, question_text, answer_transcript, question_type)
+            yield "feedback", {"delta": evaluation_result["feedback"]}
+        else:
+            evaluation_started = time.perf_counter()
+            async for item in groq_service.stream_evaluation(
+                question=question_text,
+                answer_transcript=answer_transcript,
+                resume_info=session["resume_info"],
+                resume_summary=session.get("resume_summary"),
+                domain=session["domain"],
+                question_type=question_type
+            ):
+                if "feedback_delta" in item:
+                    yield "feedback", {"delta": item["feedback_delta"]}
+                else:
+                    evaluation_result = item
+            STAGE_SECONDS.observe(time.perf_counter() - evaluation_started, stage="evaluation")
+        record_answer = make_answer_recorder(session_id, question_id, question_text, question_type, answer_transcript, is_timeout)
+        answers, running_evaluation = await record_answer(evaluation_result)
+        yield "score", evaluation_result
+
+        if more_questions:
+            if next_question_task is None:
+                next_question_task = asyncio.create_task(prepare_next_question(session))
+            next_question, next_question_audio_url = await next_question_task
+            next_question_task = None
+            await deliver_next_question(session, next_question)
+            logger.info("Streamed turn processed.", extra={"latency_s": round(time.perf_counter() - turn_started_at, 3), "channel": channel})
+            yield "question", {
+                "next_action": "next_question",
+                "question": next_question.dict(),
+                "audio_url": next_question_audio_url,
+            }
+        else:
+            logger.info("Interview completed. Generating overall evaluation.")
+            overall_evaluation_model = await finish_interview(session, answers, running_evaluation)
+            yield "overall_evaluation", {
+                "next_action": "end_interview",
+                "overall_evaluation": overall_evaluation_model.dict(),
+            }
+    except MissingAnswerSegmentsError as e:
+        yield "error", {"status_code": 409, "detail": str(e), "missing_segments": e.missing}
+    except SessionNotFoundError:
+        logger.warning("Session disappeared during %s.", channel)
+        yield "error", {"status_code": 404, "detail": f"Interview session {session_id} not found."}
+    except ConnectionError as e:
+        logger.error("ConnectionError in %s: %s", channel, e)
+        yield "error", {"status_code": 503, "detail": f"Service Unavailable: Problem communicating with external AI service. {str(e)}"}
+    except Exception as e:
+        logger.exception("Unexpected error in %s.", channel)
+        yield "error", {"status_code": 500, "detail": f"Internal server error during answer submission: {str(e)}"}
+    finally:
+        TURNS_IN_FLIGHT.dec()
+        # Failed turn or client disconnect: the prepared question will not be delivered.
+        if next_question_task is not None:
+            await cancel_next_question(next_question_task, session_id)
 
 
 @app.post("/start-interview", response_model=InterviewStartResponse, summary="Upload resume and start interview")
@@ -52,40 +809,49 @@ async def start_interview(
 ):
     try:
         session_id = str(uuid.uuid4())
-        print(f"Starting new interview session: {session_id} for domain: {domain}")
+        bind_session(session_id)
+        logger.info("Starting new interview session.", extra={"domain": domain})
 
-        file_content = await resume.read()
+        with STAGE_SECONDS.time(stage="upload_read"):
+            file_content = await resume.read()
+        PAYLOAD_BYTES.observe(len(file_content), kind="resume_upload")
         if not file_content:
             raise HTTPException(status_code=400, detail="Uploaded resume file is empty.")
 
-        parsed_resume_info = await parse_resume(file_content, resume.filename, groq_service)
+        parsed_resume_info = await parse_uploaded_resume(file_content, resume.filename)
         resume_info_model = ResumeInfo(**parsed_resume_info)
-        print(f"Resume parsed successfully for session {session_id}: {resume_info_model.name}, Skills: {resume_info_model.skills[:5]}")
+        logger.info("Resume parsed.", extra={"skills": len(resume_info_model.skills), "projects": len(resume_info_model.projects)})
 
         candidate_name = resume_info_model.name if resume_info_model.name and resume_info_model.name.strip() else "Candidate"
-        first_question_text = f"Hello {candidate_name}, thank you for joining. To start, could you please tell me a bit about yourself and walk me through your resume?"
-        
+        greeting_prefix = f"Hello {candidate_name},"
+        first_question_text = f"{greeting_prefix} {GREETING_SUFFIX}"
+
         question_id = str(uuid.uuid4())
         # The type for the first question is 'generic_intro'
         first_question = Question(id=question_id, text=first_question_text, type="generic_intro")
-        print(f"First question set for session {session_id}: {first_question.text}")
 
-        question_audio_base64 = await groq_service.text_to_speech(first_question_text)
-        print(f"Audio generated for first question for session {session_id}.")
+        # Synthesis runs in the background; the client streams it from the audio URL.
+        question_audio_url = start_question_audio(session_id, question_id, [greeting_prefix, GREETING_SUFFIX])
 
-        interview_sessions[session_id] = {
-            "resume_info": resume_info_model,
-            "domain": domain,
-            "current_question": first_question, # Store the Question model
+        session = {
             "session_id": session_id,
-            # "interview_stage" can be inferred from questions_asked_history length if needed
+            "resume_info": resume_info_model.dict(),
+            # Built once per session and reused by every prompt of the interview.
+            "resume_summary": build_resume_summary(
+                resume_info_model.dict(), domain, token_budget=settings.RESUME_SUMMARY_TOKEN_BUDGET
+            ),
+            "domain": domain,
+            "current_question": first_question.dict(),
+            "questions_asked": [{"id": question_id, "text": first_question_text, "type": first_question.type}],
+            "answers": [],
+            "running_evaluation": new_running_evaluation(),
         }
-        questions_asked_history[session_id] = [{"id": question_id, "text": first_question_text, "type": first_question.type}]
-        answers_history[session_id] = []
+        await session_store.create(session_id, session)
+        schedule_speculative_question(session, session["questions_asked"])
 
-        return JSONResponse(content={
+        return json_response({
             "question": first_question.dict(),
-            "audio_base64": question_audio_base64,
+            "audio_url": question_audio_url,
             "resume_info": resume_info_model.dict(),
             "session_id": session_id
         })
@@ -95,139 +861,126 @@ async def start_interview(
     except ConnectionError as e:
         raise HTTPException(status_code=503, detail=f"Service Unavailable: Problem communicating with external AI service. {str(e)}")
     except Exception as e:
-        print(f"Error in /start-interview: {e}", exc_info=True)
+        logger.exception("Error in /start-interview.")
         raise HTTPException(status_code=500, detail=f"Internal server error while starting interview: {str(e)}")
 
 
+@app.post("/bulk-parse-resumes", summary="Parse many resumes and stream the results as NDJSON")
+async def bulk_parse_resumes(
+    resumes: List[UploadFile] = File(None, description="Resume files (PDF or DOCX)."),
+    archive: Optional[UploadFile] = File(None, description="A ZIP archive of PDF/DOCX resumes."),
+    concurrency: int = Form(None, description="Maximum number of resumes parsed at once.")
+):
+    """
+    Pre-screening intake: parses and LLM-extracts many resumes without starting interviews
+    (no session, no greeting audio). Results are streamed as NDJSON, one line per file in
+    completion order, followed by a summary line with throughput.
+    """
+    files = []
+    skipped = []
+    upload_bytes = 0
+
+    async def read_upload(upload: UploadFile) -> bytes:
+        # Reads at most the remaining upload budget, so an oversized upload is never loaded whole.
+        nonlocal upload_bytes
+        content = await upload.read(settings.BULK_MAX_UPLOAD_BYTES - upload_bytes + 1)
+        upload_bytes += len(content)
+        if upload_bytes > settings.BULK_MAX_UPLOAD_BYTES:
+            raise HTTPException(status_code=413, detail=f"Uploads exceed {settings.BULK_MAX_UPLOAD_BYTES} bytes per request.")
+        return content
+
+    for upload in resumes or []:
+        files.append((upload.filename, await read_upload(upload)))
+    if archive is not None:
+        try:
+            archive_files, skipped = extract_resumes_from_zip(
+                await read_upload(archive), max_files=settings.BULK_MAX_FILES, max_file_bytes=settings.RESUME_MAX_BYTES,
+                max_total_bytes=settings.BULK_MAX_EXTRACTED_BYTES
+            )
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=f"Bad Request: {str(e)}")
+        files.extend(archive_files)
+    if not files and not skipped:
+        raise HTTPException(status_code=400, detail="No resumes provided. Upload 'resumes' files or a ZIP 'archive'.")
+    if len(files) > settings.BULK_MAX_FILES:
+        raise HTTPException(status_code=400, detail=f"Too many resumes ({len(files)}); the limit is {settings.BULK_MAX_FILES} per request.")
+
+    concurrency = max(1, min(concurrency or settings.BULK_PARSE_CONCURRENCY, settings.BULK_PARSE_MAX_CONCURRENCY))
+    logger.info("Bulk parsing resumes.", extra={"files": len(files), "concurrency": concurrency})
+    return StreamingResponse(
+        stream_bulk_parse(files, parse_uploaded_resume, concurrency, skipped=skipped),
+        media_type="application/x-ndjson"
+    )
+
+
 @app.post("/submit-answer", response_model=SubmitAnswerResponse, summary="Submit candidate's answer and get next question/evaluation")
 async def submit_answer(
     session_id: str = Form(..., description="The unique ID of the current interview session."),
     question_id: str = Form(..., description="The ID of the question to which this answer corresponds."),
     is_timeout: bool = Form(..., description="True if the answer was due to a timeout (no speech detected or time ran out)."),
     force_end: bool = Form(False, description="True if the user explicitly ended the interview."),
-    audio_file: Optional[UploadFile] = File(None, description="The candidate's audio recording of the answer (WebM format).")
+    audio_file: Optional[UploadFile] = File(None, description="The candidate's audio recording of the answer (WebM format)."),
+    segment_count: int = Form(0, description="Number of answer segments uploaded to /answer-audio/segment; audio_file is then the tail."),
     # Removed resume_info and domain from Form, will get from session
 ):
     """
-    Receives candidate's answer (audio), transcribes it, evaluates it, 
-    and then determines the next action: either generate the next question 
+    Receives candidate's answer (audio), transcribes it, evaluates it,
+    and then determines the next action: either generate the next question
     or provide the final interview evaluation.
     """
+    bind_session(session_id)
+    turn_started_at = time.perf_counter()
+    TURNS_IN_FLIGHT.inc()
     try:
-        if session_id not in interview_sessions:
-            raise HTTPException(status_code=404, detail=f"Interview session {session_id} not found.")
+        session, question_text, question_type = await load_answered_question(session_id, question_id)
 
-        session_data = interview_sessions[session_id]
-        resume_info_model: ResumeInfo = session_data["resume_info"]
-        domain_str: str = session_data["domain"]
-
-        question_text = None
-        question_type = "unknown" # Default type
-        for q_entry in questions_asked_history.get(session_id, []):
-            if q_entry["id"] == question_id:
-                question_text = q_entry["text"]
-                question_type = q_entry.get("type", "unknown") # Get type from history
-                break
-        if not question_text:
-            raise HTTPException(status_code=404, detail=f"Question with ID {question_id} not found in session history for session {session_id}.")
-
-        print(f"Received answer for session {session_id}, question ID {question_id} (type: {question_type}). Timeout: {is_timeout}, Force End: {force_end}")
-
-        answer_transcript = "No answer provided (timeout)."
-        if audio_file and audio_file.file:
-            audio_content = await audio_file.read()
-            if audio_content:
-                answer_transcript = await groq_service.speech_to_text(audio_content)
-                print(f"Transcribed answer for session {session_id}: '{answer_transcript}'")
-            else:
-                print(f"Warning: audio_file was provided but its content was empty for session {session_id}.")
-        
-        evaluation_result = await groq_service.evaluate_answer(
-            question=question_text,
-            answer_transcript=answer_transcript,
-            resume_info=resume_info_model.dict(),
-            domain=domain_str
-        )
-        print(f"Answer evaluation for session {session_id}: Feedback: {evaluation_result['feedback'][:50]}..., Score: {evaluation_result['score']}")
+        logger.info("Received answer.", extra={"question_id": question_id, "question_type": question_type, "is_timeout": is_timeout, "force_end": force_end})
 
-        answers_history[session_id].append({
-            "question_id": question_id,
-            "question_text": question_text,
-            "question_type": question_type, # Store question type
-            "answer_transcript": answer_transcript,
-            "feedback": evaluation_result["feedback"],
-            "score": evaluation_result["score"],
-            "is_timeout": is_timeout
-        })
-        print(f"Session {session_id} current answers history length: {len(answers_history[session_id])}")
+        with STAGE_SECONDS.time(stage="upload_read"):
+            audio_content = await audio_file.read() if audio_file and audio_file.file else None
+        answer_transcript = await transcribe_answer(session_id, audio_content, question_id, segment_count)
+        record_answer = make_answer_recorder(session_id, question_id, question_text, question_type, answer_transcript, is_timeout)
 
-        current_answered_questions_count = len(answers_history[session_id])
-        MAX_QUESTIONS_PER_INTERVIEW = 5 # This includes the initial "Tell me about yourself"
+        evaluation_coro = timed_stage("evaluation", evaluate_answer(session, question_text, answer_transcript, question_type))
 
-        if not force_end and current_answered_questions_count < MAX_QUESTIONS_PER_INTERVIEW:
+        if has_next_question(session, force_end):
             next_action = "next_question"
-            print(f"Generating next question for session {session_id}. Question count: {current_answered_questions_count + 1}")
-
-            # Determine question type tag based on number of previous questions
-            num_prev_q = len(questions_asked_history.get(session_id, []))
-            next_question_type_tag = "technical" # Default, will be refined by groq_service
-            if num_prev_q == 1: next_question_type_tag = "resume_deep_dive"
-            elif num_prev_q == 2:
-                is_hr_domain = domain_str.lower() in ["hr", "human resources", "recruitment", "managerial", "non-technical"]
-                next_question_type_tag = "hr_behavioral_foundational" if is_hr_domain else "technical_foundational"
-            elif num_prev_q == 3:
-                is_hr_domain = domain_str.lower() in ["hr", "human resources", "recruitment", "managerial", "non-technical"]
-                next_question_type_tag = "hr_behavioral_deep" if is_hr_domain else "technical_problem_solving"
-            elif num_prev_q == 4:
-                is_hr_domain = domain_str.lower() in ["hr", "human resources", "recruitment", "managerial", "non-technical"]
-                next_question_type_tag = "hr_concluding" if is_hr_domain else "technical_advanced"
-            else: # Fallback for more questions
-                is_hr_domain = domain_str.lower() in ["hr", "human resources", "recruitment", "managerial", "non-technical"]
-                next_question_type_tag = "hr_advanced_situational" if is_hr_domain else "technical_system_design"
-
-
-            next_question_text = await groq_service.generate_question(
-                resume_info=resume_info_model.dict(),
-                domain=domain_str,
-                previous_questions=questions_asked_history[session_id] # Pass full history
-            )
-            next_question_id = str(uuid.uuid4())
-            next_question = Question(id=next_question_id, text=next_question_text, type=next_question_type_tag)
-            print(f"Next question (type: {next_question.type}) generated for session {session_id}: {next_question.text[:70]}...")
+            logger.debug("Generating next question.", extra={"question_count": len(session["answers"]) + 2})
 
-            next_question_audio_base64 = await groq_service.text_to_speech(next_question_text)
-            print(f"Audio generated for next question for session {session_id}.")
+            if settings.PIPELINE_SUBMIT_ANSWER:
+                # Evaluation and next question generation + TTS run concurrently.
+                evaluation_result, next_question, next_question_audio_url = await evaluate_and_prepare_next(
+                    evaluation_coro, session, record_answer
+                )
+            else:
+                evaluation_result = await evaluation_coro
+                await record_answer(evaluation_result)
+                next_question, next_question_audio_url = await prepare_next_question(session)
 
-            interview_sessions[session_id]["current_question"] = next_question
-            questions_asked_history[session_id].append({"id": next_question_id, "text": next_question_text, "type": next_question.type})
+            await deliver_next_question(session, next_question)
 
-            return JSONResponse(content={
+            turn_latency = time.perf_counter() - turn_started_at
+            logger.info("Turn processed.", extra={"latency_s": round(turn_latency, 3),
+                                                 "mode": "pipelined" if settings.PIPELINE_SUBMIT_ANSWER else "sequential"})
+
+            return json_response({
                 "transcript": answer_transcript,
                 "feedback": evaluation_result["feedback"],
                 "next_action": next_action,
                 "question": next_question.dict(),
-                "audio_base64": next_question_audio_base64,
+                "audio_url": next_question_audio_url,
                 "message": "Answer processed. Here's your next question."
             })
         else:
-            next_action = "end_interview"
-            print(f"Interview completed for session {session_id}. Generating overall evaluation.")
+            evaluation_result = await evaluation_coro
+            answers, running_evaluation = await record_answer(evaluation_result)
 
-            overall_evaluation_data = await groq_service.get_overall_evaluation(
-                interview_history=answers_history[session_id], # Pass full answer history
-                resume_info=resume_info_model.dict(),
-                domain=domain_str
-            )
-            overall_evaluation_model = OverallEvaluation(**overall_evaluation_data)
-            print(f"Overall evaluation generated for session {session_id}.")
+            next_action = "end_interview"
+            logger.info("Interview completed. Generating overall evaluation.")
 
-            # Clean up session data
-            if session_id in interview_sessions: del interview_sessions[session_id]
-            if session_id in questions_asked_history: del questions_asked_history[session_id]
-            if session_id in answers_history: del answers_history[session_id]
-            print(f"Session {session_id} data cleaned up.")
+            overall_evaluation_model = await finish_interview(session, answers, running_evaluation)
 
-            return JSONResponse(content={
+            return json_response({
                 "transcript": answer_transcript,
                 "feedback": evaluation_result["feedback"],
                 "next_action": next_action,
@@ -237,19 +990,96 @@ async def submit_answer(
 
     except HTTPException as e:
         # Log FastAPI's HTTPExceptions before re-raising
-        print(f"HTTPException in /submit-answer for session {session_id}: {e.status_code} - {e.detail}")
+        logger.warning("HTTPException in /submit-answer.", extra={"status": e.status_code, "detail": e.detail})
         raise e
+    except MissingAnswerSegmentsError as e:
+        # Nothing was recorded; the client uploads the listed segments again and resubmits
+        raise HTTPException(status_code=409, detail=str(e), headers={"X-Missing-Segments": ",".join(map(str, e.missing))})
+    except SessionNotFoundError:
+        # The session expired or was ended by a concurrent request while this turn was processed
+        logger.warning("Session disappeared during /submit-answer.")
+        raise HTTPException(status_code=404, detail=f"Interview session {session_id} not found.")
     except ConnectionError as e:
         # Log connection errors specifically
-        print(f"ConnectionError in /submit-answer for session {session_id}: {str(e)}")
+        logger.error("ConnectionError in /submit-answer: %s", e)
         raise HTTPException(status_code=503, detail=f"Service Unavailable: Problem communicating with external AI service. {str(e)}")
     except json.JSONDecodeError as e:
         # Handle cases where resume_info might be malformed if it were still passed
-        print(f"JSONDecodeError in /submit-answer for session {session_id}: {str(e)}")
+        logger.error("JSONDecodeError in /submit-answer: %s", e)
         raise HTTPException(status_code=400, detail=f"Invalid JSON data provided: {str(e)}")
     except Exception as e:
-        print(f"Unexpected error in /submit-answer for session {session_id}: {e}", exc_info=True)
+        logger.exception("Unexpected error in /submit-answer.")
         raise HTTPException(status_code=500, detail=f"Internal server error during answer submission: {str(e)}")
+    finally:
+        TURNS_IN_FLIGHT.dec()
+
+
+@app.post("/submit-answer/stream", summary="Submit an answer and stream transcript, feedback and next question as server-sent events")
+async def submit_answer_stream(
+    session_id: str = Form(..., description="The unique ID of the current interview session."),
+    question_id: str = Form(..., description="The ID of the question to which this answer corresponds."),
+    is_timeout: bool = Form(..., description="True if the answer was due to a timeout (no speech detected or time ran out)."),
+    force_end: bool = Form(False, description="True if the user explicitly ended the interview."),
+    audio_file: Optional[UploadFile] = File(None, description="The candidate's audio recording of the answer (WebM format)."),
+    segment_count: int = Form(0, description="Number of answer segments uploaded to /answer-audio/segment; audio_file is then the tail.")
+):
+    """
+    Streaming variant of /submit-answer (text/event-stream). Events, in order:
+    - `transcript`: {"transcript"} as soon as STT finishes
+    - `feedback`: {"delta"} pieces of the feedback text while it is generated
+    - `score`: {"feedback", "score"} once the evaluation is complete (the answer is now recorded)
+    - `question`: {"next_action": "next_question", "question", "audio_url"}, or
+      `overall_evaluation`: {"next_action": "end_interview", "overall_evaluation"}
+    - `error`: {"status_code", "detail"} if the turn fails after the stream started; status 409 with
+      "missing_segments" if answer segments never arrived (upload them again and resubmit)
+    With PIPELINE_SUBMIT_ANSWER, the next question is generated concurrently with the evaluation.
+    """
+    bind_session(session_id)
+    session, question_text, question_type = await load_answered_question(session_id, question_id)
+    logger.info("Received streamed answer.", extra={"question_id": question_id, "question_type": question_type, "is_timeout": is_timeout, "force_end": force_end})
+    with STAGE_SECONDS.time(stage="upload_read"):
+        audio_content = await audio_file.read() if audio_file and audio_file.file else None
+
+    async def sse_events():
+        events = answer_turn_events(session, question_id, question_text, question_type, audio_content,
+                                    is_timeout, force_end, segment_count, channel="/submit-answer/stream")
+        try:
+            async for event, data in events:
+                yield format_sse(event, data)
+        finally:
+            await events.aclose()
+
+    return StreamingResponse(sse_events(), media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+
+@app.post("/answer-audio/segment", summary="Upload a segment of the answer audio while the candidate is still speaking")
+async def upload_answer_segment(
+    session_id: str = Form(..., description="The unique ID of the current interview session."),
+    question_id: str = Form(..., description="The ID of the question being answered."),
+    index: int = Form(..., description="Segment number, starting at 0."),
+    audio_file: UploadFile = File(..., description="A complete, independently decodable audio file (WebM) for this segment.")
+):
+    """
+    Receives one segment of an answer that is still being recorded and starts transcribing it in the
+    background. The answer is then submitted to /submit-answer (or /submit-answer/stream) with
+    segment_count set and only the audio recorded after the last segment as audio_file. With the Redis
+    session store, the segments and the submit may be handled by different workers.
+    """
+    bind_session(session_id)
+    await load_answered_question(session_id, question_id)
+    audio_content = await audio_file.read()
+    if not audio_content:
+        raise HTTPException(status_code=400, detail="Uploaded answer segment is empty.")
+    if len(audio_content) > settings.ANSWER_SEGMENT_MAX_BYTES:
+        raise HTTPException(status_code=413, detail=f"Answer segment exceeds {settings.ANSWER_SEGMENT_MAX_BYTES} bytes.")
+    try:
+        answer_segments.add(session_id, question_id, index, lambda: transcribe_segment(audio_content))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Bad Request: {str(e)}")
+    PAYLOAD_BYTES.observe(len(audio_content), kind="answer_segment")
+    logger.debug("Answer segment received.", extra={"question_id": question_id, "index": index, "bytes": len(audio_content)})
+    return {"session_id": session_id, "question_id": question_id, "index": index}
 
 
 @app.post("/get-next-question", response_model=GetQuestionResponse, summary="Explicitly request the next question")
@@ -262,93 +1092,51 @@ async def get_next_question_endpoint(request: GetNextQuestionRequest):
     It now fetches session-specific data (resume, domain) from the server.
     """
     session_id = request.session_id
+    bind_session(session_id)
 
     try:
-        if session_id not in interview_sessions:
+        session = await session_store.get(session_id)
+        if session is None:
             raise HTTPException(status_code=404, detail=f"Interview session {session_id} not found.")
 
-        session_data = interview_sessions[session_id]
-        resume_info_model: ResumeInfo = session_data["resume_info"]
-        domain_str: str = session_data["domain"]
-        
-        # Ensure answers_history and questions_asked_history are initialized for the session
-        # This might be redundant if start_interview always initializes them, but good for safety
-        if session_id not in answers_history:
-            answers_history[session_id] = []
-        if session_id not in questions_asked_history:
+        if not session["questions_asked"]:
             # This state should ideally not happen if start_interview was called
             # but if it does, we might not have a first question.
             # For now, we'll rely on start_interview to set up the initial question.
              raise HTTPException(status_code=500, detail=f"Session {session_id} has no question history. Start interview first.")
 
 
-        current_answered_questions_count = len(answers_history.get(session_id, []))
-        MAX_QUESTIONS_PER_INTERVIEW = 5
+        current_answered_questions_count = len(session["answers"])
 
         if current_answered_questions_count < MAX_QUESTIONS_PER_INTERVIEW:
-            print(f"Explicitly generating next question for session {session_id}. Answered: {current_answered_questions_count}")
-
-            # Determine question type tag based on number of previous questions
-            num_prev_q = len(questions_asked_history.get(session_id, []))
-            next_question_type_tag = "technical" # Default
-            if num_prev_q == 1: next_question_type_tag = "resume_deep_dive"
-            elif num_prev_q == 2:
-                is_hr_domain = domain_str.lower() in ["hr", "human resources", "recruitment", "managerial", "non-technical"]
-                next_question_type_tag = "hr_behavioral_foundational" if is_hr_domain else "technical_foundational"
-            elif num_prev_q == 3:
-                is_hr_domain = domain_str.lower() in ["hr", "human resources", "recruitment", "managerial", "non-technical"]
-                next_question_type_tag = "hr_behavioral_deep" if is_hr_domain else "technical_problem_solving"
-            elif num_prev_q == 4:
-                is_hr_domain = domain_str.lower() in ["hr", "human resources", "recruitment", "managerial", "non-technical"]
-                next_question_type_tag = "hr_concluding" if is_hr_domain else "technical_advanced"
-            else: # Fallback for more questions
-                is_hr_domain = domain_str.lower() in ["hr", "human resources", "recruitment", "managerial", "non-technical"]
-                next_question_type_tag = "hr_advanced_situational" if is_hr_domain else "technical_system_design"
-
-            next_question_text = await groq_service.generate_question(
-                resume_info=resume_info_model.dict(),
-                domain=domain_str,
-                previous_questions=questions_asked_history.get(session_id, [])
-            )
-            next_question_id = str(uuid.uuid4())
-            next_question = Question(id=next_question_id, text=next_question_text, type=next_question_type_tag)
-            print(f"Next question (type: {next_question.type}) explicitly generated for session {session_id}: {next_question.text[:70]}...")
-
+            logger.info("Explicitly generating next question.", extra={"answered": current_answered_questions_count})
 
-            next_question_audio_base64 = await groq_service.text_to_speech(next_question_text)
+            next_question, next_question_audio_url = await prepare_next_question(session)
 
-            interview_sessions[session_id]["current_question"] = next_question
-            questions_asked_history[session_id].append({"id": next_question_id, "text": next_question_text, "type": next_question.type})
+            questions_asked = await session_store.update(session_id, lambda s: add_question_to_session(s, next_question))
+            schedule_speculative_question(session, questions_asked)
 
-            return JSONResponse(content={
+            return json_response({
                 "status": "success",
                 "question": next_question.dict(),
-                "audio_base64": next_question_audio_base64,
+                "audio_url": next_question_audio_url,
                 "session_id": session_id
             })
         else:
             # This case means the interview should have ended.
             # We should generate the overall evaluation if it hasn't been done.
-            print(f"Interview for session {session_id} already completed or at max questions. Answered: {current_answered_questions_count}. Returning evaluation.")
-            
+            logger.info("Interview already completed or at max questions. Returning evaluation.", extra={"answered": current_answered_questions_count})
+
             # Check if evaluation already exists or needs to be generated
             # This part might need more robust state management if overall_evaluation can be generated multiple times
             # For now, assume we generate it if not already clearly "ended"
-            
-            overall_evaluation_data = await groq_service.get_overall_evaluation(
-                interview_history=answers_history.get(session_id, []), # Use potentially empty list if no answers
-                resume_info=resume_info_model.dict(),
-                domain=domain_str
-            )
-            overall_evaluation_model = OverallEvaluation(**overall_evaluation_data)
+
+            overall_evaluation_model = await generate_overall_evaluation(session, session["answers"]) # Use potentially empty list if no answers
 
             # Clean up session data as the interview is now considered complete
-            if session_id in interview_sessions: del interview_sessions[session_id]
-            if session_id in questions_asked_history: del questions_asked_history[session_id]
-            if session_id in answers_history: del answers_history[session_id]
-            print(f"Session {session_id} data cleaned up after explicit next question request at interview end.")
+            await end_session(session_id)
 
-            return JSONResponse(content={
+            return json_response({
                 "status": "completed",
                 "overall_evaluation": overall_evaluation_model.dict(),
                 "session_id": session_id,
@@ -356,24 +1144,272 @@ async def get_next_question_endpoint(request: GetNextQuestionRequest):
             })
 
     except HTTPException as e:
-        print(f"HTTPException in /get-next-question for session {session_id}: {e.status_code} - {e.detail}")
+        logger.warning("HTTPException in /get-next-question.", extra={"status": e.status_code, "detail": e.detail})
         raise e
+    except SessionNotFoundError:
+        logger.warning("Session disappeared during /get-next-question.")
+        raise HTTPException(status_code=404, detail=f"Interview session {session_id} not found.")
     except ConnectionError as e:
-        print(f"ConnectionError in /get-next-question for session {session_id}: {str(e)}")
+        logger.error("ConnectionError in /get-next-question: %s", e)
         raise HTTPException(status_code=503, detail=f"Service Unavailable: Problem communicating with external AI service. {str(e)}")
     except Exception as e:
-        print(f"Error in /get-next-question for session {session_id}: {e}", exc_info=True)
+        logger.exception("Error in /get-next-question.")
         raise HTTPException(status_code=500, detail=f"Internal server error while fetching next question: {str(e)}")
 
 
+@app.get("/audio/{session_id}/{question_id}", summary="Stream the TTS audio of a question")
+async def get_question_audio(session_id: str, question_id: str, request: Request,
+                             requested_format: Optional[str] = Query(None, alias="format", description="mp3, mp3-low or opus")):
+    """
+    Serves a question's audio, as the TTS MP3 (audio/mpeg) by default. `format` selects a smaller
+    encoding for slow links: "mp3-low" (16 kHz mono MP3) or "opus" (audio/webm); without it, clients
+    sending "Save-Data: on" get AUDIO_SAVE_DATA_FORMAT.
+    While synthesis (or transcoding) is still running the audio is streamed with chunked transfer,
+    so playback can start before it finishes. Single byte ranges are supported
+    for seeking/replay once the clip is complete.
+    """
+    try:
+        audio_format = negotiate_audio_format(requested_format, request.headers.get("save-data", "").lower() == "on",
+                                              audio_transcoder.available_formats(), settings.AUDIO_SAVE_DATA_FORMAT)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Bad Request: {str(e)}")
+    clip = await question_audio_variant(session_id, question_id, audio_format)
+    if clip is None:
+        raise HTTPException(status_code=404, detail=f"No audio for question {question_id} in session {session_id}.")
+
+    headers = {"Accept-Ranges": "bytes", "Cache-Control": "private, max-age=3600", "Vary": "Save-Data"}
+    range_header = request.headers.get("range")
+    # Browsers open media with "bytes=0-"; answer that with a full streamed body
+    # instead of waiting for synthesis to finish.
+    if range_header and (clip.done or range_header.replace(" ", "") != "bytes=0-"):
+        audio_bytes = await clip.read_all()
+        try:
+            byte_range = parse_range_header(range_header, len(audio_bytes))
+        except ValueError:
+            return Response(status_code=416, headers={"Content-Range": f"bytes */{len(audio_bytes)}"})
+        if byte_range is not None:
+            start, end = byte_range
+            headers["Content-Range"] = f"bytes {start}-{end}/{len(audio_bytes)}"
+            return Response(content=audio_bytes[start:end + 1], status_code=206, media_type=clip.media_type, headers=headers)
+        return Response(content=audio_bytes, media_type=clip.media_type, headers=headers)
+
+    if clip.done:
+        return Response(content=b"".join(clip.chunks), media_type=clip.media_type, headers=headers)
+    return StreamingResponse(clip.iter_chunks(), media_type=clip.media_type, headers=headers)
+
+
+@app.websocket("/ws/interview/{session_id}")
+async def interview_websocket(websocket: WebSocket, session_id: str, audio_format: Optional[str] = None):
+    """
+    Full-duplex interview channel, alongside the REST endpoints: one connection per interview
+    (after /start-interview) instead of a multipart POST and an audio GET per turn.
+    The audio_format query parameter selects the question audio format, as `format` on /audio.
+
+    Client -> server:
+    - binary frames: answer audio (WebM), appended to the answer being recorded
+    - {"type": "segment"}: the audio received since the previous segment is a complete file;
+      it is transcribed in the background (as with /answer-audio/segment)
+    - {"type": "answer", "is_timeout", "force_end"}: the answer is complete; the rest of the audio is its tail
+    Server -> client (JSON text frames, plus binary audio frames):
+    - {"type": "question", "question", "audio_url"} on connect and for each next question, followed by
+      {"type": "audio_start", "question_id", "media_type"}, binary audio frames and {"type": "audio_end", "question_id"}
+    - the turn events of /submit-answer/stream as {"type": event, ...data}: transcript, feedback, score,
+      question or overall_evaluation (after which the server closes the connection), error
+
+    Backpressure: outbound messages go through a bounded queue (WS_SEND_QUEUE_SIZE), so question audio
+    and events are produced no faster than the client reads them; while a turn is processed, the
+    server does not read further frames, so a client sending ahead is held back by TCP flow control.
+    """
+    bind_session(session_id)
+    await websocket.accept()
+    sender = WebSocketSender(websocket, max_queued=settings.WS_SEND_QUEUE_SIZE)
+    send_task = sender.start()
+    receive_task = asyncio.create_task(serve_interview_websocket(websocket, sender, session_id, audio_format))
+    WEBSOCKETS_ACTIVE.inc()
+    try:
+        await asyncio.wait({send_task, receive_task}, return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        WEBSOCKETS_ACTIVE.dec()
+        if not receive_task.done():
+            # The client went away (the sender failed); stop the turn in progress.
+            receive_task.cancel()
+        await asyncio.gather(receive_task, return_exceptions=True)
+        await sender.close()
+        await asyncio.gather(send_task, return_exceptions=True)
+    close_code = None
+    if not receive_task.cancelled():
+        if receive_task.exception() is not None:
+            logger.error("Unexpected error in /ws/interview.", exc_info=receive_task.exception())
+            close_code = 1011
+        else:
+            close_code = receive_task.result()
+    if close_code is not None:
+        try:
+            await websocket.close(code=close_code)
+        except (RuntimeError, WebSocketDisconnect):
+            pass # Already closed by the client
+    logger.info("Interview WebSocket closed.", extra={"messages_sent": sender.messages_sent, "bytes_sent": sender.bytes_sent})
+
+
+async def send_question_audio(sender: WebSocketSender, session_id: str, question_id: str, audio_format: str):
+    """Pushes a question's audio over the WebSocket as it is synthesized."""
+    clip = await question_audio_variant(session_id, question_id, audio_format)
+    if clip is None:
+        return
+    await sender.send_json({"type": "audio_start", "question_id": question_id, "media_type": clip.media_type})
+    async for chunk in clip.iter_chunks():
+        await sender.send_bytes(chunk)
+    await sender.send_json({"type": "audio_end", "question_id": question_id})
+
+
+async def serve_interview_websocket(websocket: WebSocket, sender: WebSocketSender, session_id: str,
+                                    requested_audio_format: Optional[str] = None) -> Optional[int]:
+    """
+    Receive loop of the interview WebSocket. Returns the close code, or None if the client disconnected.
+    """
+    try:
+        audio_format = negotiate_audio_format(requested_audio_format, websocket.headers.get("save-data", "").lower() == "on",
+                                              audio_transcoder.available_formats(), settings.AUDIO_SAVE_DATA_FORMAT)
+    except ValueError as e:
+        await sender.send_json({"type": "error", "status_code": 400, "detail": f"Bad Request: {str(e)}"})
+        return 1008
+    session = await session_store.get(session_id)
+    if session is None:
+        await sender.send_json({"type": "error", "status_code": 404, "detail": f"Interview session {session_id} not found."})
+        return 4404
+    question = session["current_question"]
+    logger.info("Interview WebSocket connected.", extra={"question_id": question["id"]})
+
+    audio = bytearray()
+    segment_count = 0
+    audio_task = None
+
+    async def push_question(question_data: Dict[str, Any], message: Dict[str, Any]):
+        nonlocal audio_task
+        if audio_task is not None:
+            audio_task.cancel()
+        await sender.send_json(message)
+        audio_task = asyncio.create_task(send_question_audio(sender, session_id, question_data["id"], audio_format))
+
+    try:
+        await push_question(question, {"type": "question", "question": question,
+                                        "audio_url": question_audio_url(session_id, question["id"])})
+        while True:
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                return None
+            if message.get("bytes") is not None:
+                audio += message["bytes"]
+                if len(audio) > settings.WS_MAX_ANSWER_BYTES:
+                    await sender.send_json({"type": "error", "status_code": 413,
+                                            "detail": f"Answer audio exceeds {settings.WS_MAX_ANSWER_BYTES} bytes."})
+                    return 1009
+                continue
+
+            try:
+                request = json.loads(message.get("text") or "")
+                request_type = request["type"]
+            except (ValueError, TypeError, KeyError):
+                await sender.send_json({"type": "error", "status_code": 400, "detail": "Messages must be JSON objects with a 'type'."})
+                continue
+
+            if request_type == "segment":
+                if not audio:
+                    await sender.send_json({"type": "error", "status_code": 400, "detail": "Answer segment is empty."})
+                    continue
+                segment_audio = bytes(audio)
+                audio.clear()
+                try:
+                    answer_segments.add(session_id, question["id"], segment_count, lambda: transcribe_segment(segment_audio))
+                except ValueError as e:
+                    await sender.send_json({"type": "error", "status_code": 400, "detail": f"Bad Request: {str(e)}"})
+                    continue
+                PAYLOAD_BYTES.observe(len(segment_audio), kind="answer_segment")
+                segment_count += 1
+            elif request_type == "answer":
+                is_timeout = bool(request.get("is_timeout", False))
+                force_end = bool(request.get("force_end", False))
+                try:
+                    session, question_text, question_type = await load_answered_question(session_id, question["id"])
+                except HTTPException as e:
+                    await sender.send_json({"type": "error", "status_code": e.status_code, "detail": e.detail})
+                    return 4404
+                logger.info("Received WebSocket answer.", extra={"question_id": question["id"], "question_type": question_type,
+                                                                  "is_timeout": is_timeout, "force_end": force_end})
+                events = answer_turn_events(session, question["id"], question_text, question_type, bytes(audio) or None,
+                                            is_timeout, force_end, segment_count, channel="/ws/interview")
+                audio.clear()
+                segment_count = 0
+                try:
+                    async for event, data in events:
+                        if event == "question":
+                            question = data["question"]
+                            await push_question(question, {"type": event, **data})
+                        else:
+                            await sender.send_json({"type": event, **data})
+                        if event == "overall_evaluation":
+                            return 1000
+                        if event == "error" and data["status_code"] == 404:
+                            return 4404
+                finally:
+                    await events.aclose()
+            else:
+                await sender.send_json({"type": "error", "status_code": 400, "detail": f"Unknown message type '{request_type}'."})
+    finally:
+        if audio_task is not None:
+            audio_task.cancel()
+            await asyncio.gather(audio_task, return_exceptions=True)
+
+
+@app.get("/stats", summary="Runtime statistics")
+async def get_stats():
+    """Returns runtime statistics of this worker (e.g. blocking pool queue depth)."""
+    return {
+        "active_sessions": await session_store.count(),
+        "session_store": session_store.stats(),
+        "groq_http": groq_http.stats(),
+        "prompt_budget": groq_service.prompt_budget_stats(),
+        "model_router": model_router.stats(),
+        "blocking_pool": groq_service.blocking_pool.stats(),
+        "tts_cache": groq_service.tts_cache.stats(),
+        "audio_store": audio_store.stats(),
+        "audio_transcoder": audio_transcoder.stats(),
+        "answer_segments": answer_segments.stats(),
+        "voice_activity": voice_activity.stats() if voice_activity else None,
+        "speculation": speculation.stats(),
+        "resume_cache": resume_cache.stats(),
+        "extraction_pool": extraction_pool.stats(),
+        "question_bank": question_bank.stats() if question_bank else None,
+        "logging": logging_stats(),
+        "process_cpu_seconds": round(time.process_time(), 3),
+    }
+
+
+@app.get("/metrics", summary="Prometheus metrics")
+async def get_metrics():
+    """Prometheus text-format metrics: stage latencies, token usage, errors, gauges and payload sizes."""
+    SESSIONS_ACTIVE.set(await session_store.count())
+    AUDIO_CLIPS_IN_PROGRESS.set(audio_store.stats()["in_progress"])
+    GROQ_INFLIGHT.set(groq_http.inflight)
+    BLOCKING_POOL_QUEUED.set(groq_service.blocking_pool.stats()["queued"])
+    return Response(content=REGISTRY.render(), media_type=METRICS_CONTENT_TYPE)
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    if question_bank is not None:
+        question_bank.save_learned()
+    groq_service.blocking_pool.shutdown()
+    extraction_pool.shutdown()
+    await groq_http.aclose()
+    await session_store.close()
+
+
 @app.get("/", summary="Root endpoint")
 async def read_root():
     """Basic endpoint to check if the backend is running."""
     return {"message": "AI Interviewer Backend is running! Visit /docs for API documentation."}
 
-# Debug print statement: THIS IS WHAT WE NEED TO SEE IN THE TERMINAL
-print("\n--- Registered FastAPI Routes (from main.py) ---")
 for route in app.routes:
     if hasattr(route, 'path') and hasattr(route, 'methods'):
-        print(f"Path: {route.path}, Methods: {', '.join(route.methods) if route.methods else 'N/A'}")
-print("--------------------------------------------------\n")
+        logger.debug("Registered route.", extra={"path": route.path, "methods": ", ".join(route.methods) if route.methods else "N/A"})
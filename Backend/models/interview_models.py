@@ -11,6 +11,9 @@ class ResumeInfo(BaseModel):
     projects: List[Dict[str, str]] = []
     education: Optional[str] = None
     raw_text: str
+    # Set by local extraction: confidence per field (0.0-1.0) and the fields that were filled by the LLM.
+    field_confidence: Dict[str, float] = {}
+    llm_fields: List[str] = []
 
 # Pydantic model for an interview question
 class Question(BaseModel):
@@ -39,7 +42,7 @@ class StartInterviewRequest(BaseModel):
 # Response model for starting the interview / getting first question
 class InterviewStartResponse(BaseModel):
     question: Question
-    audio_base64: str
+    audio_url: str # Relative URL of the question audio (audio/mpeg, streamed)
     resume_info: ResumeInfo
     session_id: str
 
@@ -57,7 +60,7 @@ class SubmitAnswerResponse(BaseModel):
     next_action: str
     overall_evaluation: Optional[OverallEvaluation] = None
     question: Optional[Question] = None
-    audio_base64: Optional[str] = None
+    audio_url: Optional[str] = None
     message: Optional[str] = None
 
 # Request model for explicitly getting the next question
@@ -68,6 +71,6 @@ class GetNextQuestionRequest(BaseModel):
 class GetQuestionResponse(BaseModel):
     status: str
     question: Optional[Question] = None
-    audio_base64: Optional[str] = None
+    audio_url: Optional[str] = None
     overall_evaluation: Optional[OverallEvaluation] = None
     session_id: Optional[str] = None
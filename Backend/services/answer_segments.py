@@ -0,0 +1,143 @@
+# answer_segments.py
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+# How often take() re-reads the shared transcripts while waiting for segments transcribed by other workers.
+SHARED_POLL_SECONDS = 0.2
+
+
+class MissingAnswerSegmentsError(Exception):
+    """Segments of a submitted answer were never received (or their transcription was lost)."""
+    def __init__(self, missing: List[int]):
+        super().__init__(f"Answer audio segments {missing} were not received. Upload them again and resubmit the answer.")
+        self.missing = missing
+
+
+class AnswerSegmentStore:
+    """
+    Background transcriptions of answer-audio segments uploaded while the candidate is still speaking.
+
+    The client restarts its recorder for every segment, so each segment is a complete audio file
+    that can be transcribed on its own as soon as it arrives; when the answer is submitted, only the
+    tail segment is left to transcribe. Transcriptions run in this worker's memory, like question audio.
+    Answers that are never submitted are evicted oldest first beyond max_answers.
+
+    With several workers, the segment uploads and the submit of one answer can reach different workers.
+    save_transcript then shares each finished transcript (in the session store) and load_transcripts
+    reads them back; take() waits up to shared_wait_seconds for segments still being transcribed
+    elsewhere. Without them (one worker, or sticky routing by session), only local segments are seen.
+    Segments that are missing anyway raise MissingAnswerSegmentsError instead of shortening the answer.
+    """
+    def __init__(self, max_answers: int = 1024, max_segments_per_answer: int = 64,
+                 save_transcript: Optional[Callable[[str, str, int, str], Awaitable[None]]] = None,
+                 load_transcripts: Optional[Callable[[str, str], Awaitable[Dict[int, str]]]] = None,
+                 shared_wait_seconds: float = 5.0):
+        self.max_answers = max_answers
+        self.max_segments_per_answer = max_segments_per_answer
+        self.save_transcript = save_transcript
+        self.load_transcripts = load_transcripts
+        self.shared_wait_seconds = shared_wait_seconds
+        self._answers: "OrderedDict[Tuple[str, str], Dict[int, asyncio.Task]]" = OrderedDict()
+        self._saves: Set[asyncio.Task] = set()
+        self.segments_received = 0
+        self.segments_shared = 0
+        self.segments_missing = 0
+        self.evictions = 0
+
+    def add(self, session_id: str, question_id: str, index: int, transcribe: Callable[[], Awaitable[str]]) -> asyncio.Task:
+        """Starts transcribing segment `index` of an answer. Raises ValueError for duplicate or excess segments."""
+        if index < 0 or index >= self.max_segments_per_answer:
+            raise ValueError(f"Segment index must be between 0 and {self.max_segments_per_answer - 1}.")
+        key = (session_id, question_id)
+        segments = self._answers.setdefault(key, {})
+        self._answers.move_to_end(key)
+        if index in segments:
+            raise ValueError(f"Segment {index} was already uploaded.")
+        task = asyncio.create_task(self._transcribe(session_id, question_id, index, transcribe))
+        segments[index] = task
+        self.segments_received += 1
+        while len(self._answers) > self.max_answers:
+            _, evicted = self._answers.popitem(last=False)
+            self._cancel(evicted)
+            self.evictions += 1
+        return task
+
+    async def _transcribe(self, session_id: str, question_id: str, index: int, transcribe: Callable[[], Awaitable[str]]) -> str:
+        transcript = await transcribe()
+        if self.save_transcript is not None:
+            # Shared in the background: a submit on this worker uses the task's result directly.
+            save = asyncio.create_task(self._save(session_id, question_id, index, transcript))
+            self._saves.add(save)
+            save.add_done_callback(self._saves.discard)
+        return transcript
+
+    async def _save(self, session_id: str, question_id: str, index: int, transcript: str):
+        try:
+            await self.save_transcript(session_id, question_id, index, transcript)
+        except Exception:
+            logger.warning("Could not share answer segment transcript.", exc_info=True,
+                           extra={"question_id": question_id, "index": index})
+
+    async def take(self, session_id: str, question_id: str, count: int) -> List[str]:
+        """
+        Removes an answer's segments and returns the transcripts of segments 0..count-1 in order,
+        waiting for transcriptions that are still running. Segments not uploaded to this worker are
+        read from the shared transcripts. Raises MissingAnswerSegmentsError if some never arrived
+        (or were evicted); the segments received so far are then kept, so the client can upload the
+        missing ones and submit again.
+        """
+        key = (session_id, question_id)
+        segments = self._answers.get(key, {})
+        transcripts: Dict[int, str] = {}
+        elsewhere = [index for index in range(count) if index not in segments]
+        if elsewhere:
+            transcripts = await self._wait_for_shared(session_id, question_id, elsewhere)
+            missing = [index for index in elsewhere if index not in transcripts]
+            if missing:
+                self.segments_missing += len(missing)
+                logger.warning("Answer audio segments missing.", extra={"missing": missing, "segments": count})
+                raise MissingAnswerSegmentsError(missing)
+            self.segments_shared += len(elsewhere)
+        self._answers.pop(key, None)
+        self._cancel({index: task for index, task in segments.items() if index >= count})
+        local = [index for index in range(count) if index in segments]
+        transcripts.update(zip(local, await asyncio.gather(*(segments[index] for index in local))))
+        return [transcripts[index] for index in range(count)]
+
+    async def _wait_for_shared(self, session_id: str, question_id: str, indexes: List[int]) -> Dict[int, str]:
+        if self.load_transcripts is None:
+            return {}
+        deadline = time.monotonic() + self.shared_wait_seconds
+        while True:
+            transcripts = await self.load_transcripts(session_id, question_id)
+            if all(index in transcripts for index in indexes) or time.monotonic() >= deadline:
+                return transcripts
+            await asyncio.sleep(SHARED_POLL_SECONDS)
+
+    def discard(self, session_id: str, question_id: str):
+        self._cancel(self._answers.pop((session_id, question_id), {}))
+
+    def drop_session(self, session_id: str):
+        for key in [key for key in self._answers if key[0] == session_id]:
+            self._cancel(self._answers.pop(key))
+
+    @staticmethod
+    def _cancel(segments: Dict[int, asyncio.Task]):
+        for task in segments.values():
+            if not task.done():
+                task.cancel()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "pending_answers": len(self._answers),
+            "pending_segments": sum(len(segments) for segments in self._answers.values()),
+            "segments_received": self.segments_received,
+            "segments_shared": self.segments_shared,
+            "segments_missing": self.segments_missing,
+            "evictions": self.evictions,
+        }
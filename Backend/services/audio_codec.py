@@ -0,0 +1,121 @@
+# audio_codec.py
+import asyncio
+import logging
+import shutil
+import time
+from typing import Any, Dict, List, Optional
+
+from services.audio_store import AudioClip
+
+logger = logging.getLogger(__name__)
+
+# The TTS output (gTTS MP3), served as is.
+SOURCE_FORMAT = "mp3"
+TRANSCODE_READ_BYTES = 16384
+
+
+class AudioFormat:
+    """A question audio output format and the ffmpeg output options producing it ({bitrate} in kbps)."""
+    def __init__(self, name: str, media_type: str, ffmpeg_args: List[str], default_bitrate_kbps: int = 0):
+        self.name = name
+        self.media_type = media_type
+        self.ffmpeg_args = ffmpeg_args
+        self.default_bitrate_kbps = default_bitrate_kbps
+
+
+AUDIO_FORMATS = {
+    "mp3": AudioFormat("mp3", "audio/mpeg", []),
+    # Reduced sample rate MP3, playable everywhere.
+    "mp3-low": AudioFormat("mp3-low", "audio/mpeg",
+                           ["-ac", "1", "-ar", "16000", "-c:a", "libmp3lame", "-b:a", "{bitrate}k",
+                            "-map_metadata", "-1", "-id3v2_version", "0", "-f", "mp3"], 16),
+    # Opus in WebM tuned for speech; the smallest, but not supported by every browser (e.g. older Safari).
+    # Encoder complexity 5 of 10 costs about half the CPU of the default at nearly the same size.
+    "opus": AudioFormat("opus", "audio/webm",
+                        ["-ac", "1", "-c:a", "libopus", "-b:a", "{bitrate}k", "-application", "voip", "-compression_level", "5",
+                         "-cluster_time_limit", "1000", "-map_metadata", "-1", "-f", "webm"], 12),
+}
+
+
+def negotiate_audio_format(requested: Optional[str], save_data: bool, available: List[str], save_data_format: str) -> str:
+    """
+    The format to serve: the requested one (raises ValueError if unknown), else save_data_format for
+    clients asking to save data ("Save-Data: on"), else the TTS MP3. Formats that cannot be produced
+    here (no ffmpeg) fall back to the TTS MP3.
+    """
+    if requested:
+        if requested not in AUDIO_FORMATS:
+            raise ValueError(f"Unknown audio format '{requested}'. Supported: {', '.join(AUDIO_FORMATS)}.")
+        audio_format = requested
+    else:
+        audio_format = save_data_format if save_data else SOURCE_FORMAT
+    return audio_format if audio_format in available else SOURCE_FORMAT
+
+
+class AudioTranscoder:
+    """
+    Transcodes question audio from the TTS MP3 to smaller formats with ffmpeg. Transcoding streams:
+    source chunks are piped into ffmpeg as they are synthesized and its output is appended to the
+    target clip as it is produced, so playback of the transcoded audio can start as early as the MP3.
+    The encoding runs in the ffmpeg process; the event loop only moves bytes.
+    """
+    def __init__(self, ffmpeg_path: Optional[str] = None, bitrates_kbps: Optional[Dict[str, int]] = None):
+        self.ffmpeg_path = ffmpeg_path or shutil.which("ffmpeg")
+        self.bitrates_kbps = {name: audio_format.default_bitrate_kbps for name, audio_format in AUDIO_FORMATS.items()}
+        self.bitrates_kbps.update(bitrates_kbps or {})
+        self.transcodes: Dict[str, int] = {}
+        self.failures = 0
+        self._total_seconds = 0.0
+
+    def available_formats(self) -> List[str]:
+        return list(AUDIO_FORMATS) if self.ffmpeg_path else [SOURCE_FORMAT]
+
+    def ffmpeg_command(self, audio_format: str) -> List[str]:
+        bitrate = str(self.bitrates_kbps[audio_format])
+        output_args = [arg.replace("{bitrate}", bitrate) for arg in AUDIO_FORMATS[audio_format].ffmpeg_args]
+        return [self.ffmpeg_path, "-nostdin", "-loglevel", "error", "-f", "mp3", "-i", "pipe:0", *output_args, "pipe:1"]
+
+    async def transcode(self, source: AudioClip, target: AudioClip, audio_format: str):
+        """Transcodes source into target (finishing it). Raises RuntimeError if ffmpeg fails."""
+        started = time.perf_counter()
+        process = await asyncio.create_subprocess_exec(
+            *self.ffmpeg_command(audio_format),
+            stdin=asyncio.subprocess.PIPE, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
+        )
+
+        async def feed():
+            try:
+                async for chunk in source.iter_chunks():
+                    process.stdin.write(chunk)
+                    await process.stdin.drain()
+            except (BrokenPipeError, ConnectionResetError):
+                pass # ffmpeg exited; its return code reports the error
+            finally:
+                process.stdin.close()
+
+        feeder = asyncio.create_task(feed())
+        try:
+            while chunk := await process.stdout.read(TRANSCODE_READ_BYTES):
+                await target.append(chunk)
+            await feeder
+            stderr = await process.stderr.read()
+            if await process.wait() != 0:
+                self.failures += 1
+                raise RuntimeError(f"ffmpeg failed to transcode to {audio_format}: {stderr.decode(errors='replace')[-300:]}")
+            self.transcodes[audio_format] = self.transcodes.get(audio_format, 0) + 1
+            self._total_seconds += time.perf_counter() - started
+        finally:
+            if process.returncode is None:
+                process.kill()
+                await process.wait()
+            feeder.cancel()
+            await target.finish()
+
+    def stats(self) -> Dict[str, Any]:
+        completed = sum(self.transcodes.values())
+        return {
+            "formats": self.available_formats(),
+            "transcodes": dict(self.transcodes),
+            "failures": self.failures,
+            "avg_ms": round(1000 * self._total_seconds / completed, 1) if completed else None,
+        }
@@ -0,0 +1,146 @@
+# audio_store.py
+import asyncio
+import statistics
+from collections import OrderedDict, deque
+from typing import AsyncIterator, Dict, Any, List, Optional, Tuple
+
+
+class AudioClip:
+    """
+    Question audio that may still be under synthesis.
+    The producer appends MP3 chunks as they are synthesized; readers can stream
+    the chunks as they arrive or wait for the complete clip.
+    """
+    def __init__(self, media_type: str = "audio/mpeg"):
+        self.media_type = media_type
+        self.chunks: List[bytes] = []
+        self.done = False
+        self.producer_task: Optional[asyncio.Task] = None
+        # Transcoded versions of this clip by format name, produced on demand and kept with it.
+        self.variants: Dict[str, "AudioClip"] = {}
+        # Set by the producer if it failed; readers then have a truncated clip.
+        self.error: Optional[Exception] = None
+        self._changed = asyncio.Condition()
+
+    async def append(self, chunk: bytes):
+        async with self._changed:
+            self.chunks.append(chunk)
+            self._changed.notify_all()
+
+    async def finish(self):
+        async with self._changed:
+            self.done = True
+            self._changed.notify_all()
+
+    async def iter_chunks(self) -> AsyncIterator[bytes]:
+        """Yields chunks as they are produced, until the clip is finished."""
+        index = 0
+        while True:
+            async with self._changed:
+                await self._changed.wait_for(lambda: index < len(self.chunks) or self.done)
+                pending = self.chunks[index:]
+                finished = self.done
+            for chunk in pending:
+                yield chunk
+            index += len(pending)
+            if finished and index >= len(self.chunks):
+                return
+
+    async def read_all(self) -> bytes:
+        """Waits for synthesis to finish and returns the complete clip."""
+        async with self._changed:
+            await self._changed.wait_for(lambda: self.done)
+        return b"".join(self.chunks)
+
+
+class AudioStore:
+    """
+    Per-worker store of question audio clips, keyed by (session_id, question_id).
+    Bounded LRU so abandoned interviews cannot grow it without limit.
+    """
+    def __init__(self, max_clips: int = 512):
+        self.max_clips = max_clips
+        self._clips: "OrderedDict[Tuple[str, str], AudioClip]" = OrderedDict()
+        self.evictions = 0
+        # Recent time-to-first-audio samples (seconds from the start of question generation
+        # to the first synthesized chunk), per production mode.
+        self._first_audio_seconds: Dict[str, deque] = {}
+
+    def create(self, session_id: str, question_id: str, media_type: str = "audio/mpeg") -> AudioClip:
+        clip = AudioClip(media_type=media_type)
+        self._clips[(session_id, question_id)] = clip
+        while len(self._clips) > self.max_clips:
+            _, evicted = self._clips.popitem(last=False)
+            self._cancel(evicted)
+            self.evictions += 1
+        return clip
+
+    def get(self, session_id: str, question_id: str) -> Optional[AudioClip]:
+        clip = self._clips.get((session_id, question_id))
+        if clip is not None:
+            self._clips.move_to_end((session_id, question_id))
+        return clip
+
+    def discard(self, session_id: str, question_id: str):
+        """Drops a clip, cancelling its synthesis if still running."""
+        clip = self._clips.pop((session_id, question_id), None)
+        if clip is not None:
+            self._cancel(clip)
+
+    def drop_session(self, session_id: str):
+        for key in [key for key in self._clips if key[0] == session_id]:
+            self._cancel(self._clips.pop(key))
+
+    @staticmethod
+    def _cancel(clip: AudioClip):
+        for audio_clip in [clip, *clip.variants.values()]:
+            if audio_clip.producer_task is not None and not audio_clip.producer_task.done():
+                audio_clip.producer_task.cancel()
+
+    def record_first_audio(self, seconds: float, mode: str):
+        self._first_audio_seconds.setdefault(mode, deque(maxlen=1000)).append(seconds)
+
+    def stats(self) -> Dict[str, Any]:
+        time_to_first_audio = {}
+        for mode, samples in self._first_audio_seconds.items():
+            ordered = sorted(samples)
+            time_to_first_audio[mode] = {
+                "count": len(ordered),
+                "p50_ms": round(1000 * statistics.median(ordered), 1),
+                "p95_ms": round(1000 * ordered[min(len(ordered) - 1, int(0.95 * len(ordered)))], 1),
+            }
+        return {
+            "clips": len(self._clips),
+            "in_progress": sum(1 for clip in self._clips.values() if not clip.done),
+            "bytes": sum(len(chunk) for clip in self._clips.values() for audio_clip in [clip, *clip.variants.values()]
+                         for chunk in audio_clip.chunks),
+            "variants": sum(len(clip.variants) for clip in self._clips.values()),
+            "evictions": self.evictions,
+            "time_to_first_audio": time_to_first_audio,
+        }
+
+
+def parse_range_header(range_header: str, size: int) -> Optional[Tuple[int, int]]:
+    """
+    Parses a single-range 'Range: bytes=start-end' header into inclusive (start, end).
+    Returns None if the header is not a byte range we handle (serve the full body),
+    raises ValueError if the range cannot be satisfied.
+    """
+    unit, _, spec = range_header.partition("=")
+    if unit.strip().lower() != "bytes" or "," in spec:
+        return None
+    start_str, _, end_str = spec.strip().partition("-")
+    try:
+        if start_str:
+            start = int(start_str)
+            end = int(end_str) if end_str else size - 1
+        else: # Suffix range: the last N bytes
+            suffix_length = int(end_str)
+            if suffix_length <= 0:
+                raise ValueError("Empty suffix range.")
+            start, end = max(0, size - suffix_length), size - 1
+    except ValueError:
+        raise ValueError(f"Malformed range: {range_header}")
+    if start >= size or start > end:
+        raise ValueError(f"Range not satisfiable: {range_header}")
+    return start, min(end, size - 1)
@@ -0,0 +1,78 @@
+# blocking_pool.py
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict
+
+
+class BlockingIOPool:
+    """
+    Bounded thread pool for running synchronous (blocking) SDK calls such as gTTS
+    without stalling the asyncio event loop.
+    Keeps simple counters so queue depth can be monitored.
+    """
+    def __init__(self, max_workers: int, name: str = "blocking-io"):
+        self.max_workers = max_workers
+        self.name = name
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=name)
+        self._lock = threading.Lock()
+        self._queued = 0
+        self._active = 0
+        self._max_queue_depth = 0
+        self._completed = 0
+        self._failed = 0
+        self._total_wait_seconds = 0.0
+
+    async def run(self, func: Callable[..., Any], *args: Any) -> Any:
+        """Runs func(*args) on the pool and awaits its result."""
+        submitted_at = time.perf_counter()
+        with self._lock:
+            self._queued += 1
+            self._max_queue_depth = max(self._max_queue_depth, self._queued)
+
+        def _wrapped():
+            with self._lock:
+                self._queued -= 1
+                self._active += 1
+                self._total_wait_seconds += time.perf_counter() - submitted_at
+            try:
+                return func(*args)
+            finally:
+                with self._lock:
+                    self._active -= 1
+
+        def _on_done(future):
+            # A call cancelled while still queued (its awaiter was cancelled, or the pool shut down) never runs _wrapped.
+            if future.cancelled():
+                with self._lock:
+                    self._queued -= 1
+
+        future = self._executor.submit(_wrapped)
+        future.add_done_callback(_on_done)
+        try:
+            result = await asyncio.wrap_future(future)
+        except Exception:
+            with self._lock:
+                self._failed += 1
+            raise
+        with self._lock:
+            self._completed += 1
+        return result
+
+    def stats(self) -> Dict[str, Any]:
+        """Snapshot of the pool's queue depth and throughput counters."""
+        with self._lock:
+            finished = self._completed + self._failed
+            return {
+                "max_workers": self.max_workers,
+                "queued": self._queued,
+                "active": self._active,
+                "max_queue_depth": self._max_queue_depth,
+                "completed": self._completed,
+                "failed": self._failed,
+                "avg_queue_wait_ms": round(1000 * self._total_wait_seconds / finished, 2) if finished else 0.0,
+            }
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
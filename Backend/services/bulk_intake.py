@@ -0,0 +1,114 @@
+# bulk_intake.py
+import asyncio
+import io
+import json
+import logging
+import os
+import time
+import zipfile
+import zlib
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+SUPPORTED_EXTENSIONS = (".pdf", ".docx")
+# Per-entry read failures: corrupt data or CRC/size mismatch, encrypted entries, unsupported compression.
+ENTRY_READ_ERRORS = (zipfile.BadZipFile, zlib.error, EOFError, RuntimeError, NotImplementedError)
+
+
+def extract_resumes_from_zip(archive_content: bytes, max_files: int, max_file_bytes: int,
+                             max_total_bytes: int) -> Tuple[List[Tuple[str, bytes]], List[Dict[str, Any]]]:
+    """
+    Returns ([(filename, content)], [skipped entries]) for the PDF/DOCX files in a ZIP archive.
+    Entry sizes are checked from the archive directory before decompression (zip bomb guard):
+    each entry against max_file_bytes and all entries together against max_total_bytes. zipfile
+    never decompresses more than an entry's declared size. Entries that cannot be read are skipped.
+    """
+    files, skipped = [], []
+    total_bytes = 0
+    try:
+        archive = zipfile.ZipFile(io.BytesIO(archive_content))
+    except zipfile.BadZipFile:
+        raise ValueError("The uploaded archive is not a valid ZIP file.")
+    with archive:
+        for info in archive.infolist():
+            name = info.filename
+            if info.is_dir() or name.startswith("__MACOSX/") or os.path.basename(name).startswith("."):
+                continue
+            if not name.lower().endswith(SUPPORTED_EXTENSIONS):
+                skipped.append({"filename": name, "error": "Unsupported file type."})
+                continue
+            if info.file_size > max_file_bytes:
+                skipped.append({"filename": name, "error": f"File is too large ({info.file_size // 1024} KB)."})
+                continue
+            if len(files) >= max_files:
+                skipped.append({"filename": name, "error": f"Archive has more than {max_files} resumes."})
+                continue
+            if total_bytes + info.file_size > max_total_bytes:
+                skipped.append({"filename": name, "error": f"Archive contents exceed {max_total_bytes} bytes."})
+                continue
+            try:
+                content = archive.read(info)
+            except ENTRY_READ_ERRORS as e:
+                skipped.append({"filename": name, "error": f"Could not read file from archive: {e}"})
+                continue
+            total_bytes += info.file_size
+            files.append((name, content))
+    return files, skipped
+
+
+async def stream_bulk_parse(files: List[Tuple[str, bytes]], parse: Callable[[bytes, str], Awaitable[Dict[str, Any]]],
+                            concurrency: int, skipped: List[Dict[str, Any]] = None) -> AsyncIterator[str]:
+    """
+    Parses files with at most `concurrency` in flight and yields one NDJSON line per file
+    in completion order, followed by a summary line with throughput.
+    Pending parses are cancelled if the consumer stops reading (client disconnect).
+    """
+    started = time.perf_counter()
+    semaphore = asyncio.Semaphore(concurrency)
+    succeeded = failed = 0
+
+    for entry in skipped or []:
+        failed += 1
+        yield json.dumps({"type": "result", "status": "error", **entry}) + "\n"
+
+    async def parse_one(filename: str, content: bytes) -> Dict[str, Any]:
+        async with semaphore:
+            file_started = time.perf_counter()
+            try:
+                resume_info = await parse(content, filename)
+                resume_info.pop("raw_text", None) # Keep the stream compact
+                result = {"status": "ok", "resume_info": resume_info}
+            except ValueError as e:
+                result = {"status": "error", "error": str(e)}
+            except ConnectionError as e:
+                result = {"status": "error", "error": f"Problem communicating with external AI service. {e}"}
+            except Exception as e:
+                logger.exception("Unexpected error while bulk parsing.", extra={"resume_file": filename})
+                result = {"status": "error", "error": f"Internal error: {e}"}
+            return {"type": "result", "filename": filename, **result,
+                    "elapsed_ms": round(1000 * (time.perf_counter() - file_started), 1)}
+
+    tasks = [asyncio.create_task(parse_one(filename, content)) for filename, content in files]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            result = await next_done
+            if result["status"] == "ok":
+                succeeded += 1
+            else:
+                failed += 1
+            yield json.dumps(result) + "\n"
+    finally:
+        for task in tasks:
+            task.cancel()
+
+    elapsed = time.perf_counter() - started
+    yield json.dumps({
+        "type": "summary",
+        "total": succeeded + failed,
+        "succeeded": succeeded,
+        "failed": failed,
+        "concurrency": concurrency,
+        "elapsed_s": round(elapsed, 3),
+        "resumes_per_second": round(len(files) / elapsed, 2) if elapsed > 0 else None,
+    }) + "\n"
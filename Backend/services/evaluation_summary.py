@@ -0,0 +1,183 @@
+# evaluation_summary.py
+import re
+from typing import Any, Dict, Iterable, List, Optional
+
+# Answers kept as examples in the running evaluation (best and worst scored), and their note length.
+MAX_EXAMPLES = 3
+MAX_NOTE_CHARS = 160
+MAX_QUESTION_CHARS = 90
+
+# Question type tag prefix -> area reported in the overall evaluation.
+_AREAS = [
+    ("technical_", "technical"),
+    ("hr_", "behavioral"),
+    ("resume_", "resume and experience"),
+    ("generic", "introduction"),
+]
+
+# Feedback sentences containing these are preferred as the note of a weak answer.
+_IMPROVEMENT_CUES = re.compile(r"\b(could|should|lack\w*|missing|improve\w*|more|however|but|unclear|vague|deeper)\b", re.I)
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+
+_AREA_IMPROVEMENTS = {
+    "technical": "Review the core {domain} concepts behind the technical questions and practice explaining them aloud with a concrete example and the trade-offs involved.",
+    "behavioral": "Prepare a few STAR-method stories (situation, task, action, result) and practice telling them with a clear, measurable result.",
+    "resume and experience": "Rehearse walking through your main projects: your role, the decisions you made and numbers that show the impact.",
+    "introduction": "Prepare a concise one-minute introduction that connects your background to the {domain} role.",
+}
+
+
+def question_area(question_type: str) -> str:
+    for prefix, area in _AREAS:
+        if (question_type or "").startswith(prefix):
+            return area
+    return "other"
+
+
+def _truncate(text: str, max_chars: int) -> str:
+    text = " ".join(str(text).split())
+    if len(text) <= max_chars:
+        return text
+    return text[:max(0, max_chars - 3)].rsplit(" ", 1)[0] + "..."
+
+
+def key_sentence(feedback: str, prefer_improvements: bool = False) -> str:
+    """The feedback sentence kept in the running evaluation (for weak answers, the first one suggesting an improvement)."""
+    sentences = [sentence for sentence in _SENTENCE_END.split(" ".join(str(feedback).split())) if sentence]
+    if not sentences:
+        return ""
+    if prefer_improvements:
+        for sentence in sentences:
+            if _IMPROVEMENT_CUES.search(sentence):
+                return _truncate(sentence, MAX_NOTE_CHARS)
+    return _truncate(sentences[0], MAX_NOTE_CHARS)
+
+
+def new_running_evaluation() -> Dict[str, Any]:
+    return {"answers": 0, "total_score": 0.0, "timeouts": 0, "by_type": {}, "strongest": [], "weakest": []}
+
+
+def update_running_evaluation(state: Dict[str, Any], answer: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Folds one evaluated answer (an entry of session["answers"]) into the running evaluation, in place.
+    The state has a bounded size however long the interview is: score sums per question type, plus
+    the MAX_EXAMPLES best and worst answers with one sentence of their feedback.
+    """
+    try:
+        score = float(answer.get("score", 0.0))
+    except (ValueError, TypeError):
+        score = 0.0
+    question_type = answer.get("question_type") or answer.get("type") or "N/A"
+
+    state["answers"] += 1
+    state["total_score"] = round(state["total_score"] + score, 3)
+    state["timeouts"] += bool(answer.get("is_timeout"))
+    type_stats = state["by_type"].setdefault(question_type, {"count": 0, "total": 0.0})
+    type_stats["count"] += 1
+    type_stats["total"] = round(type_stats["total"] + score, 3)
+
+    example = {
+        "number": state["answers"],
+        "type": question_type,
+        "question": _truncate(answer.get("question_text", ""), MAX_QUESTION_CHARS),
+        "score": score,
+    }
+    feedback = answer.get("feedback", "")
+    # Ties keep the earlier answer, so the examples do not churn on equal scores.
+    strongest = state["strongest"] + [dict(example, note=key_sentence(feedback))]
+    state["strongest"] = sorted(strongest, key=lambda e: (-e["score"], e["number"]))[:MAX_EXAMPLES]
+    weakest = state["weakest"] + [dict(example, note=key_sentence(feedback, prefer_improvements=True))]
+    state["weakest"] = sorted(weakest, key=lambda e: (e["score"], e["number"]))[:MAX_EXAMPLES]
+    return state
+
+
+def build_running_evaluation(answers: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+    """Running evaluation of an answer history (for sessions that were started without one)."""
+    state = new_running_evaluation()
+    for answer in answers:
+        update_running_evaluation(state, answer)
+    return state
+
+
+def average_score(state: Dict[str, Any]) -> Optional[float]:
+    return state["total_score"] / state["answers"] if state["answers"] else None
+
+
+def area_scores(state: Dict[str, Any]) -> Dict[str, float]:
+    """Average score per area (technical, behavioral, ...), in the order the areas were first asked."""
+    totals: Dict[str, List[float]] = {}
+    for question_type, stats in state["by_type"].items():
+        area_total = totals.setdefault(question_area(question_type), [0.0, 0])
+        area_total[0] += stats["total"]
+        area_total[1] += stats["count"]
+    return {area: total / count for area, (total, count) in totals.items() if count}
+
+
+def _example_line(example: Dict[str, Any]) -> str:
+    return f"- Q{example['number']} ({example['type']}, score {example['score']:.1f}): \"{example['question']}\" {example['note']}"
+
+
+def running_evaluation_text(state: Dict[str, Any]) -> str:
+    """Compact prompt section for the overall evaluation; its length does not grow with the interview."""
+    average = average_score(state)
+    lines = [f"Answers: {state['answers']}, average score {average:.1f}/1.0" if average is not None else "Answers: 0"]
+    if state["timeouts"]:
+        lines[0] += f", {state['timeouts']} timed out or silent"
+    if state["by_type"]:
+        lines.append("Average score per question type: " + ", ".join(
+            f"{question_type} {stats['total'] / stats['count']:.1f} ({stats['count']} answers)"
+            for question_type, stats in state["by_type"].items()))
+    if state["strongest"]:
+        lines.append("Strongest answers (question, score, key feedback):")
+        lines.extend(_example_line(example) for example in state["strongest"])
+    if state["weakest"]:
+        lines.append("Weakest answers (question, score, key feedback):")
+        lines.extend(_example_line(example) for example in state["weakest"])
+    return "\n        ".join(lines)
+
+
+def local_overall_evaluation(state: Dict[str, Any], domain: str) -> Dict[str, str]:
+    """
+    Overall evaluation assembled from the running evaluation without an LLM call (fast mode).
+    Same keys as GroqService.get_overall_evaluation.
+    """
+    average = average_score(state)
+    if average is None:
+        return {
+            "overall_performance": "The interview ended before any answer was evaluated.",
+            "weak_points": "- No answers to assess.",
+            "improvements": "- Complete an interview to receive feedback.",
+        }
+    areas = area_scores(state)
+    ranked = sorted(areas, key=lambda area: areas[area], reverse=True)
+
+    overall = f"The candidate answered {state['answers']} questions for the {domain} role with an average score of {average:.1f}/1.0."
+    if len(ranked) > 1 and areas[ranked[0]] - areas[ranked[-1]] >= 0.1:
+        overall += (f" They were strongest on {ranked[0]} questions ({areas[ranked[0]]:.1f})"
+                    f" and weakest on {ranked[-1]} questions ({areas[ranked[-1]]:.1f}).")
+    elif len(ranked) > 1:
+        overall += " Performance was consistent across question types."
+    if state["strongest"] and state["strongest"][0]["note"]:
+        overall += f" Best answer (Q{state['strongest'][0]['number']}): {state['strongest'][0]['note']}"
+
+    weak = [example for example in state["weakest"] if example["score"] < 0.7]
+    if state["timeouts"]:
+        weak_points = [f"- {state['timeouts']} question(s) were not answered in time or had no speech."]
+    else:
+        weak_points = []
+    weak_points += [f"- Q{example['number']} ({example['type']}): {example['note'] or 'low score'}" for example in weak]
+    if not weak_points:
+        weak_points = ["- No major weak points; every answer scored 0.7 or higher."]
+
+    improvement_areas = [area for area in reversed(ranked) if areas[area] < 0.7 and area in _AREA_IMPROVEMENTS][:2]
+    improvements = [f"- {_AREA_IMPROVEMENTS[area].format(domain=domain)}" for area in improvement_areas]
+    if state["timeouts"]:
+        improvements.append("- Practice answering within the time limit: start with a one-sentence summary, then add detail.")
+    if not improvements:
+        improvements = [f"- Keep practicing harder {domain} questions and quantify the impact of your work in answers."]
+
+    return {
+        "overall_performance": overall,
+        "weak_points": "\n".join(weak_points),
+        "improvements": "\n".join(improvements),
+    }
@@ -0,0 +1,101 @@
+# extraction_pool.py
+import asyncio
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Dict, List
+
+
+class ExtractionTimeoutError(ValueError):
+    """Raised when a document takes longer than the allowed time to extract."""
+
+
+class DocumentExtractionPool:
+    """
+    Process pool for CPU-bound document text extraction (PyPDF2 / python-docx),
+    so one large document cannot pin the event loop of a worker.
+
+    The extraction function enforces per-document CPU time and page limits itself;
+    as a last resort, a document that exceeds the wall-clock timeout gets its worker
+    process terminated and replaced.
+
+    Each worker is a single-process executor that runs one document at a time, and a
+    semaphore hands them out, so the timeout only counts the time a document actually
+    runs (not its wait for a free worker) and terminating a stuck worker never takes
+    other documents' extractions down with it.
+    """
+    def __init__(self, max_workers: int = 2, timeout_seconds: float = 20.0):
+        self.max_workers = max_workers
+        self.timeout_seconds = timeout_seconds
+        self._idle: List[ProcessPoolExecutor] = [ProcessPoolExecutor(max_workers=1) for _ in range(max_workers)]
+        self._busy: List[ProcessPoolExecutor] = []
+        self._semaphore = asyncio.Semaphore(max_workers)
+        self.completed = 0
+        self.failed = 0
+        self.timeouts = 0
+        self.restarts = 0
+        self.inflight = 0
+        self.queued = 0
+        self._total_seconds = 0.0
+
+    def _restart(self, executor: ProcessPoolExecutor) -> ProcessPoolExecutor:
+        # A stuck extraction cannot be interrupted; terminate its worker process.
+        self.restarts += 1
+        for process in list(getattr(executor, "_processes", {}).values()):
+            process.terminate()
+        executor.shutdown(wait=False, cancel_futures=True)
+        return ProcessPoolExecutor(max_workers=1)
+
+    async def run(self, func: Callable[..., Any], *args: Any) -> Any:
+        self.queued += 1
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self.queued -= 1
+        worker = self._idle.pop()
+        self._busy.append(worker)
+        replacement = None
+        started = time.perf_counter()
+        self.inflight += 1
+        try:
+            future = asyncio.get_running_loop().run_in_executor(worker, func, *args)
+            result = await asyncio.wait_for(future, timeout=self.timeout_seconds)
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            replacement = self._restart(worker)
+            raise ExtractionTimeoutError(f"Document extraction took longer than {self.timeout_seconds:g}s.")
+        except asyncio.CancelledError:
+            # The caller went away while the document was extracting; free the worker for the next one.
+            replacement = self._restart(worker)
+            raise
+        except BrokenProcessPool:
+            self.failed += 1
+            replacement = self._restart(worker)
+            raise ValueError("Document extraction failed (worker process crashed). The file may be malformed.")
+        except Exception:
+            self.failed += 1
+            raise
+        finally:
+            self.inflight -= 1
+            self._busy.remove(worker)
+            self._idle.append(replacement or worker)
+            self._semaphore.release()
+        self.completed += 1
+        self._total_seconds += time.perf_counter() - started
+        return result
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "max_workers": self.max_workers,
+            "inflight": self.inflight,
+            "queued": self.queued,
+            "completed": self.completed,
+            "failed": self.failed,
+            "timeouts": self.timeouts,
+            "restarts": self.restarts,
+            "avg_extraction_ms": round(1000 * self._total_seconds / self.completed, 2) if self.completed else 0.0,
+        }
+
+    def shutdown(self):
+        for executor in self._idle + self._busy:
+            executor.shutdown(wait=False, cancel_futures=True)
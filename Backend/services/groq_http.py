@@ -0,0 +1,313 @@
+# groq_http.py
+import asyncio
+import contextlib
+import email.utils
+import logging
+import random
+import re
+import time
+from typing import Any, AsyncIterator, Dict, Optional, Tuple
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+# Budget of a request bucket without a configured per-minute limit until the provider reports one.
+UNLIMITED = 1e9
+
+_DURATION_PART = re.compile(r"(\d+(?:\.\d+)?)(ms|h|m|s)")
+_DURATION_UNITS = {"ms": 0.001, "s": 1.0, "m": 60.0, "h": 3600.0}
+
+
+def parse_reset_duration(value: Optional[str]) -> Optional[float]:
+    """Parses Groq's x-ratelimit-reset-* values ("7.66s", "2m59.56s", "120ms") into seconds."""
+    if not value:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    parts = _DURATION_PART.findall(value)
+    if not parts:
+        return None
+    return sum(float(amount) * _DURATION_UNITS[unit] for amount, unit in parts)
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parses a Retry-After header (delta seconds or HTTP date) into seconds."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, retry_at.timestamp() - time.time())
+
+
+def parse_model_limits(spec: str) -> Dict[str, float]:
+    """Parses per-model limits from "model=value" entries separated by commas. Raises ValueError if malformed."""
+    limits = {}
+    for entry in filter(None, (part.strip() for part in spec.split(","))):
+        model, separator, value = entry.partition("=")
+        if not separator or not model.strip():
+            raise ValueError(f"Invalid per-model limit '{entry}': expected model=value.")
+        limits[model.strip()] = float(value)
+    return limits
+
+
+def estimate_request_tokens(payload: Dict[str, Any]) -> int:
+    """Rough token cost of a chat completion: ~4 characters per prompt token plus the max_tokens reservation."""
+    prompt_chars = sum(len(str(message.get("content", ""))) for message in payload.get("messages", []))
+    return prompt_chars // 4 + int(payload.get("max_tokens", 0))
+
+
+class TokenBucket:
+    """
+    Async token bucket. `rate` tokens are added per second up to `capacity`.
+    The bucket is kept in sync with the provider: `observe` clamps it to the remaining
+    budget reported in rate-limit headers, and `pause` blocks it until a reset time.
+    """
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self, amount: float = 1.0) -> float:
+        """Waits until `amount` tokens are available and takes them. Returns the seconds waited."""
+        started = time.monotonic()
+        async with self._lock: # FIFO: one waiter at a time, so large requests are not starved
+            while True:
+                now = time.monotonic()
+                if now < self._paused_until:
+                    await asyncio.sleep(self._paused_until - now)
+                    continue
+                self._refill()
+                # A request larger than the whole bucket is let through once the bucket is full.
+                if self.tokens >= min(amount, self.capacity):
+                    self.tokens -= amount
+                    return time.monotonic() - started
+                await asyncio.sleep((min(amount, self.capacity) - self.tokens) / self.rate)
+
+    def refund(self, amount: float):
+        self._refill()
+        self.tokens = min(self.capacity, self.tokens + amount)
+
+    def observe(self, limit: Optional[float], remaining: Optional[float], reset_seconds: Optional[float], window_seconds: float):
+        if limit:
+            self.capacity = limit
+            self.rate = limit / window_seconds
+        if remaining is not None:
+            self._refill()
+            self.tokens = min(self.tokens, remaining)
+            if remaining <= 0 and reset_seconds:
+                self.pause(reset_seconds)
+
+    def pause(self, seconds: float):
+        self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+
+class GroqHTTPClient:
+    """
+    Shared HTTP layer for every Groq API call (chat completions and transcriptions).
+
+    - One pooled keep-alive httpx client (HTTP/2 when the `h2` package is installed).
+    - A global in-flight cap shared by all GroqService methods.
+    - Request and token buckets per model (Groq's limits are per model, so Whisper and the LLMs
+      do not share a budget) that follow the provider's x-ratelimit-* headers, so bursts are
+      smoothed client-side instead of turning into 429s.
+    - Requests are capped per minute only if configured (requests_per_minute, or per model with
+      model_requests_per_minute); Groq only reports its daily request limit, so otherwise a model's
+      request bucket follows x-ratelimit-limit-requests over the day and 429 Retry-After pauses.
+    - Jittered exponential backoff on 429/5xx and transport errors, honouring Retry-After.
+    """
+    def __init__(self, api_key: str, base_url: str = "https://api.groq.com/openai/v1",
+                 max_inflight: int = 32, max_connections: int = 64, max_keepalive_connections: int = 32,
+                 keepalive_expiry: float = 30.0, timeout_seconds: float = 120.0, connect_timeout_seconds: float = 10.0,
+                 requests_per_minute: float = 0, tokens_per_minute: float = 6000,
+                 model_requests_per_minute: Optional[Dict[str, float]] = None, max_retries: int = 3, backoff_base_seconds: float = 0.5, backoff_max_seconds: float = 20.0,
+                 http2: bool = True):
+        self.api_key = api_key
+        self.base_url = base_url.rstrip("/")
+        self.max_inflight = max_inflight
+        self.max_retries = max_retries
+        self.backoff_base_seconds = backoff_base_seconds
+        self.backoff_max_seconds = backoff_max_seconds
+
+        if http2:
+            try:
+                import h2 # noqa: F401 (httpx needs it for HTTP/2)
+            except ImportError:
+                logger.warning("h2 is not installed; Groq client falls back to HTTP/1.1. Install httpx[http2] to enable HTTP/2.")
+                http2 = False
+        self.http2 = http2
+        self.client = httpx.AsyncClient(
+            http2=http2,
+            timeout=httpx.Timeout(timeout_seconds, connect=connect_timeout_seconds),
+            limits=httpx.Limits(max_connections=max_connections,
+                                max_keepalive_connections=max_keepalive_connections,
+                                keepalive_expiry=keepalive_expiry),
+            headers={"Authorization": f"Bearer {api_key}"},
+        )
+
+        self._inflight = asyncio.Semaphore(max_inflight)
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self.model_requests_per_minute = dict(model_requests_per_minute or {})
+        # (request bucket, token bucket) per model, created on first use.
+        self._buckets: Dict[str, Tuple[TokenBucket, TokenBucket]] = {}
+
+        self.inflight = 0
+        self.requests = 0
+        self.retries = 0
+        self.rate_limited = 0
+        self.failures = 0
+        self._throttle_seconds = 0.0
+
+    def _backoff_delay(self, attempt: int, response: Optional[httpx.Response]) -> float:
+        if response is not None:
+            retry_after = parse_retry_after(response.headers.get("retry-after"))
+            if retry_after is not None:
+                return min(retry_after, self.backoff_max_seconds) + random.uniform(0, self.backoff_base_seconds)
+        # Full jitter keeps many interviews that failed together from retrying together.
+        return random.uniform(0, min(self.backoff_max_seconds, self.backoff_base_seconds * (2 ** attempt)))
+
+    def _requests_per_minute(self, model: str) -> float:
+        return self.model_requests_per_minute.get(model, self.requests_per_minute)
+
+    def _model_buckets(self, model: str) -> Tuple[TokenBucket, TokenBucket]:
+        buckets = self._buckets.get(model)
+        if buckets is None:
+            requests_per_minute = self._requests_per_minute(model)
+            request_bucket = (TokenBucket(rate=requests_per_minute / 60.0, capacity=requests_per_minute) if requests_per_minute > 0
+                              else TokenBucket(rate=UNLIMITED, capacity=UNLIMITED))
+            buckets = self._buckets[model] = (request_bucket, TokenBucket(rate=self.tokens_per_minute / 60.0, capacity=self.tokens_per_minute))
+        return buckets
+
+    def _observe_rate_limits(self, response: httpx.Response, model: str):
+        headers = response.headers
+
+        def number(name: str) -> Optional[float]:
+            try:
+                return float(headers[name])
+            except (KeyError, ValueError):
+                return None
+
+        # Groq reports requests per day and tokens per minute. A configured per-minute request
+        # limit is kept; otherwise the request bucket follows the daily limit.
+        request_bucket, token_bucket = self._model_buckets(model)
+        request_bucket.observe(None if self._requests_per_minute(model) > 0 else number("x-ratelimit-limit-requests"),
+                               number("x-ratelimit-remaining-requests"),
+                               parse_reset_duration(headers.get("x-ratelimit-reset-requests")), 86400.0)
+        token_bucket.observe(number("x-ratelimit-limit-tokens"), number("x-ratelimit-remaining-tokens"),
+                                  parse_reset_duration(headers.get("x-ratelimit-reset-tokens")), 60.0)
+
+    @contextlib.asynccontextmanager
+    async def request(self, path: str, estimated_tokens: int = 0, stream: bool = False,
+                      **kwargs: Any) -> AsyncIterator[httpx.Response]:
+        """
+        POSTs to the Groq API with rate limiting, the in-flight cap and retries, and yields
+        the successful response. With stream=True the body is not read yet and the in-flight
+        slot is held until the caller finishes reading it. Only attempts that fail before the
+        body is handed out are retried.
+        Raises httpx.HTTPStatusError / httpx.RequestError once retries are exhausted or for
+        non-retryable failures.
+        """
+        url = f"{self.base_url}/{path.lstrip('/')}"
+        model = str((kwargs.get("json") or kwargs.get("data") or {}).get("model", path))
+        request_bucket, token_bucket = self._model_buckets(model)
+        attempt = 0
+        while True:
+            self._throttle_seconds += await request_bucket.acquire(1)
+            if estimated_tokens:
+                self._throttle_seconds += await token_bucket.acquire(estimated_tokens)
+
+            response = None
+            error: Optional[Exception] = None
+            async with self._inflight:
+                self.inflight += 1
+                self.requests += 1
+                try:
+                    try:
+                        response = await self.client.send(self.client.build_request("POST", url, **kwargs), stream=stream)
+                    except httpx.TransportError as e:
+                        error = e
+
+                    if response is not None:
+                        self._observe_rate_limits(response, model)
+                        if response.status_code not in RETRYABLE_STATUS_CODES:
+                            if response.is_error:
+                                self.failures += 1
+                                await response.aread() # So the error body is available to the caller
+                            response.raise_for_status()
+                            yield response
+                            return
+                        if response.status_code == 429:
+                            self.rate_limited += 1
+                            retry_after = parse_retry_after(response.headers.get("retry-after"))
+                            if retry_after:
+                                request_bucket.pause(retry_after)
+                        if attempt >= self.max_retries:
+                            self.failures += 1
+                            await response.aread()
+                            response.raise_for_status()
+                    elif attempt >= self.max_retries:
+                        self.failures += 1
+                        raise error
+                finally:
+                    self.inflight -= 1
+                    if response is not None:
+                        await response.aclose()
+
+            delay = self._backoff_delay(attempt, response)
+            status = response.status_code if response is not None else type(error).__name__
+            logger.warning("Groq API call failed; retrying.", extra={"path": path, "status": status, "retry": attempt + 1,
+                                                                    "max_retries": self.max_retries, "delay_s": round(delay, 2)})
+            self.retries += 1
+            attempt += 1
+            await asyncio.sleep(delay)
+
+    async def post(self, path: str, estimated_tokens: int = 0, **kwargs: Any) -> httpx.Response:
+        """POSTs to the Groq API (see `request`) and returns the successful, fully read response."""
+        async with self.request(path, estimated_tokens=estimated_tokens, **kwargs) as response:
+            return response
+
+    def refund_tokens(self, model: str, estimated_tokens: int, used_tokens: Optional[int]):
+        """Returns the unused part of a token reservation once the actual usage is known."""
+        if used_tokens is not None and estimated_tokens > used_tokens:
+            self._model_buckets(model)[1].refund(estimated_tokens - used_tokens)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "http2": self.http2,
+            "max_inflight": self.max_inflight,
+            "inflight": self.inflight,
+            "requests": self.requests,
+            "retries": self.retries,
+            "rate_limited": self.rate_limited,
+            "failures": self.failures,
+            "throttle_wait_s": round(self._throttle_seconds, 3),
+            "models": {
+                model: {
+                    "requests_per_minute": round(60 * request_bucket.rate, 2) if request_bucket.rate < UNLIMITED else None,
+                    "request_budget": round(request_bucket.tokens, 1) if request_bucket.tokens < UNLIMITED else None,
+                    "token_budget": round(token_bucket.tokens, 1),
+                }
+                for model, (request_bucket, token_bucket) in self._buckets.items()
+            },
+        }
+
+    async def aclose(self):
+        await self.client.aclose()
@@ -1,109 +1,298 @@
 # groq_service.py
 # UNIQUE IDENTIFIER FOR THIS FILE VERSION: groq_service_20250613_DirectTTSCall_EnhancedInterviewLogic_V2
 import httpx
-import base64
 import json
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, AsyncIterator, Iterator, Callable, Sequence
 import time
-import io
 import sys
 import inspect
+import asyncio
+import logging
 
-from groq import Groq
 from gtts import gTTS
 
+from services.blocking_pool import BlockingIOPool
+from services.tts_cache import TTSCache, tts_cache_key
+from services.audio_store import AudioClip
+from services.groq_http import GroqHTTPClient, estimate_request_tokens
+from services.text_stream import TrailingScoreParser
+from services.resume_summary import build_resume_summary
+from services.evaluation_summary import running_evaluation_text
+from services.question_similarity import question_topics
+from services.model_router import ModelRouter, QUESTION_OPENING_CHARS, json_problem, question_problem, strip_json_fences
+from services.voice_activity import audio_file_type
+from services.metrics import LLM_CALL_SECONDS, LLM_TOKENS, LLM_ERRORS, STT_ERRORS
+
+logger = logging.getLogger(__name__)
+
 # Placeholder for Groq API Key. This will be loaded from the config.
 GROQ_API_KEY_PLACEHOLDER = ""
 
+# gTTS voice settings. They are part of the TTS cache key.
+TTS_LANG = "en"
+TTS_SLOW = False
+TTS_TLD = "com"
+
+# Returned if gTTS fails, so the interview can continue with the question text.
+DUMMY_MP3_BASE64 = "SUQzBAAAAAAAI1RTU1QAAAAAAAAAAAPkAAAAAAAAAAAAAAAAAAAAAAD/4xj/AQIAAAATc3RhbmRhcmQxAAAAAExhdmY1NC42My4xMDAAAAA///+7hAwAAAAAAAAAAAAAAADIzMDcBAwAAD0pVAACgQhQYAAAFFAAAAP//BIEAE0lTQUQgVkxYAAABAAACgSE4c+jRFAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAIYgAAAGoAAAEAACAFIAAAAACAAANsAAAABAAAAzAAAAB/Q/vLwL//jGP8BAgAAABNzdGFuZGFyZDEAAABMdmFmNTQuNjMuMTAwAAAAAAAAAAD///7uEDAAAAAAAAAAAAAAAADIzMDcBAwAAD0pVAACgQhQYAAAFFAAAAP//BIEAE0lTQUQgVkxYAAABAAACgSE4c+jRFAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAIYgAAAGoAAAEAACAFIAAAAACAAANsAAAABAAAAzAAAAB/Q/vLwL"
+
+# One silent MPEG-1 Layer III frame (128 kbps, 44.1 kHz), returned by the "stub" TTS backend.
+STUB_MP3_FRAME = b"\xff\xfb\x90\x64" + b"\x00" * 413
+
 class GroqService:
     """
     Service class for interacting with the Groq API for LLM, STT, and TTS functionalities.
     """
-    def __init__(self, api_key: str):
+    def __init__(self, api_key: str, blocking_pool_size: int = 8, tts_cache: Optional[TTSCache] = None,
+                 http_client: Optional[GroqHTTPClient] = None, resume_summary_token_budget: int = 400,
+                 tts_backend: str = "gtts", tts_stub_latency_seconds: float = 0.3, question_history_topics: bool = True,
+                 model_router: Optional[ModelRouter] = None):
         self.api_key = api_key
-        # Initialize Groq client
-        self.groq_client = Groq(api_key=self.api_key)
-
-        print(f"--- DEBUG: Initializing GroqService. Groq client instance: {self.groq_client}")
-        # print(f"--- DEBUG: sys.path (where Python looks for modules): {sys.path}")
-        # print(f"--- DEBUG: Type of self.groq_client.audio: {type(self.groq_client.audio)}")
-        # print(f"--- DEBUG: dir(self.groq_client.audio): {dir(self.groq_client.audio)}")
-        # print(f"--- DEBUG: inspect.getmembers(self.groq_client.audio): {inspect.getmembers(self.groq_client.audio)}")
-
-
-        self.llm_model_url = "https://api.groq.com/openai/v1/chat/completions"
-        self.client = httpx.AsyncClient(timeout=120.0)
+        # All Groq API calls (LLM and Whisper) share one pooled, rate-aware HTTP client.
+        self.http = http_client or GroqHTTPClient(api_key=self.api_key)
+        # gTTS is synchronous; run it on a bounded pool
+        # so a slow TTS call does not stall every other interview on this worker.
+        self.blocking_pool = BlockingIOPool(max_workers=blocking_pool_size, name="tts")
+        # Synthesized audio is cached by hash(text, voice settings); identical text is never re-synthesized.
+        self.tts_cache = tts_cache or TTSCache()
+        self._tts_inflight: Dict[str, AudioClip] = {}
+        # "gtts", or "stub" for load tests: silent audio after a fixed per-part delay, no network calls.
+        if tts_backend not in ("gtts", "stub"):
+            raise ValueError(f"Unknown TTS backend: {tts_backend}")
+        self.tts_backend = tts_backend
+        self.tts_stub_latency_seconds = tts_stub_latency_seconds
+        # Prompts carry a budgeted resume summary, normally precomputed once per session.
+        self.resume_summary_token_budget = resume_summary_token_budget
+        self.resume_summary_uses = 0
+        self.prompt_tokens_saved = 0
+        # Question prompts list a few topic keywords per previous question instead of the full texts;
+        # repetitions are caught locally (services/question_similarity.py) rather than by the prompt.
+        self.question_history_topics = question_history_topics
+        # Picks the fast or large model per call type and question type; without routes, every call uses the large model.
+        self.model_router = model_router or ModelRouter()
+
+        logger.debug("Initializing GroqService.", extra={"http2": self.http.http2, "max_inflight": self.http.max_inflight})
 
 
     async def _call_groq_llm_api(self, payload: Dict[str, Any], call_type: str) -> str:
         """
-        Helper method to make a request to the Groq LLM API using httpx.
+        Helper method to make a request to the Groq LLM API through the shared HTTP client
+        (rate limiting, in-flight cap and retries are handled there).
         """
-        headers = {
-            'Content-Type': 'application/json',
-            'Authorization': f'Bearer {self.api_key}'
-        }
+        estimated_tokens = estimate_request_tokens(payload)
 
-        print(f"--- Calling Groq LLM API for {call_type}...")
+        logger.debug("Calling Groq LLM API.", extra={"call_type": call_type})
         try:
-            response = await self.client.post(self.llm_model_url, headers=headers, json=payload)
-            response.raise_for_status()
+            with LLM_CALL_SECONDS.time(call_type=call_type, model=payload["model"]):
+                response = await self.http.post("chat/completions", estimated_tokens=estimated_tokens, json=payload)
             result = response.json()
-            print(f"--- Groq LLM API call for {call_type} successful.")
+            self._record_usage(call_type, payload["model"], estimated_tokens, result.get("usage"))
+            logger.debug("Groq LLM API call successful.", extra={"call_type": call_type})
 
             if result.get("choices") and result["choices"][0].get("message") and \
                result["choices"][0]["message"].get("content"):
                 return result["choices"][0]["message"]["content"]
             else:
-                print(f"Unexpected Groq LLM API response structure for {call_type}: {result}")
+                logger.error("Unexpected Groq LLM API response structure.", extra={"call_type": call_type, "payload": result})
                 return json.dumps(result) # Return the full JSON if structure is not as expected
         except httpx.HTTPStatusError as e:
-            print(f"HTTP error calling Groq LLM API for {call_type}: {e.response.status_code} - {e.response.text}")
+            LLM_ERRORS.inc(call_type=call_type, reason=f"http_{e.response.status_code}")
+            logger.error("HTTP error calling Groq LLM API.", extra={"call_type": call_type, "status": e.response.status_code, "detail": e.response.text})
             raise ConnectionError(f"Groq LLM API call failed with status {e.response.status_code}: {e.response.text}")
         except httpx.RequestError as e:
-            print(f"Request error calling Groq LLM API for {call_type}: {e}")
+            LLM_ERRORS.inc(call_type=call_type, reason="network")
+            logger.error("Request error calling Groq LLM API: %s", e, extra={"call_type": call_type})
             raise ConnectionError(f"Network or request error during Groq LLM API call: {e}")
         except Exception as e:
-            print(f"An unexpected error occurred during Groq LLM API call for {call_type}: {e}")
+            LLM_ERRORS.inc(call_type=call_type, reason="unexpected")
+            logger.exception("Unexpected error during Groq LLM API call.", extra={"call_type": call_type})
             raise
 
-    async def generate_content(self, prompt: str) -> str:
-        """Generates text content using Groq's LLM."""
+    def _record_usage(self, call_type: str, model: str, estimated_tokens: int, usage: Optional[Dict[str, Any]]):
+        """Counts reported token usage per call type and returns unused rate-limit budget."""
+        if not usage:
+            return
+        LLM_TOKENS.inc(usage.get("prompt_tokens", 0), call_type=call_type, kind="prompt")
+        LLM_TOKENS.inc(usage.get("completion_tokens", 0), call_type=call_type, kind="completion")
+        self.http.refund_tokens(model, estimated_tokens, usage.get("total_tokens"))
+
+    def resume_summary_text(self, resume_info: Dict[str, Any], domain: str,
+                            resume_summary: Optional[Dict[str, Any]] = None) -> str:
+        """
+        Returns the resume summary text for a prompt, building it if the session has none
+        precomputed, and counts the prompt tokens saved against the untrimmed summary.
+        """
+        if resume_summary is None:
+            resume_summary = build_resume_summary(resume_info, domain, self.resume_summary_token_budget)
+        self.resume_summary_uses += 1
+        self.prompt_tokens_saved += max(0, resume_summary["full_tokens"] - resume_summary["tokens"])
+        return resume_summary["text"]
+
+    def prompt_budget_stats(self) -> Dict[str, Any]:
+        return {
+            "token_budget": self.resume_summary_token_budget,
+            "summary_uses": self.resume_summary_uses,
+            "prompt_tokens_saved": self.prompt_tokens_saved,
+        }
+
+    async def _call_routed(self, payload: Dict[str, Any], call_type: str, question_type: Optional[str],
+                           validate: Optional[Callable[[str], Optional[str]]]) -> str:
+        """
+        Calls the model routed for call_type and question_type. On the fast route, an output that
+        validate rejects (it returns the reason) is regenerated by the large model.
+        """
+        router = self.model_router
+        route = router.route(call_type, question_type)
+        started = time.perf_counter()
+        content = await self._call_groq_llm_api({**payload, "model": router.model(route)}, call_type)
+        problem = validate(content) if validate is not None and router.should_validate(route) else None
+        if problem:
+            logger.info("Escalating LLM call to the large model.", extra={"call_type": call_type, "question_type": question_type, "reason": problem})
+            content = await self._call_groq_llm_api({**payload, "model": router.large_model}, call_type)
+        router.record(call_type, question_type, route, time.perf_counter() - started, problem)
+        return content
+
+    async def generate_content(self, prompt: str, call_type: str = "generate_content", question_type: Optional[str] = None,
+                               validate: Optional[Callable[[str], Optional[str]]] = None) -> str:
+        """Generates text content using Groq's LLM (the model routed for call_type and question_type)."""
         payload = {
-            "model": "llama3-70b-8192",
             "messages": [{"role": "user", "content": prompt}],
             "temperature": 0.7,
             "max_tokens": 500,
         }
-        return await self._call_groq_llm_api(payload, "generate_content")
+        return await self._call_routed(payload, call_type, question_type, validate)
 
-    async def generate_structured_response(self, prompt: str) -> str:
-        """Generates structured JSON response using Groq's LLM."""
+    async def generate_structured_response(self, prompt: str, call_type: str = "generate_structured_response",
+                                           question_type: Optional[str] = None, required_keys: Sequence[str] = (),
+                                           numeric_keys: Sequence[str] = ()) -> str:
+        """
+        Generates structured JSON response using Groq's LLM. On the fast route, a response that is not
+        a JSON object with required_keys (numeric_keys convertible to float) is regenerated by the large model.
+        """
         payload = {
-            "model": "llama3-70b-8192",
             "messages": [{"role": "user", "content": prompt}],
             "temperature": 0.7,
             "max_tokens": 1500,
             "response_format": { "type": "json_object" }
         }
-        return await self._call_groq_llm_api(payload, "generate_structured_response")
+        return await self._call_routed(payload, call_type, question_type,
+                                       lambda content: json_problem(content, required_keys, numeric_keys))
 
-    async def generate_question(self, resume_info: Dict[str, Any], domain: str,
-                                previous_questions: List[Dict[str, Any]]) -> str:
+    async def _stream_routed(self, prompt: str, call_type: str, question_type: Optional[str],
+                             validate: Optional[Callable[[str, bool], Optional[str]]] = None,
+                             opening_chars: int = 0) -> AsyncIterator[str]:
         """
-        Generates an interview question using Groq's LLM based on resume, domain,
-        interview stage (inferred from previous_questions count), and history.
+        Streams from the model routed for call_type and question_type. On the fast route with validate,
+        the first opening_chars of text are held back and checked (validate(text, complete=False)), as is a
+        completion shorter than that; a rejected output is dropped and streamed again from the large model.
+        Text already forwarded cannot be taken back, so the rest of the completion is not validated.
+        """
+        router = self.model_router
+        route = router.route(call_type, question_type)
+        check = validate if validate is not None and router.should_validate(route) else None
+        started = time.perf_counter()
+        held: Optional[List[str]] = [] if check is not None else None
+        problem = None
+        stream = self.stream_content(prompt, call_type, model=router.model(route))
+        try:
+            async for delta in stream:
+                if held is None:
+                    yield delta
+                    continue
+                held.append(delta)
+                opening = "".join(held)
+                if len(opening) >= opening_chars:
+                    problem = check(opening, False)
+                    if problem:
+                        break
+                    held = None
+                    yield opening
+        finally:
+            await stream.aclose()
+        if held is not None and not problem:
+            opening = "".join(held)
+            problem = check(opening, True)
+            if not problem and opening:
+                yield opening
+        if problem:
+            logger.info("Escalating streamed LLM call to the large model.", extra={"call_type": call_type, "question_type": question_type, "reason": problem})
+            stream = self.stream_content(prompt, call_type, model=router.large_model)
+            try:
+                async for delta in stream:
+                    yield delta
+            finally:
+                await stream.aclose()
+        router.record(call_type, question_type, route, time.perf_counter() - started, problem)
+
+    async def stream_content(self, prompt: str, call_type: str = "stream_content", model: Optional[str] = None) -> AsyncIterator[str]:
         """
-        resume_summary = f"""
-        Candidate Name: {resume_info.get('name', 'N/A')}
-        Experience: {resume_info.get('experience', 'N/A')}
-        Skills: {', '.join(resume_info.get('skills', []))}
-        Projects: {json.dumps(resume_info.get('projects', []))}
-        Education: {resume_info.get('education', 'N/A')}
+        Generates text content using Groq's LLM, yielding the text deltas as the
+        completion is streamed (server-sent events) instead of waiting for all of it.
+        model defaults to the router's large model.
         """
+        payload = {
+            "model": model or self.model_router.large_model,
+            "messages": [{"role": "user", "content": prompt}],
+            "temperature": 0.7,
+            "max_tokens": 500,
+            "stream": True,
+        }
+        estimated_tokens = estimate_request_tokens(payload)
+
+        logger.debug("Streaming Groq LLM API.", extra={"call_type": call_type})
+        started = time.perf_counter()
+        try:
+            async with self.http.request("chat/completions", estimated_tokens=estimated_tokens,
+                                         stream=True, json=payload) as response:
+                async for line in response.aiter_lines():
+                    if not line.startswith("data:"):
+                        continue
+                    data = line[len("data:"):].strip()
+                    if data == "[DONE]":
+                        break
+                    event = json.loads(data)
+                    self._record_usage(call_type, payload["model"], estimated_tokens, (event.get("x_groq") or {}).get("usage") or event.get("usage"))
+                    for choice in event.get("choices") or []:
+                        delta = (choice.get("delta") or {}).get("content")
+                        if delta:
+                            yield delta
+            LLM_CALL_SECONDS.observe(time.perf_counter() - started, call_type=call_type, model=payload["model"])
+            logger.debug("Groq LLM API stream finished.", extra={"call_type": call_type})
+        except httpx.HTTPStatusError as e:
+            LLM_ERRORS.inc(call_type=call_type, reason=f"http_{e.response.status_code}")
+            logger.error("HTTP error streaming Groq LLM API.", extra={"call_type": call_type, "status": e.response.status_code, "detail": e.response.text})
+            raise ConnectionError(f"Groq LLM API call failed with status {e.response.status_code}: {e.response.text}")
+        except httpx.RequestError as e:
+            LLM_ERRORS.inc(call_type=call_type, reason="network")
+            logger.error("Request error streaming Groq LLM API: %s", e, extra={"call_type": call_type})
+            raise ConnectionError(f"Network or request error during Groq LLM API call: {e}")
 
-        previous_q_texts = [q['text'] for q in previous_questions]
-        previous_q_str = "\n".join(f"- {q}" for q in previous_q_texts) if previous_q_texts else "None"
+    def previous_questions_text(self, previous_questions: List[Dict[str, Any]]) -> str:
+        """Prompt section listing the interview history: full question texts, or a few topic keywords per question."""
+        if not self.question_history_topics:
+            previous_q_texts = [q['text'] for q in previous_questions]
+            previous_q_str = "\n".join(f"- {q}" for q in previous_q_texts) if previous_q_texts else "None"
+            return f"""Previous questions asked so far in this interview (avoid asking these or very similar ones again):
+        {previous_q_str}"""
+        topic_lines = []
+        for i, q in enumerate(previous_questions):
+            topics = "self-introduction and resume walkthrough" if q.get("type") == "generic_intro" else question_topics(q["text"])
+            topic_lines.append(f"- Q{i+1} ({q.get('type', 'N/A')}): {topics}")
+        topic_str = "\n        ".join(topic_lines) if topic_lines else "None"
+        return f"""Topics already covered in this interview (do not ask about these again or rephrase an earlier question):
+        {topic_str}"""
+
+    def build_question_prompt(self, resume_info: Dict[str, Any], domain: str,
+                              previous_questions: List[Dict[str, Any]],
+                              resume_summary: Optional[Dict[str, Any]] = None,
+                              rejected_question: Optional[str] = None, similar_to: Optional[str] = None) -> str:
+        """
+        Builds the question generation prompt based on resume, domain,
+        interview stage (inferred from previous_questions count), and history.
+        rejected_question (with the asked question it nearly repeated, similar_to) asks for a regeneration on another topic.
+        """
+        resume_summary_text = self.resume_summary_text(resume_info, domain, resume_summary)
+        previous_questions_section = self.previous_questions_text(previous_questions)
 
         num_previous_questions = len(previous_questions)
         # The first question ("Tell me about yourself") is hardcoded in dakshy.py's start_interview.
@@ -210,10 +399,9 @@ class GroqService:
         Your goal is to assess the candidate thoroughly by asking a sequence of relevant and progressively challenging questions.
 
         Candidate's Summarized Resume Information:
-        {resume_summary}
+        {resume_summary_text}
 
-        Previous questions asked so far in this interview (avoid asking these or very similar ones again):
-        {previous_q_str}
+        {previous_questions_section}
 
         You are now about to ask the {num_previous_questions + 1}th question in this interview.
         This question should be: {question_type_description}
@@ -225,36 +413,62 @@ class GroqService:
         1. Clarity and Conciseness: The question must be absolutely clear, concise, and unambiguous.
         2. Open-Ended: Frame questions to encourage detailed and thoughtful answers, not simple yes/no responses.
         3. Relevance: Ensure the question is highly relevant to the candidate's profile (resume), the {domain} domain, and the current stage of a professional interview.
-        4. NO REPETITION: CRITICALLY IMPORTANT - DO NOT repeat any question from the "Previous questions asked so far" list, or a very close variation of it. Check carefully.
+        4. NO REPETITION: CRITICALLY IMPORTANT - DO NOT repeat any previous question or topic listed above, or a very close variation of it. Check carefully.
         5. Output Format: Generate ONLY the question text itself. Do NOT include any surrounding conversational text, preambles like "Okay, for your next question:", or any markdown/formatting. Just the raw question.
         6. Professional Tone: Maintain a consistently professional, respectful, and courteous tone throughout.
         7. Progression: Questions should generally progress in depth or type as the interview proceeds, following standard interview structures.
         """
-        print(f"Prompting LLM for question (type: {question_type_tag}, stage {num_previous_questions + 1}): {prompt_instruction[:100]}...")
-        generated_text = await self.generate_content(prompt)
-        # The Question model in interview_models.py has a 'type' field.
-        # We can return a dict or ensure the Question model is updated accordingly.
-        # For now, just returning the text as per existing signature.
-        # The 'type' of question can be added to the Question object in dakshy.py
-        # using the question_type_tag defined above.
-        return generated_text.strip() # Ensure no leading/trailing whitespace
+        if rejected_question:
+            prompt += f"""
+        Your first draft for this question was rejected because it nearly repeats a question already asked in this interview.
+        Rejected draft: "{rejected_question}"
+        Already asked: "{similar_to}"
+        Ask about a clearly different topic, skill or project this time.
+        """
+        logger.info("Prompting LLM for question.", extra={"question_type": question_type_tag, "stage": num_previous_questions + 1,
+                                                          "regeneration": rejected_question is not None})
+        return prompt
 
-    async def evaluate_answer(self, question: str, answer_transcript: str, resume_info: Dict[str, Any], domain: str) -> Dict[str, Any]:
-        """Evaluates a candidate's answer using Groq's LLM."""
-        resume_summary = f"""
-        Candidate Name: {resume_info.get('name', 'N/A')}
-        Experience: {resume_info.get('experience', 'N/A')}
-        Skills: {', '.join(resume_info.get('skills', []))}
-        Projects: {json.dumps(resume_info.get('projects', []))}
-        Education: {resume_info.get('education', 'N/A')}
+    async def generate_question(self, resume_info: Dict[str, Any], domain: str,
+                                previous_questions: List[Dict[str, Any]],
+                                resume_summary: Optional[Dict[str, Any]] = None,
+                                rejected_question: Optional[str] = None, similar_to: Optional[str] = None,
+                                question_type: Optional[str] = None) -> str:
+        """
+        Generates an interview question using Groq's LLM (see build_question_prompt).
+        question_type (the tag of the question being generated) selects the model route.
         """
+        prompt = self.build_question_prompt(resume_info, domain, previous_questions, resume_summary, rejected_question, similar_to)
+        generated_text = await self.generate_content(prompt, "generate_question", question_type, validate=question_problem)
+        # The 'type' of question is added to the Question object in dakshy.py.
+        return generated_text.strip() # Ensure no leading/trailing whitespace
+
+    async def stream_question(self, resume_info: Dict[str, Any], domain: str,
+                              previous_questions: List[Dict[str, Any]],
+                              resume_summary: Optional[Dict[str, Any]] = None,
+                              rejected_question: Optional[str] = None, similar_to: Optional[str] = None,
+                              question_type: Optional[str] = None) -> AsyncIterator[str]:
+        """Like generate_question, but yields the question text as it is generated."""
+        prompt = self.build_question_prompt(resume_info, domain, previous_questions, resume_summary, rejected_question, similar_to)
+        stream = self._stream_routed(prompt, "stream_question", question_type, validate=question_problem,
+                                     opening_chars=QUESTION_OPENING_CHARS)
+        try:
+            async for delta in stream:
+                yield delta
+        finally:
+            await stream.aclose()
+
+    def build_evaluation_prompt(self, question: str, answer_transcript: str, resume_info: Dict[str, Any], domain: str,
+                                output_instruction: str, resume_summary: Optional[Dict[str, Any]] = None) -> str:
+        """Builds the answer evaluation prompt; output_instruction describes the expected output format."""
+        resume_summary_text = self.resume_summary_text(resume_info, domain, resume_summary)
 
         prompt = f"""
         You are an AI Interviewer evaluating an answer for a {domain} role.
         Here is the question asked: "{question}"
         Here is the candidate's transcribed answer: "{answer_transcript}"
         Here is the candidate's summarized resume information for context:
-        {resume_summary}
+        {resume_summary_text}
 
         Please provide:
         1.  Detailed, constructive feedback on the answer. Consider:
@@ -269,21 +483,24 @@ class GroqService:
             and 0.0 is completely irrelevant, silent, or nonsensical.
             If the answer was effectively silent or extremely short due to a timeout or no input, assign a very low score (e.g., 0.0 to 0.2).
 
-        Provide the output as a JSON object with the following keys:
-        {{
+        {output_instruction}
+        """
+        return prompt
+
+    async def evaluate_answer(self, question: str, answer_transcript: str, resume_info: Dict[str, Any], domain: str,
+                              resume_summary: Optional[Dict[str, Any]] = None, question_type: Optional[str] = None) -> Dict[str, Any]:
+        """Evaluates a candidate's answer using Groq's LLM (question_type selects the model route)."""
+        prompt = self.build_evaluation_prompt(question, answer_transcript, resume_info, domain, output_instruction="""Provide the output as a JSON object with the following keys:
+        {
             "feedback": "string (detailed, constructive feedback)",
             "score": "float (0.0 to 1.0, rounded to one decimal place)"
-        }}
-        """
-        print(f"Prompting LLM for answer evaluation: {question[:50]}...")
-        response_json_str = await self.generate_structured_response(prompt)
+        }""", resume_summary=resume_summary)
+        logger.info("Prompting LLM for answer evaluation.")
+        response_json_str = await self.generate_structured_response(prompt, "evaluate_answer", question_type,
+                                                                    required_keys=("feedback", "score"), numeric_keys=("score",))
         try:
-            # Clean the response string: remove markdown JSON block fences if present
-            if response_json_str.startswith("```json"):
-                response_json_str = response_json_str[len("```json"):]
-            if response_json_str.endswith("```"):
-                response_json_str = response_json_str[:-len("```")]
-            response_json_str = response_json_str.strip()
+            # Same fence handling as the validator, so both see the same JSON
+            response_json_str = strip_json_fences(response_json_str)
 
             eval_data = json.loads(response_json_str)
             # Ensure score is a float and within bounds
@@ -300,19 +517,50 @@ class GroqService:
                 "score": score
             }
         except json.JSONDecodeError as e:
-            print(f"Failed to parse answer evaluation JSON: {e} | Raw response: {response_json_str}")
+            logger.error("Failed to parse answer evaluation JSON: %s", e, extra={"payload": response_json_str})
             return {"feedback": f"Could not parse evaluation feedback from AI. Raw response: {response_json_str}", "score": 0.0}
         except Exception as e:
-            print(f"Error in evaluate_answer processing: {e}")
+            logger.exception("Error in evaluate_answer processing.")
             return {"feedback": f"An error occurred during evaluation processing: {e}", "score": 0.0}
 
-    async def get_overall_evaluation(self, interview_history: List[Dict[str, Any]], resume_info: Dict[str, Any], domain: str) -> Dict[str, str]:
-        """Generates an overall interview evaluation report using Groq's LLM."""
+    async def stream_evaluation(self, question: str, answer_transcript: str, resume_info: Dict[str, Any],
+                                domain: str, resume_summary: Optional[Dict[str, Any]] = None,
+                                question_type: Optional[str] = None) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Streaming variant of evaluate_answer. The LLM writes plain-text feedback followed by a
+        final "SCORE: <0.0-1.0>" line, so the feedback can be forwarded while it is generated.
+        The score only arrives at the end, after the feedback was forwarded, so this call is never escalated.
+        Yields {"feedback_delta": str} items, then one {"feedback": str, "score": float} item.
+        """
+        prompt = self.build_evaluation_prompt(question, answer_transcript, resume_info, domain, output_instruction="""Output format: write the feedback as plain text (no JSON, no markdown headings).
+        Then, on the very last line, write the score exactly as: SCORE: <number from 0.0 to 1.0>""", resume_summary=resume_summary)
+        logger.info("Prompting LLM for streamed answer evaluation.")
+        parser = TrailingScoreParser()
+        feedback_parts = []
+        async for delta in self._stream_routed(prompt, "stream_evaluation", question_type):
+            feedback_delta = parser.feed(delta)
+            if feedback_delta:
+                feedback_parts.append(feedback_delta)
+                yield {"feedback_delta": feedback_delta}
+        feedback_tail = parser.finish()
+        if feedback_tail:
+            feedback_parts.append(feedback_tail)
+            yield {"feedback_delta": feedback_tail}
+
+        feedback = "".join(feedback_parts).strip() or "No feedback generated or feedback was not in the expected format."
+        if parser.score is None:
+            logger.warning("Streamed answer evaluation had no SCORE line; defaulting the score to 0.0.")
+        # Round score to one decimal place
+        score = round(max(0.0, min(1.0, parser.score or 0.0)), 1)
+        yield {"feedback": feedback, "score": score}
+
+    def interview_history_text(self, interview_history: List[Dict[str, Any]]) -> str:
+        """Every question, answer, feedback and score of the interview (the full-history prompt section)."""
         history_str = ""
         total_score = 0.0
         num_answers = 0
         for i, entry in enumerate(interview_history):
-            history_str += f"--- Question {i+1} ({entry.get('type', 'N/A')}) ---\n" # Added question type
+            history_str += f"--- Question {i+1} ({entry.get('question_type', entry.get('type', 'N/A'))}) ---\n" # Added question type
             history_str += f"Q: {entry.get('question_text', 'N/A')}\n"
             history_str += f"A: {entry.get('answer_transcript', 'No answer')}\n"
             history_str += f"Feedback on A: {entry.get('feedback', 'No feedback')}\n"
@@ -326,26 +574,34 @@ class GroqService:
             num_answers +=1
 
         average_score_str = f"{total_score / num_answers:.1f}/1.0" if num_answers > 0 else "N/A"
+        return f"""Interview History (Questions with types, Candidate's Answers, Feedback, Scores):
+        {history_str}
+        Average Score Across All Answers: {average_score_str}"""
 
-
-        resume_summary = f"""
-        Candidate Name: {resume_info.get('name', 'N/A')}
-        Experience: {resume_info.get('experience', 'N/A')}
-        Skills: {', '.join(resume_info.get('skills', []))}
-        Projects: {json.dumps(resume_info.get('projects', []))}
-        Education: {resume_info.get('education', 'N/A')}
+    async def get_overall_evaluation(self, interview_history: List[Dict[str, Any]], resume_info: Dict[str, Any], domain: str,
+                                     resume_summary: Optional[Dict[str, Any]] = None,
+                                     running_evaluation: Optional[Dict[str, Any]] = None) -> Dict[str, str]:
+        """
+        Generates an overall interview evaluation report using Groq's LLM.
+        With running_evaluation (see services/evaluation_summary.py), the prompt holds the aggregates kept
+        after each answer instead of the full history, so its size does not grow with the interview.
         """
+        if running_evaluation is not None:
+            history_section = f"""Interview Summary (aggregated after each answer: scores per question type, strongest and weakest answers):
+        {running_evaluation_text(running_evaluation)}"""
+        else:
+            history_section = self.interview_history_text(interview_history)
+
+        resume_summary_text = self.resume_summary_text(resume_info, domain, resume_summary)
 
         prompt = f"""
         You are an AI Interviewer tasked with providing a comprehensive overall evaluation for a candidate who has completed an interview for a {domain} role.
-        Base your evaluation on their summarized resume and the detailed interview history provided below, including the types of questions asked.
+        Base your evaluation on their summarized resume and the interview results provided below, including the types of questions asked.
 
         Candidate Resume Summary:
-        {resume_summary}
+        {resume_summary_text}
 
-        Interview History (Questions with types, Candidate's Answers, Feedback, Scores):
-        {history_str}
-        Average Score Across All Answers: {average_score_str}
+        {history_section}
 
         Please provide your final evaluation as a JSON object with three keys:
         1.  "overall_performance": A concise (2-4 sentences) summary of the candidate's performance.
@@ -365,15 +621,12 @@ class GroqService:
         }}
         Ensure the output is valid JSON. For weak_points and improvements, use newline characters (\\n) to separate bullet points if you want them on new lines in the string.
         """
-        print(f"Prompting LLM for overall evaluation...")
-        response_json_str = await self.generate_structured_response(prompt)
+        logger.info("Prompting LLM for overall evaluation.")
+        response_json_str = await self.generate_structured_response(prompt, "overall_evaluation",
+                                                                    required_keys=("overall_performance", "weak_points", "improvements"))
         try:
-            # Clean the response string: remove markdown JSON block fences if present
-            if response_json_str.startswith("```json"):
-                response_json_str = response_json_str[len("```json"):]
-            if response_json_str.endswith("```"):
-                response_json_str = response_json_str[:-len("```")]
-            response_json_str = response_json_str.strip()
+            # Same fence handling as the validator, so both see the same JSON
+            response_json_str = strip_json_fences(response_json_str)
 
             eval_data = json.loads(response_json_str)
             return {
@@ -382,71 +635,115 @@ class GroqService:
                 "improvements": eval_data.get("improvements", "Error generating improvement suggestions.")
             }
         except json.JSONDecodeError as e:
-            print(f"Failed to parse overall evaluation JSON: {e} | Raw response: {response_json_str}")
+            logger.error("Failed to parse overall evaluation JSON: %s", e, extra={"payload": response_json_str})
             return {
                 "overall_performance": f"Error parsing overall evaluation from AI. Raw response: {response_json_str}",
                 "weak_points": "Could not parse.",
                 "improvements": "Could not parse."
             }
         except Exception as e:
-            print(f"Error in get_overall_evaluation processing: {e}")
+            logger.exception("Error in get_overall_evaluation processing.")
             return {
                 "overall_performance": f"An error occurred during overall evaluation processing: {e}",
                 "weak_points": "Error.",
                 "improvements": "Error."
             }
 
-    async def text_to_speech(self, text: str) -> str:
+    def _stub_tts_parts(self, text: str) -> Iterator[bytes]:
+        """Stand-in for gTTS: one silent MP3 part per started 100 characters (gTTS's request size)."""
+        for _ in range(max(1, -(-len(text) // 100))):
+            time.sleep(self.tts_stub_latency_seconds)
+            yield STUB_MP3_FRAME
+
+    def _tts_parts(self, text: str) -> Iterator[bytes]:
+        """Blocking iterator over the MP3 parts of text. Each next() must run on the blocking pool."""
+        if self.tts_backend == "stub":
+            return self._stub_tts_parts(text)
+        return gTTS(text=text, lang=TTS_LANG, slow=TTS_SLOW, tld=TTS_TLD).stream()
+
+    async def _synthesize_into_clip(self, key: str, text: str, clip: AudioClip):
         """
-        Converts text to speech using gTTS.
-        Returns base64 encoded audio.
+        Synthesizes text into clip part by part and caches the result. Runs as its own task, shared
+        by every stream_speech call for the same text, so a cancelled reader does not cut it short.
         """
-        print(f"--- Calling gTTS for text: '{text[:50]}...'")
         try:
-            tts = gTTS(text=text, lang='en', slow=False)
-            audio_buffer = io.BytesIO()
-            # gTTS write_to_fp is synchronous, so no await needed here.
-            tts.write_to_fp(audio_buffer)
-            audio_buffer.seek(0) # Rewind the buffer to the beginning
-            audio_bytes = audio_buffer.read()
-            print(f"--- gTTS call successful. Generated {len(audio_bytes)} bytes of audio.")
-            return base64.b64encode(audio_bytes).decode('utf-8')
+            self.tts_cache.record_miss()
+            logger.debug("Streaming gTTS.", extra={"chars": len(text)})
+            parts = self._tts_parts(text)
+            while True:
+                # Each part is a blocking HTTP request, so it is fetched on the blocking pool.
+                part = await self.blocking_pool.run(next, parts, None)
+                if part is None:
+                    break
+                await clip.append(part)
+            logger.debug("gTTS stream finished.", extra={"bytes": sum(len(chunk) for chunk in clip.chunks)})
+            audio_bytes = b"".join(clip.chunks)
+            if not audio_bytes:
+                raise RuntimeError("gTTS returned no audio.")
+            self.tts_cache.put(key, audio_bytes)
+            # Only complete syntheses are persisted; a failed one must not be served from disk later.
+            if self.tts_cache.disk_dir:
+                await self.blocking_pool.run(self.tts_cache.write_to_disk, key, audio_bytes)
+        except asyncio.CancelledError:
+            clip.error = RuntimeError("Speech synthesis was cancelled.")
+            raise
         except Exception as e:
-            print(f"An error occurred during gTTS call: {e}")
-            # Fallback to a dummy audio if gTTS fails
-            dummy_mp3_base64 = "SUQzBAAAAAAAI1RTU1QAAAAAAAAAAAPkAAAAAAAAAAAAAAAAAAAAAAD/4xj/AQIAAAATc3RhbmRhcmQxAAAAAExhdmY1NC42My4xMDAAAAA///+7hAwAAAAAAAAAAAAAAADIzMDcBAwAAD0pVAACgQhQYAAAFFAAAAP//BIEAE0lTQUQgVkxYAAABAAACgSE4c+jRFAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAIYgAAAGoAAAEAACAFIAAAAACAAANsAAAABAAAAzAAAAB/Q/vLwL//jGP8BAgAAABNzdGFuZGFyZDEAAABMdmFmNTQuNjMuMTAwAAAAAAAAAAD///7uEDAAAAAAAAAAAAAAAADIzMDcBAwAAD0pVAACgQhQYAAAFFAAAAP//BIEAE0lTQUQgVkxYAAABAAACgSE4c+jRFAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAIYgAAAGoAAAEAACAFIAAAAACAAANsAAAABAAAAzAAAAB/Q/vLwL"
-            print("--- Falling back to dummy TTS audio due to error. ---")
-            return dummy_mp3_base64
+            clip.error = e
+        finally:
+            del self._tts_inflight[key]
+            await clip.finish()
+
+    async def stream_speech(self, text: str) -> AsyncIterator[bytes]:
+        """
+        Yields MP3 chunks for text as gTTS produces them (one per gTTS text part),
+        so playback can start before the whole text is synthesized.
+        Cached clips are yielded in one piece; a fresh synthesis is cached once complete.
+        Concurrent requests for the same text share a single synthesis.
+        Raises RuntimeError if gTTS fails; failed syntheses are not cached.
+        """
+        key = tts_cache_key(text, lang=TTS_LANG, slow=TTS_SLOW, tld=TTS_TLD)
+        audio_bytes = self.tts_cache.get(key)
+        if audio_bytes is None and key not in self._tts_inflight and self.tts_cache.disk_dir:
+            audio_bytes = await self.blocking_pool.run(self.tts_cache.get_from_disk, key)
+        if audio_bytes is not None:
+            yield audio_bytes
+            return
+
+        clip = self._tts_inflight.get(key)
+        if clip is None:
+            clip = AudioClip()
+            self._tts_inflight[key] = clip
+            clip.producer_task = asyncio.create_task(self._synthesize_into_clip(key, text, clip))
+        async for chunk in clip.iter_chunks():
+            yield chunk
+        if clip.error is not None:
+            raise RuntimeError(f"Speech synthesis failed: {clip.error}") from clip.error
 
 
     async def speech_to_text(self, audio_content: bytes) -> str:
         """
         Converts audio content to text using Groq's Whisper API.
-        Expects audio_content as bytes.
+        Expects audio_content as bytes (WAV, Ogg or WebM; the file type is detected from its header).
         Uses the 'whisper-large-v3' model.
         """
-        print(f"--- Calling Groq STT (Whisper) API for {len(audio_content)} bytes of audio...")
+        filename, content_type = audio_file_type(audio_content)
+        logger.debug("Calling Groq STT (Whisper) API.", extra={"bytes": len(audio_content), "content_type": content_type})
 
         try:
-            # Create a file-like object from the bytes
-            # Groq SDK expects a tuple: (filename, file_content_bytes, content_type)
-            # For BytesIO, filename is often needed.
-            audio_file_tuple = ("audio.webm", audio_content, "audio/webm")
-
-
-            transcription = self.groq_client.audio.transcriptions.create(
-                file=audio_file_tuple, # Pass the tuple here
-                model="whisper-large-v3",
-                # You can add more parameters like language if needed
-                # language="en"
+            # Multipart upload to the OpenAI-compatible transcription endpoint, sharing
+            # the LLM calls' connection pool, rate limiter and in-flight cap.
+            response = await self.http.post(
+                "audio/transcriptions",
+                files={"file": (filename, audio_content, content_type)},
+                data={"model": "whisper-large-v3", "response_format": "json"},
             )
-            print(f"--- Groq STT API call successful. Transcription: '{transcription.text[:50]}...'")
-            return transcription.text
+            transcription_text = response.json()["text"]
+            logger.debug("Groq STT API call successful.", extra={"chars": len(transcription_text)})
+            return transcription_text
         except Exception as e:
-            print(f"Error calling Groq STT API: {e}")
+            STT_ERRORS.inc()
             # Consider more specific error handling if Groq API returns structured errors
-            if hasattr(e, 'response') and hasattr(e.response, 'text'):
-                print(f"Groq API Error details: {e.response.text}")
-            print("--- Falling back to simulated STT transcription due to error. ---")
+            detail = e.response.text if hasattr(e, 'response') and hasattr(e.response, 'text') else None
+            logger.error("Groq STT API call failed, falling back to simulated transcription: %s", e, extra={"detail": detail})
             return "This is a simulated transcription of your speech due to an error with the STT service."
 
@@ -0,0 +1,245 @@
+# metrics.py
+import bisect
+import contextlib
+import time
+from abc import ABC, abstractmethod
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+# Latency buckets (seconds) sized for LLM / STT / TTS calls.
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+# Payload buckets (bytes): from small JSON bodies to multi-megabyte uploads.
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class _Metric(ABC):
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+
+    def _key(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    @abstractmethod
+    def samples(self) -> List[str]:
+        raise NotImplementedError
+
+    def render(self) -> str:
+        header = f"# HELP {self.name} {self.documentation}\n# TYPE {self.name} {self.kind}\n"
+        return header + "".join(line + "\n" for line in self.samples())
+
+
+class Counter(_Metric):
+    """Monotonic counter with optional labels."""
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str):
+        key = self._key(labels)
+        self._values[key] = self._values.get(key, 0.0) + amount
+
+    def samples(self) -> List[str]:
+        return [f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+                for key, value in sorted(self._values.items())]
+
+
+class Gauge(_Metric):
+    """Gauge with optional labels; usually set right before a scrape."""
+    kind = "gauge"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def set(self, value: float, **labels: str):
+        self._values[self._key(labels)] = value
+
+    def inc(self, amount: float = 1.0, **labels: str):
+        key = self._key(labels)
+        self._values[key] = self._values.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1.0, **labels: str):
+        self.inc(-amount, **labels)
+
+    def samples(self) -> List[str]:
+        return [f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+                for key, value in sorted(self._values.items())]
+
+
+class Histogram(_Metric):
+    """
+    Cumulative histogram. observe() is a bisect and three additions, so it is cheap
+    enough for the request hot path; cumulative bucket counts are only built on scrape.
+    """
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._series: Dict[Tuple[str, ...], List[float]] = {} # per-bucket counts + [sum, count]
+
+    def observe(self, value: float, **labels: str):
+        key = self._key(labels)
+        series = self._series.get(key)
+        if series is None:
+            series = self._series[key] = [0.0] * (len(self.buckets) + 3)
+        series[bisect.bisect_left(self.buckets, value)] += 1
+        series[-2] += value
+        series[-1] += 1
+
+    @contextlib.contextmanager
+    def time(self, **labels: str) -> Iterator[None]:
+        """Observes the duration of the with-block, also when it raises."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    def samples(self) -> List[str]:
+        lines = []
+        for key, series in sorted(self._series.items()):
+            cumulative = 0.0
+            for bound, count in zip(self.buckets + (float("inf"),), series):
+                cumulative += count
+                le = f'le="{_format_value(bound)}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} {_format_value(cumulative)}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labelnames, key)} {_format_value(series[-2])}")
+            lines.append(f"{self.name}_count{_format_labels(self.labelnames, key)} {_format_value(series[-1])}")
+        return lines
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+
+    def register(self, metric: _Metric) -> _Metric:
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric {metric.name} is already registered.")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self.register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self.register(Gauge(name, documentation, labelnames))
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = LATENCY_BUCKETS) -> Histogram:
+        return self.register(Histogram(name, documentation, labelnames, buckets))
+
+    def render(self) -> str:
+        """Prometheus text exposition format (version 0.0.4)."""
+        return "".join(metric.render() for metric in self._metrics.values())
+
+
+REGISTRY = MetricsRegistry()
+
+# Pipeline stages: upload_read, vad, stt, stt_segment, evaluation, question_generation, tts, transcode, overall_evaluation,
+# session_update, serialization, resume_extraction, resume_local, resume_llm.
+STAGE_SECONDS = REGISTRY.histogram(
+    "interview_stage_duration_seconds", "Duration of interview pipeline stages.", ["stage"])
+TIME_TO_FIRST_AUDIO_SECONDS = REGISTRY.histogram(
+    "interview_time_to_first_audio_seconds", "Time from the start of question generation to its first audio chunk.", ["mode"])
+HTTP_REQUEST_SECONDS = REGISTRY.histogram(
+    "http_request_duration_seconds", "HTTP request duration until the response start.", ["method", "route", "status"])
+PAYLOAD_BYTES = REGISTRY.histogram(
+    "interview_payload_bytes", "Size of uploaded and generated payloads.", ["kind"], buckets=SIZE_BUCKETS)
+WEBSOCKET_SEND_WAIT_SECONDS = REGISTRY.histogram(
+    "interview_websocket_send_wait_seconds", "Time a WebSocket message waited for a full send queue (client reading slowly).")
+
+LLM_CALL_SECONDS = REGISTRY.histogram(
+    "groq_llm_call_duration_seconds", "Groq chat completion latency (including retries), by call type and model.", ["call_type", "model"])
+LLM_ROUTE_SECONDS = REGISTRY.histogram(
+    "groq_llm_route_duration_seconds", "LLM call latency per route (fast/large model), including escalations to the large model.",
+    ["call_type", "question_type", "route"])
+LLM_ESCALATIONS = REGISTRY.counter(
+    "groq_llm_escalations_total", "Fast-model outputs that failed validation and were regenerated by the large model.",
+    ["call_type", "question_type", "reason"])
+LLM_TOKENS = REGISTRY.counter(
+    "groq_llm_tokens_total", "Tokens reported by Groq usage, by call type.", ["call_type", "kind"])
+LLM_ERRORS = REGISTRY.counter(
+    "groq_llm_errors_total", "Failed Groq LLM calls, by call type and reason.", ["call_type", "reason"])
+STT_ERRORS = REGISTRY.counter(
+    "groq_stt_errors_total", "Failed Whisper transcriptions (answered with the fallback transcript).")
+QUESTION_BANK_LOOKUPS = REGISTRY.counter(
+    "interview_question_bank_lookups_total", "Question bank lookups by question type and result (hit/miss).", ["question_type", "result"])
+VAD_RESULTS = REGISTRY.counter(
+    "interview_vad_results_total", "Voice activity detection on answer audio, by result (speech/silent/undecoded).", ["result"])
+QUESTION_DUPLICATES = REGISTRY.counter(
+    "interview_question_duplicates_total", "Questions rejected as near-duplicates of an asked question, by source (llm/bank).", ["source"])
+
+SESSIONS_ACTIVE = REGISTRY.gauge(
+    "interview_sessions_active", "Interview sessions in the session store (all workers' with the Redis backend).")
+WEBSOCKETS_ACTIVE = REGISTRY.gauge(
+    "interview_websockets_active", "Open interview WebSocket connections.")
+TURNS_IN_FLIGHT = REGISTRY.gauge(
+    "interview_turns_in_flight", "Answer submissions currently being processed.")
+AUDIO_CLIPS_IN_PROGRESS = REGISTRY.gauge(
+    "interview_audio_clips_in_progress", "Question audio clips still being synthesized.")
+GROQ_INFLIGHT = REGISTRY.gauge(
+    "groq_http_inflight_requests", "Groq HTTP requests in flight.")
+BLOCKING_POOL_QUEUED = REGISTRY.gauge(
+    "blocking_pool_queued_calls", "Calls waiting for a blocking I/O (gTTS) thread.")
+
+
+class HTTPMetricsMiddleware:
+    """
+    Pure ASGI middleware recording request duration by route template and status.
+    Measures until the response starts, so streamed bodies do not count.
+    """
+    def __init__(self, app, histogram: Histogram = HTTP_REQUEST_SECONDS, skip_paths: Sequence[str] = ("/metrics",)):
+        self.app = app
+        self.histogram = histogram
+        self.skip_paths = set(skip_paths)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] in self.skip_paths:
+            await self.app(scope, receive, send)
+            return
+        started = time.perf_counter()
+        status: Optional[int] = None
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                route = scope.get("route")
+                self.histogram.observe(time.perf_counter() - started, method=scope["method"],
+                                       route=getattr(route, "path", "unmatched"), status=str(status))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        except Exception:
+            if status is None:
+                route = scope.get("route")
+                self.histogram.observe(time.perf_counter() - started, method=scope["method"],
+                                       route=getattr(route, "path", "unmatched"), status="500")
+            raise
@@ -0,0 +1,140 @@
+# model_router.py
+import json
+import logging
+from typing import Any, Dict, Optional, Sequence
+
+from services.metrics import LLM_ROUTE_SECONDS, LLM_ESCALATIONS
+
+logger = logging.getLogger(__name__)
+
+ROUTES = ("fast", "large")
+
+# Generated questions must be the raw question text (see the question prompt's output rules).
+QUESTION_PREAMBLES = ("here is", "here's", "okay", "ok,", "sure", "certainly", "question:", "next question",
+                      "as an ai", "i'm sorry", "i am sorry")
+MIN_QUESTION_CHARS = 15
+MAX_QUESTION_CHARS = 600
+# A streamed question is held back until this much text can be checked for a preamble.
+QUESTION_OPENING_CHARS = 40
+
+
+def parse_routes(spec: str) -> Dict[str, str]:
+    """
+    Parses a route table from "call_type[:question_type]=fast|large" entries separated by commas.
+    Raises ValueError for malformed entries or unknown routes.
+    """
+    routes = {}
+    for entry in filter(None, (part.strip() for part in spec.split(","))):
+        key, separator, route = entry.partition("=")
+        route = route.strip()
+        if not separator or not key.strip() or route not in ROUTES:
+            raise ValueError(f"Invalid LLM route '{entry}': expected call_type[:question_type]=fast|large.")
+        routes[key.strip()] = route
+    return routes
+
+
+def strip_json_fences(text: str) -> str:
+    """Removes markdown ```json fences around a JSON response."""
+    text = text.strip()
+    if text.startswith("```json"):
+        text = text[len("```json"):]
+    if text.endswith("```"):
+        text = text[:-len("```")]
+    return text.strip()
+
+
+def json_problem(text: str, required_keys: Sequence[str] = (), numeric_keys: Sequence[str] = ()) -> Optional[str]:
+    """Why a structured response is unusable ("invalid_json", "missing_keys", "invalid_value"), or None if it is valid."""
+    try:
+        data = json.loads(strip_json_fences(text))
+    except json.JSONDecodeError:
+        return "invalid_json"
+    if not isinstance(data, dict):
+        return "invalid_json"
+    if any(key not in data for key in required_keys):
+        return "missing_keys"
+    for key in numeric_keys:
+        try:
+            float(data[key])
+        except (ValueError, TypeError):
+            return "invalid_value"
+    return None
+
+
+def question_problem(text: str, complete: bool = True) -> Optional[str]:
+    """
+    Why generated question text is unusable ("empty", "preamble", "too_short", "too_long"), or None.
+    With complete=False, text is the opening of a question still being streamed.
+    """
+    opening = text.strip().strip('"').lower()
+    if not opening:
+        return "empty" if complete else None
+    if opening.startswith(QUESTION_PREAMBLES):
+        return "preamble"
+    if complete and len(opening) < MIN_QUESTION_CHARS:
+        return "too_short"
+    if len(opening) > MAX_QUESTION_CHARS:
+        return "too_long"
+    return None
+
+
+class ModelRouter:
+    """
+    Picks the model of each LLM call by call type and question type tag. Latency-sensitive calls
+    can be routed to a smaller, faster model; when its output fails validation, GroqService repeats
+    the call on the large model (escalation), so the fast route never returns an unusable result.
+
+    The route of a call is looked up as "call_type:question_type", then "call_type", then default_route.
+    Latency per route (including escalations) and escalations per route and reason are exported as
+    metrics, so the latency gained can be weighed against the escalation rate.
+    """
+    def __init__(self, fast_model: str = "llama3-8b-8192", large_model: str = "llama3-70b-8192",
+                 routes: Optional[Dict[str, str]] = None, default_route: str = "large", escalation: bool = True):
+        if default_route not in ROUTES:
+            raise ValueError(f"Unknown LLM route: {default_route}")
+        self.fast_model = fast_model
+        self.large_model = large_model
+        self.routes = dict(routes or {})
+        self.default_route = default_route
+        self.escalation = escalation
+        self._calls: Dict[str, Dict[str, Any]] = {}
+
+    def route(self, call_type: str, question_type: Optional[str] = None) -> str:
+        if question_type and f"{call_type}:{question_type}" in self.routes:
+            return self.routes[f"{call_type}:{question_type}"]
+        return self.routes.get(call_type, self.default_route)
+
+    def model(self, route: str) -> str:
+        return self.fast_model if route == "fast" else self.large_model
+
+    def should_validate(self, route: str) -> bool:
+        """Outputs are validated (and escalated) only on the fast route; the large model has no fallback."""
+        return self.escalation and route == "fast" and self.fast_model != self.large_model
+
+    def record(self, call_type: str, question_type: Optional[str], route: str, seconds: float,
+               escalation_reason: Optional[str] = None):
+        question_label = question_type or "none"
+        LLM_ROUTE_SECONDS.observe(seconds, call_type=call_type, question_type=question_label, route=route)
+        key = f"{call_type}:{question_label}"
+        calls = self._calls.setdefault(key, {"route": route, "calls": 0, "escalations": 0, "seconds": 0.0})
+        calls["calls"] += 1
+        calls["seconds"] += seconds
+        if escalation_reason:
+            LLM_ESCALATIONS.inc(call_type=call_type, question_type=question_label, reason=escalation_reason)
+            calls["escalations"] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "fast_model": self.fast_model,
+            "large_model": self.large_model,
+            "escalation": self.escalation,
+            "routes": {
+                key: {
+                    "route": calls["route"],
+                    "calls": calls["calls"],
+                    "escalation_rate": round(calls["escalations"] / calls["calls"], 3),
+                    "avg_ms": round(1000 * calls["seconds"] / calls["calls"], 1),
+                }
+                for key, calls in self._calls.items()
+            },
+        }
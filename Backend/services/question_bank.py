@@ -0,0 +1,178 @@
+# question_bank.py
+import json
+import os
+import random
+import re
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+# Question types that do not depend on the candidate's resume text and can be served from the bank.
+# resume_deep_dive questions quote the resume, so they always come from the LLM.
+BANKABLE_TYPES = {
+    "hr_behavioral_foundational", "hr_behavioral_deep", "hr_concluding", "hr_advanced_situational",
+    "technical_foundational", "technical_problem_solving", "technical_advanced", "technical_system_design",
+}
+
+# Entries with this domain are served for every domain.
+ANY_DOMAIN = "*"
+
+_SKILL_ALIASES = {
+    "js": "javascript", "node": "node.js", "nodejs": "node.js", "ts": "typescript", "golang": "go",
+    "k8s": "kubernetes", "postgres": "postgresql", "ml": "machine learning", "dl": "deep learning",
+    "amazon web services": "aws", "gcp": "google cloud", "reactjs": "react", "react.js": "react",
+}
+
+# Generated questions that refer to the candidate personally are not reusable for other candidates.
+_PERSONAL_MARKERS = re.compile(r"\byour (resume|cv|project|projects|role at|experience at)\b|\byou mentioned\b|\byou worked on\b", re.I)
+
+
+def normalize_skill(skill: str) -> str:
+    skill = " ".join(str(skill).lower().split())
+    return _SKILL_ALIASES.get(skill, skill)
+
+
+def normalize_text(text: str) -> str:
+    """Comparison key for question texts: lowercase words only."""
+    return " ".join(re.findall(r"\w+", text.lower()))
+
+
+def skills_in_text(skills: Iterable[str], text: str) -> List[str]:
+    """The (normalized) skills that are mentioned in text as whole words."""
+    text = text.lower()
+    found = []
+    for skill in skills:
+        skill = normalize_skill(skill)
+        if skill and skill not in found and re.search(r"(?<!\w)" + re.escape(skill) + r"(?!\w)", text):
+            found.append(skill)
+    return found
+
+
+class QuestionBank:
+    """
+    Precomputed interview questions indexed by domain, question type tag and skill keyword.
+
+    `select` picks a question the session has not been asked yet, preferring the highest lexical
+    overlap between the entry's skill keywords and the resume skills. Skill-less entries are generic
+    and always eligible for the HR types; technical entries must share skills with the resume, so a
+    domain without matching entries falls back to the LLM. It is a dict lookup plus a scan of one (domain, type) bucket, so it costs
+    microseconds instead of an LLM call.
+
+    In fill mode, questions generated by the LLM are added with `learn` and persisted to a separate
+    learned-questions file, which can be reviewed and merged into the seed bank offline.
+    """
+    def __init__(self, path: Optional[str] = None, learned_path: Optional[str] = None,
+                 min_skill_overlap: int = 1, max_per_bucket: int = 200):
+        self.learned_path = learned_path
+        self.min_skill_overlap = min_skill_overlap
+        self.max_per_bucket = max_per_bucket
+        # (domain, type) -> entries; (domain, type) -> skill -> entry indexes
+        self._buckets: Dict[Tuple[str, str], List[Dict[str, Any]]] = defaultdict(list)
+        self._skill_index: Dict[Tuple[str, str], Dict[str, Set[int]]] = defaultdict(lambda: defaultdict(set))
+        self._texts: Set[str] = set()
+        self._learned: List[Dict[str, Any]] = []
+        self._dirty = False
+        self.hits = 0
+        self.misses = 0
+
+        if path:
+            self.load(path)
+        if learned_path and os.path.exists(learned_path):
+            self.load(learned_path, learned=True)
+
+    def load(self, path: str, learned: bool = False):
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        for entry in data.get("questions", []):
+            if self.add(entry.get("domain", ANY_DOMAIN), entry["type"], entry["text"], entry.get("skills", [])) and learned:
+                self._learned.append(entry)
+
+    def add(self, domain: str, question_type: str, text: str, skills: Iterable[str] = ()) -> bool:
+        """Adds a question; returns False for duplicates and full buckets."""
+        text = " ".join(text.split())
+        key = normalize_text(text)
+        bucket_key = ((domain or ANY_DOMAIN).strip().lower(), question_type)
+        bucket = self._buckets[bucket_key]
+        if not key or key in self._texts or len(bucket) >= self.max_per_bucket:
+            return False
+        entry = {"text": text, "key": key, "skills": [normalize_skill(skill) for skill in skills]}
+        for skill in entry["skills"]:
+            self._skill_index[bucket_key][skill].add(len(bucket))
+        bucket.append(entry)
+        self._texts.add(key)
+        return True
+
+    def select(self, domain: str, question_type: str, resume_skills: Iterable[str],
+               asked_texts: Iterable[str] = ()) -> Optional[str]:
+        """
+        Returns an unasked question for the domain and type, or None if the bank has no good match
+        (no generic HR entry and no entry sharing at least min_skill_overlap skills with the resume).
+        """
+        if question_type not in BANKABLE_TYPES:
+            return None
+        domain = (domain or "").strip().lower()
+        skills = {normalize_skill(skill) for skill in resume_skills}
+        asked = {normalize_text(text) for text in asked_texts}
+
+        best_score = -1
+        best: List[str] = []
+        for (bucket_domain, bucket_type), bucket in self._buckets.items():
+            if bucket_type != question_type or not (bucket_domain == ANY_DOMAIN or bucket_domain in domain):
+                continue
+            overlap: Dict[int, int] = defaultdict(int)
+            for skill in skills:
+                for index in self._skill_index[(bucket_domain, bucket_type)].get(skill, ()):
+                    overlap[index] += 1
+            for index, entry in enumerate(bucket):
+                if (entry["skills"] or question_type.startswith("technical_")) and overlap.get(index, 0) < self.min_skill_overlap:
+                    continue
+                if entry["key"] in asked:
+                    continue
+                # Domain-specific entries win ties against generic ones.
+                score = 2 * overlap.get(index, 0) + (bucket_domain != ANY_DOMAIN)
+                if score > best_score:
+                    best_score, best = score, [entry["text"]]
+                elif score == best_score:
+                    best.append(entry["text"])
+
+        if not best:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return random.choice(best) # Candidates with similar resumes still get varied questions
+
+    def learn(self, domain: str, question_type: str, text: str, resume_skills: Iterable[str]) -> bool:
+        """
+        Adds an LLM-generated question, tagged with the resume skills it mentions. Questions that refer
+        to the candidate personally, and technical questions without any skill keyword, are skipped.
+        """
+        if question_type not in BANKABLE_TYPES or _PERSONAL_MARKERS.search(text):
+            return False
+        skills = skills_in_text(resume_skills, text)
+        if question_type.startswith("technical_") and not skills:
+            return False
+        if not self.add(domain, question_type, text, skills):
+            return False
+        self._learned.append({"domain": (domain or ANY_DOMAIN).strip().lower(), "type": question_type,
+                              "skills": skills, "text": " ".join(text.split())})
+        self._dirty = True
+        return True
+
+    def save_learned(self):
+        """Writes the learned questions (blocking file I/O; run it on the blocking pool)."""
+        if not self.learned_path or not self._dirty:
+            return
+        self._dirty = False
+        tmp_path = f"{self.learned_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"version": 1, "questions": list(self._learned)}, f, indent=2)
+        os.replace(tmp_path, self.learned_path)
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "questions": sum(len(bucket) for bucket in self._buckets.values()),
+            "learned": len(self._learned),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+        }
@@ -0,0 +1,92 @@
+# question_similarity.py
+import re
+from typing import FrozenSet, Iterable, List, Optional, Tuple
+
+# Function words and interview boilerplate ("can you tell me about a time ...") that do not make
+# two questions similar, and are left out of the topic keywords.
+_STOPWORDS = frozenset("""
+a about after all also an and any are as at be been before being between both but by can could describe did do does
+discuss doing during each example explain for from give had has have how i if in into is it its just me mention
+mentioned might more most my of on one or other our over please share should so some such talk tell than that the
+their them then there these they this those through time to under up us walk was way we were what when where which
+while who why will with would you your
+""".split())
+
+_WORD = re.compile(r"[a-z0-9][a-z0-9+#.\-]*[a-z0-9+#]|[a-z0-9]")
+
+
+def _stem(word: str) -> str:
+    """Very light suffix stripping so word forms match ("limiter"/"limiting", "apis"/"api")."""
+    for suffix in ("ing", "ed", "er", "s"):
+        if word.endswith(suffix) and len(word) - len(suffix) >= 4 and not word.endswith("ss"):
+            return word[:-len(suffix)]
+    return word
+
+
+def content_words(text: str) -> List[str]:
+    """Lowercase, stemmed words of text without stopwords, in order."""
+    return [_stem(word) for word in _WORD.findall(text.lower()) if word not in _STOPWORDS]
+
+
+def keyword_set(text: str) -> FrozenSet[str]:
+    return frozenset(content_words(text))
+
+
+def jaccard(a: FrozenSet[str], b: FrozenSet[str]) -> float:
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+def question_topics(text: str, max_words: int = 8) -> str:
+    """A few keywords standing for a question in prompts (e.g. "design rate limiting public api serving")."""
+    words, stems = [], set()
+    for word in _WORD.findall(text.lower()):
+        if word not in _STOPWORDS and _stem(word) not in stems:
+            stems.add(_stem(word))
+            words.append(word)
+    return " ".join(words[:max_words])
+
+
+class DuplicateQuestionError(Exception):
+    """A generated question is a near-duplicate of one already asked in the session."""
+    def __init__(self, question_text: str, similar_to: str, similarity: float):
+        super().__init__(f"Question is {similarity:.2f} similar to an asked question.")
+        self.question_text = question_text
+        self.similar_to = similar_to
+        self.similarity = similarity
+
+
+class QuestionSimilarityIndex:
+    """
+    Keyword sets of the questions asked in a session, for rejecting near-duplicate questions locally
+    before TTS is spent on them. Similarity is the Jaccard index of the sets of stemmed content words,
+    so rephrasings ("How would you design a rate limiter ..." / "Walk me through how you would design
+    rate limiting ...") match while questions on the same skill but another topic do not. An interview
+    has few questions, so the index is rebuilt from the session's question history when needed;
+    a comparison costs microseconds.
+    """
+    def __init__(self, question_texts: Iterable[str] = (), threshold: float = 0.45):
+        self.threshold = threshold
+        self._entries: List[Tuple[str, FrozenSet[str]]] = []
+        for text in question_texts:
+            self.add(text)
+
+    def add(self, text: str):
+        self._entries.append((text, keyword_set(text)))
+
+    def most_similar(self, text: str) -> Tuple[Optional[str], float]:
+        """The most similar indexed question and its similarity (None, 0.0 if the index is empty)."""
+        candidate = keyword_set(text)
+        best_text, best_similarity = None, 0.0
+        for indexed_text, indexed_keywords in self._entries:
+            similarity = jaccard(candidate, indexed_keywords)
+            if similarity > best_similarity:
+                best_text, best_similarity = indexed_text, similarity
+        return best_text, best_similarity
+
+    def check(self, text: str):
+        """Raises DuplicateQuestionError if text is at least threshold similar to an indexed question."""
+        similar_to, similarity = self.most_similar(text)
+        if similar_to is not None and similarity >= self.threshold:
+            raise DuplicateQuestionError(text, similar_to, similarity)
@@ -0,0 +1,63 @@
+# resume_cache.py
+import copy
+import hashlib
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+
+def resume_cache_key(file_content: bytes, file_type: str, parser_version: str) -> str:
+    """Content hash of the resume bytes, salted with the file type and parser version."""
+    digest = hashlib.sha256()
+    digest.update(f"{parser_version}|{file_type}|".encode("utf-8"))
+    digest.update(file_content)
+    return digest.hexdigest()
+
+
+class ResumeParseCache:
+    """
+    LRU cache of parsed resumes keyed by content hash.
+    Each entry holds the extracted raw text and the structured ResumeInfo fields,
+    so a hit skips both document parsing and the LLM extraction call.
+    Bounded by entry count and by the total size of the cached raw text.
+    """
+    def __init__(self, max_entries: int = 512, max_text_chars: int = 32 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_text_chars = max_text_chars
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._text_chars = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return copy.deepcopy(entry)
+
+    def put(self, key: str, parsed_resume: Dict[str, Any]):
+        text_chars = len(parsed_resume.get("raw_text", ""))
+        if text_chars > self.max_text_chars:
+            return
+        if key in self._entries:
+            self._text_chars -= len(self._entries.pop(key).get("raw_text", ""))
+        self._entries[key] = copy.deepcopy(parsed_resume)
+        self._text_chars += text_chars
+        while len(self._entries) > self.max_entries or self._text_chars > self.max_text_chars:
+            _, evicted = self._entries.popitem(last=False)
+            self._text_chars -= len(evicted.get("raw_text", ""))
+            self.evictions += 1
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "text_chars": self._text_chars,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+        }
@@ -1,16 +1,49 @@
 import io
+import logging
+import time
 from PyPDF2 import PdfReader
 from docx import Document
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 import json
+import re
 
 from services.groq_service import GroqService
+from services.resume_cache import ResumeParseCache, resume_cache_key
+from services.extraction_pool import DocumentExtractionPool
+from services.metrics import STAGE_SECONDS
 
-async def extract_info_with_groq(resume_text: str, groq_service: GroqService) -> Dict[str, Any]:
+logger = logging.getLogger(__name__)
+
+# Bump whenever text extraction or the extraction prompt changes, so cached parses are not reused.
+PARSER_VERSION = "4"
+
+# Experience placeholders returned when LLM extraction fails; such results are not cached.
+PARSE_ERROR_EXPERIENCE = "Could not parse experience from resume."
+EXTRACT_ERROR_EXPERIENCE = "Could not extract resume information due to an error."
+
+# JSON schema line per ResumeInfo field, used to build full and gap-only extraction prompts.
+RESUME_FIELD_SCHEMA = {
+    "name": '"name": "string (e.g., John Doe)"',
+    "email": '"email": "string (e.g., john.doe@example.com, nullable)"',
+    "phone": '"phone": "string (e.g., +1-123-456-7890, nullable)"',
+    "experience": '"experience": "string (A concise summary of total work experience, e.g., \'5 years as Software Engineer, 2 years as Team Lead\', nullable)"',
+    "skills": '"skills": ["list of strings (e.g., Python, React, AWS, can be empty)"]',
+    "projects": '''"projects": [
+            {"title": "string (title of the project)", "description": "string (concise description of the project and your role, can be empty)"}
+        ]''',
+    "education": '"education": "string (e.g., \'M.Sc. Computer Science from XYZ University\', nullable)"',
+}
+RESUME_FIELDS = list(RESUME_FIELD_SCHEMA)
+
+async def extract_info_with_groq(resume_text: str, groq_service: GroqService,
+                                 fields: Optional[List[str]] = None) -> Dict[str, Any]:
     """
     Uses the Groq LLM (via GroqService) to extract structured information
     from raw resume text based on a defined JSON schema.
+    If fields is given, only those fields are requested and returned.
     """
+    fields = fields or RESUME_FIELDS
+    schema = ",\n        ".join(RESUME_FIELD_SCHEMA[field] for field in fields)
     prompt = f"""
     You are an expert resume parser. Extract the following information from the provided resume text.
     If a field is not found, use a reasonable default (e.g., empty string, empty list) or null.
@@ -23,21 +56,13 @@ async def extract_info_with_groq(resume_text: str, groq_service: GroqService) ->
 
     Required JSON Schema for the output:
     {{
-        "name": "string (e.g., John Doe)",
-        "email": "string (e.g., john.doe@example.com, nullable)",
-        "phone": "string (e.g., +1-123-456-7890, nullable)",
-        "experience": "string (A concise summary of total work experience, e.g., '5 years as Software Engineer, 2 years as Team Lead', nullable)",
-        "skills": ["list of strings (e.g., Python, React, AWS, can be empty)"],
-        "projects": [
-            {{"title": "string (title of the project)", "description": "string (concise description of the project and your role, can be empty)"}}
-        ],
-        "education": "string (e.g., 'M.Sc. Computer Science from XYZ University', nullable)"
+        {schema}
     }}
     Ensure the output is valid JSON and strictly adheres to the schema.
     """
     try:
-        response_json_str = await groq_service.generate_structured_response(prompt)
-        print(f"Raw structured response from LLM for resume parsing: {response_json_str}")
+        response_json_str = await groq_service.generate_structured_response(prompt, "resume_extraction")
+        logger.debug("Structured response from LLM for resume parsing.", extra={"payload": response_json_str})
 
         parsed_data = json.loads(response_json_str)
 
@@ -50,57 +75,362 @@ async def extract_info_with_groq(resume_text: str, groq_service: GroqService) ->
             "projects": parsed_data.get("projects", []),
             "education": parsed_data.get("education"),
         }
-        return result
+        return {field: result[field] for field in fields}
     except json.JSONDecodeError as e:
-        print(f"JSON parsing error from LLM response during resume parsing: {e}")
-        print(f"Problematic Groq response: {response_json_str}")
+        logger.error("JSON parsing error from LLM response during resume parsing: %s", e, extra={"payload": response_json_str})
         return {
             "name": None, "email": None, "phone": None,
-            "experience": "Could not parse experience from resume.",
+            "experience": PARSE_ERROR_EXPERIENCE,
             "skills": [], "projects": [], "education": None
         }
     except Exception as e:
-        print(f"Error during LLM info extraction for resume: {e}")
+        logger.exception("Error during LLM info extraction for resume.")
         return {
             "name": None, "email": None, "phone": None,
-            "experience": "Could not extract resume information due to an error.",
+            "experience": EXTRACT_ERROR_EXPERIENCE,
             "skills": [], "projects": [], "education": None
         }
 
 
-def parse_pdf(file_content: bytes) -> str:
-    """Parses plain text from a PDF file."""
+# --- Local (regex and section header) extraction ---
+
+_SECTION_HEADERS = {
+    "summary": ["summary", "profile", "professional summary", "about me", "objective", "career objective"],
+    "skills": ["skills", "technical skills", "core skills", "key skills", "skills & tools", "skills and tools",
+               "technologies", "tech stack", "core competencies", "competencies", "tools"],
+    "experience": ["experience", "work experience", "professional experience", "employment history", "employment",
+                   "work history", "career history", "relevant experience"],
+    "projects": ["projects", "personal projects", "academic projects", "key projects", "selected projects", "side projects"],
+    "education": ["education", "academic background", "qualifications", "academics", "education & training",
+                  "education and training"],
+    "other": ["certifications", "certificates", "awards", "achievements", "publications", "languages", "interests",
+              "hobbies", "references", "volunteering", "volunteer experience", "activities", "contact", "courses"],
+}
+_HEADER_LOOKUP = {header: section for section, headers in _SECTION_HEADERS.items() for header in headers}
+
+_EMAIL = re.compile(r"[\w.+-]+@[\w-]+(?:\.[\w-]+)*\.[a-z]{2,}", re.I)
+_PHONE = re.compile(r"(?<!\w)(?:\+\d{1,3}[\s.-]?)?(?:\(\d{2,5}\)[\s.-]?)?\d{2,5}(?:[\s.-]?\d{2,5}){1,3}(?!\w)")
+_YEARS_OF_EXPERIENCE = re.compile(r"(\d{1,2})\+?\s*(?:years|yrs)\b(?:\s+of)?(?:\s+\w+){0,3}?\s+experience", re.I)
+_DATE_RANGE = re.compile(r"\b((?:19|20)\d{2})\s*(?:-|–|—|to)\s*(?:\w+\.?\s+)?((?:19|20)\d{2}|present|current|now)\b", re.I)
+_DEGREE = re.compile(r"\b(b\.?\s?s\.?c?|m\.?\s?s\.?c?|b\.?\s?tech|m\.?\s?tech|b\.?e|m\.?e|bachelor|master|ph\.?\s?d|mba|"
+                     r"diploma|associate|university|college|institute)\b", re.I)
+_BULLET = re.compile(r"^\s*[-•*·▪◦●–]\s*")
+# Header lines made of these words are job titles or headings ("Senior Data Scientist", "Contact Information"), not names.
+_NON_NAME_WORDS = {
+    "resume", "curriculum", "vitae", "cv", "contact", "information", "info", "details", "personal", "profile",
+    "address", "phone", "mobile", "email", "linkedin", "github", "portfolio", "website",
+    "senior", "junior", "lead", "principal", "staff", "head", "chief", "intern", "trainee", "fresher", "graduate",
+    "engineer", "engineering", "developer", "programmer", "scientist", "analyst", "manager", "management",
+    "consultant", "designer", "architect", "administrator", "specialist", "director", "officer", "executive",
+    "coordinator", "assistant", "associate", "recruiter", "accountant", "technician", "tester", "student",
+    "software", "data", "full", "stack", "frontend", "backend", "web", "cloud", "devops", "machine",
+    "learning", "product", "project", "marketing", "sales", "business", "human", "resources", "hr", "qa",
+}
+_SKILL_SEPARATORS = re.compile(r"\s*[,;|•·▪●]\s*")
+
+
+def _section_header(line: str) -> Optional[Tuple[str, str]]:
+    """(section, inline content) if the line is a section header like "SKILLS" or "Skills: Python, Java"."""
+    stripped = line.strip().strip("#*_=-:| ").strip()
+    if not stripped or len(stripped) > 60:
+        return None
+    header, _, inline = stripped.partition(":")
+    section = _HEADER_LOOKUP.get(" ".join(header.lower().split()))
+    if section is None:
+        return None
+    return section, inline.strip()
+
+
+def split_sections(resume_text: str) -> Dict[str, List[str]]:
+    """Splits resume text into sections by header lines. Lines before the first header go to "header"."""
+    sections: Dict[str, List[str]] = {"header": []}
+    current = "header"
+    for line in resume_text.splitlines():
+        header = _section_header(line)
+        if header is not None:
+            current, inline = header
+            sections.setdefault(current, [])
+            if inline:
+                sections[current].append(inline)
+        elif line.strip():
+            sections[current].append(line.strip())
+    return sections
+
+
+def _extract_name(header_lines: List[str], email: Optional[str]) -> Tuple[Optional[str], float]:
+    """
+    The candidate's name from the first header lines: 2-4 capitalized words that are not a job title or
+    heading. A line matching the email's local part wins; if there is an email and no line matches it,
+    the guess is returned below the hybrid threshold so the LLM fills the name.
+    """
+    local_part = re.sub(r"[^a-z]", "", email.split("@")[0].lower()) if email else ""
+    candidates = []
+    for position, line in enumerate(header_lines[:5]):
+        candidate = re.split(r"\s+[|,–—-]\s+", line)[0].strip()
+        words = candidate.split()
+        if not 2 <= len(words) <= 4 or re.search(r"[\d@/:]", candidate) or _section_header(candidate):
+            continue
+        if not all(word[0].isupper() for word in words):
+            continue
+        if any(word.lower().strip(".&") in _NON_NAME_WORDS for word in words):
+            continue
+        name = " ".join(word.capitalize() if word.isupper() else word for word in words)
+        if local_part and any(len(token) > 2 and token in local_part
+                              for token in (re.sub(r"[^a-z]", "", word.lower()) for word in words)):
+            return name, 0.95
+        candidates.append((position, name))
+    if not candidates:
+        return None, 0.0
+    position, name = candidates[0]
+    if local_part:
+        return name, 0.5
+    return name, 0.85 if position == 0 else 0.7
+
+
+def _extract_skills(lines: List[str]) -> Tuple[List[str], float]:
+    skills: List[str] = []
+    seen = set()
+    for line in lines:
+        line = _BULLET.sub("", line)
+        if ":" in line:
+            line = line.split(":", 1)[1] # "Languages: Python, Go" -> "Python, Go"
+        for skill in _SKILL_SEPARATORS.split(line):
+            skill = skill.strip(" .")
+            if skill and len(skill) <= 40 and len(skill.split()) <= 4 and skill.lower() not in seen:
+                seen.add(skill.lower())
+                skills.append(skill)
+    if len(skills) >= 3:
+        return skills, 0.9
+    return skills, 0.6 if skills else 0.0
+
+
+def _extract_experience(sections: Dict[str, List[str]], resume_text: str) -> Tuple[Optional[str], float]:
+    experience_lines = sections.get("experience", [])
+    role = None
+    for line in experience_lines:
+        role = _DATE_RANGE.sub("", _BULLET.sub("", line)).strip(" ,|()–—-")
+        if role:
+            role = role[:100]
+            break
+
+    explicit = _YEARS_OF_EXPERIENCE.search(" ".join(sections.get("summary", []) + sections["header"]) or resume_text)
+    years: Optional[int] = int(explicit.group(1)) if explicit else None
+    if years is None and experience_lines:
+        # Union of the date ranges in the experience section.
+        current_year = time.localtime().tm_year
+        spans = sorted((int(start), current_year if not end.isdigit() else int(end))
+                       for start, end in _DATE_RANGE.findall(" ".join(experience_lines)))
+        covered, last_end = 0, None
+        for start, end in spans:
+            if last_end is None or start > last_end:
+                covered += max(0, end - start)
+                last_end = end
+            elif end > last_end:
+                covered += end - last_end
+                last_end = end
+        years = covered or None
+
+    if years and role:
+        return f"{years} years of experience, most recently {role}", 0.8
+    if role:
+        return role, 0.5
+    if years:
+        return f"{years} years of experience", 0.5
+    return None, 0.0
+
+
+def _extract_projects(lines: List[str]) -> Tuple[List[Dict[str, str]], float]:
+    projects: List[Dict[str, str]] = []
+    for line in lines:
+        is_bullet = bool(_BULLET.match(line))
+        text = _BULLET.sub("", line)
+        if not is_bullet and len(text) <= 80 and not text.endswith("."):
+            projects.append({"title": text, "description": ""})
+        elif projects:
+            description = projects[-1]["description"]
+            projects[-1]["description"] = f"{description} {text}".strip()[:400]
+    if not projects:
+        return [], 0.0
+    return projects, 0.8 if all(project["description"] for project in projects) else 0.6
+
+
+def _extract_education(lines: List[str]) -> Tuple[Optional[str], float]:
+    if not lines:
+        return None, 0.0
+    education = "; ".join(_BULLET.sub("", line) for line in lines[:3])[:200]
+    return education, 0.85 if _DEGREE.search(education) else 0.5
+
+
+def extract_info_locally(resume_text: str) -> Tuple[Dict[str, Any], Dict[str, float]]:
+    """
+    Extracts ResumeInfo fields with regexes and section header detection (milliseconds, no LLM).
+    Returns (fields, confidence per field); a field that was not found has confidence 0.0.
+    """
+    sections = split_sections(resume_text)
+    header_text = "\n".join(sections["header"]) or resume_text
+    confidence: Dict[str, float] = {}
+
+    emails = _EMAIL.findall(header_text) or _EMAIL.findall(resume_text)
+    email = emails[0] if emails else None
+    confidence["email"] = (0.99 if len(set(emails)) == 1 else 0.8) if email else 0.0
+
+    phone = None
+    for match in _PHONE.finditer(header_text):
+        if 10 <= len(re.sub(r"\D", "", match.group())) <= 15:
+            phone = match.group().strip()
+            break
+    confidence["phone"] = 0.9 if phone else 0.0
+
+    name, confidence["name"] = _extract_name(sections["header"], email)
+    skills, confidence["skills"] = _extract_skills(sections.get("skills", []))
+    experience, confidence["experience"] = _extract_experience(sections, resume_text)
+    projects, confidence["projects"] = _extract_projects(sections.get("projects", []))
+    education, confidence["education"] = _extract_education(sections.get("education", []))
+
+    fields = {"name": name, "email": email, "phone": phone, "experience": experience,
+              "skills": skills, "projects": projects, "education": education}
+    return fields, confidence
+
+
+# Sections that hold each field, used to send only the relevant parts of the resume for gap filling.
+_FIELD_SECTIONS = {
+    "name": ["header"], "email": ["header"], "phone": ["header"], "skills": ["skills"],
+    "experience": ["summary", "experience"], "projects": ["projects", "experience"], "education": ["education"],
+}
+
+
+def gap_prompt_text(resume_text: str, fields: List[str]) -> str:
+    """
+    The resume text to send when only `fields` are missing: the sections those fields live in,
+    or the whole text if any of them has no detected section.
+    """
+    sections = split_sections(resume_text)
+    names = []
+    for field in fields:
+        present = [name for name in _FIELD_SECTIONS[field] if sections.get(name)]
+        if not present:
+            return resume_text
+        names.extend(name for name in present if name not in names)
+    return "\n\n".join(
+        (f"{name.upper()}\n" if name != "header" else "") + "\n".join(sections[name]) for name in names
+    )
+
+
+async def extract_info_hybrid(resume_text: str, groq_service: GroqService,
+                              min_confidence: float = 0.75) -> Tuple[Dict[str, Any], bool]:
+    """
+    Extracts fields locally and asks the LLM only for fields below min_confidence, with a prompt
+    containing only those fields and the resume sections they come from.
+    Returns (structured info, complete); complete is False if the LLM fallback failed.
+    """
+    with STAGE_SECONDS.time(stage="resume_local"):
+        local_info, confidence = extract_info_locally(resume_text)
+    gaps = [field for field in RESUME_FIELDS if confidence[field] < min_confidence]
+
+    structured_info = dict(local_info)
+    complete = True
+    if gaps:
+        with STAGE_SECONDS.time(stage="resume_llm"):
+            llm_info = await extract_info_with_groq(gap_prompt_text(resume_text, gaps), groq_service, fields=gaps)
+        complete = llm_info.get("experience") not in (PARSE_ERROR_EXPERIENCE, EXTRACT_ERROR_EXPERIENCE)
+        for field in gaps:
+            # A failed call leaves the error placeholder in "experience" if that was a gap.
+            structured_info[field] = llm_info.get(field) or local_info[field]
+
+    if not structured_info["experience"]:
+        structured_info["experience"] = "No experience mentioned."
+    structured_info["field_confidence"] = confidence
+    structured_info["llm_fields"] = gaps
+    logger.debug("Resume fields extracted.", extra={"llm_fields": ",".join(gaps) or "-"})
+    return structured_info, complete
+
+
+def parse_pdf(file_content: bytes, max_pages: Optional[int] = None, cpu_time_limit: Optional[float] = None) -> str:
+    """
+    Parses plain text from a PDF file, page by page.
+    Raises ValueError if the PDF has more than max_pages pages or extraction uses
+    more than cpu_time_limit seconds of CPU time.
+    """
+    cpu_started = time.process_time()
     reader = PdfReader(io.BytesIO(file_content))
-    text = ""
+    num_pages = len(reader.pages)
+    if max_pages is not None and num_pages > max_pages:
+        raise ValueError(f"Resume has {num_pages} pages; at most {max_pages} pages are supported.")
+    page_texts = []
     for page in reader.pages:
-        text += page.extract_text() or ""
-    return text.strip()
+        page_texts.append(page.extract_text() or "")
+        if cpu_time_limit is not None and time.process_time() - cpu_started > cpu_time_limit:
+            raise ValueError(f"Resume text extraction exceeded {cpu_time_limit:g}s of CPU time after {len(page_texts)} of {num_pages} pages.")
+    return "\n".join(page_texts).strip()
 
-def parse_docx(file_content: bytes) -> str:
+def parse_docx(file_content: bytes, cpu_time_limit: Optional[float] = None) -> str:
     """Parses plain text from a DOCX file."""
+    cpu_started = time.process_time()
     document = Document(io.BytesIO(file_content))
-    text = ""
+    paragraph_texts = []
     for paragraph in document.paragraphs:
-        text += paragraph.text + "\n"
-    return text.strip()
+        paragraph_texts.append(paragraph.text)
+        if cpu_time_limit is not None and time.process_time() - cpu_started > cpu_time_limit:
+            raise ValueError(f"Resume text extraction exceeded {cpu_time_limit:g}s of CPU time.")
+    return "\n".join(paragraph_texts).strip()
+
+def extract_text(file_content: bytes, file_type: str, max_pages: Optional[int] = None, cpu_time_limit: Optional[float] = None) -> str:
+    """Extracts raw text from a resume. Module-level so it can run in a DocumentExtractionPool process."""
+    if file_type == "pdf":
+        return parse_pdf(file_content, max_pages=max_pages, cpu_time_limit=cpu_time_limit)
+    return parse_docx(file_content, cpu_time_limit=cpu_time_limit)
 
-async def parse_resume(file_content: bytes, filename: str, groq_service: GroqService) -> Dict[str, Any]:
+async def parse_resume(file_content: bytes, filename: str, groq_service: GroqService,
+                       cache: Optional[ResumeParseCache] = None,
+                       extraction_pool: Optional[DocumentExtractionPool] = None,
+                       max_bytes: Optional[int] = None, max_pages: Optional[int] = None,
+                       cpu_time_limit: Optional[float] = None,
+                       local_min_confidence: Optional[float] = None) -> Dict[str, Any]:
     """
     Parses a resume file (PDF or DOCX), extracts raw text, and then
     uses the GroqService to extract structured information from it.
+    If local_min_confidence is given, fields are extracted locally first and the
+    LLM is only asked for fields below that confidence (see extract_info_hybrid).
+    If a cache is given, a resume with identical content is served from it
+    without parsing or calling the LLM.
+    If an extraction pool is given, text extraction runs in a separate process
+    instead of on the event loop. max_bytes, max_pages and cpu_time_limit guard
+    against oversized documents (ValueError).
     """
-    raw_text = ""
+    if max_bytes is not None and len(file_content) > max_bytes:
+        raise ValueError(f"Resume file is too large ({len(file_content) // 1024} KB); the limit is {max_bytes // 1024} KB.")
+
     if filename.endswith(".pdf"):
-        raw_text = parse_pdf(file_content)
+        file_type = "pdf"
     elif filename.endswith(".docx"):
-        raw_text = parse_docx(file_content)
+        file_type = "docx"
     else:
         raise ValueError("Unsupported file type. Please upload a PDF or DOCX resume.")
 
+    cache_key = resume_cache_key(file_content, file_type, PARSER_VERSION) if cache is not None else None
+    if cache is not None:
+        cached = cache.get(cache_key)
+        if cached is not None:
+            logger.debug("Resume parse cache hit.", extra={"resume_file": filename, "cache_key": cache_key[:12]})
+            return cached
+
+    with STAGE_SECONDS.time(stage="resume_extraction"):
+        if extraction_pool is not None:
+            raw_text = await extraction_pool.run(extract_text, file_content, file_type, max_pages, cpu_time_limit)
+        else:
+            raw_text = extract_text(file_content, file_type, max_pages, cpu_time_limit)
+
     if not raw_text.strip():
         raise ValueError("Could not extract any text from the provided resume file. Please ensure it's a valid PDF/DOCX with readable text.")
 
-    structured_info = await extract_info_with_groq(raw_text, groq_service)
+    if local_min_confidence is not None:
+        structured_info, complete = await extract_info_hybrid(raw_text, groq_service, local_min_confidence)
+    else:
+        with STAGE_SECONDS.time(stage="resume_llm"):
+            structured_info = await extract_info_with_groq(raw_text, groq_service)
+        complete = structured_info.get("experience") not in (PARSE_ERROR_EXPERIENCE, EXTRACT_ERROR_EXPERIENCE)
 
     structured_info["raw_text"] = raw_text
+    if cache is not None and complete:
+        cache.put(cache_key, structured_info)
     return structured_info
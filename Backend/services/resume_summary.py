@@ -0,0 +1,112 @@
+# resume_summary.py
+import json
+import math
+import re
+from typing import Any, Dict, List
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough prompt token count (~4 characters per token)."""
+    return math.ceil(len(text) / 4)
+
+
+def full_resume_summary(resume_info: Dict[str, Any]) -> str:
+    """The untrimmed summary the prompts used before budgeting (every skill, projects as JSON)."""
+    return f"""
+        Candidate Name: {resume_info.get('name', 'N/A')}
+        Experience: {resume_info.get('experience', 'N/A')}
+        Skills: {', '.join(resume_info.get('skills', []))}
+        Projects: {json.dumps(resume_info.get('projects', []))}
+        Education: {resume_info.get('education', 'N/A')}
+        """
+
+
+def _truncate(text: str, max_chars: int) -> str:
+    text = " ".join(str(text).split())
+    if len(text) <= max_chars:
+        return text
+    return text[:max(0, max_chars - 3)].rsplit(" ", 1)[0] + "..."
+
+
+def rank_skills(resume_info: Dict[str, Any], domain: str = "") -> List[str]:
+    """
+    Orders skills by relevance: skills named in the domain first, then by how often they are
+    mentioned in the projects, experience and resume text. Case-insensitive duplicates are dropped.
+    """
+    context = " ".join([
+        str(resume_info.get("experience") or ""),
+        " ".join(f"{p.get('title', '')} {p.get('description', '')}" for p in resume_info.get("projects", [])),
+        str(resume_info.get("raw_text") or ""),
+    ]).lower()
+    domain = (domain or "").lower()
+    seen = set()
+    scored = []
+    for position, skill in enumerate(resume_info.get("skills", [])):
+        skill = str(skill).strip()
+        if not skill or skill.lower() in seen:
+            continue
+        seen.add(skill.lower())
+        mentions = len(re.findall(r"(?<!\w)" + re.escape(skill.lower()) + r"(?!\w)", context))
+        scored.append((skill.lower() in domain, mentions, -position, skill))
+    scored.sort(reverse=True)
+    return [skill for *_, skill in scored]
+
+
+def rank_projects(resume_info: Dict[str, Any], ranked_skills: List[str]) -> List[Dict[str, Any]]:
+    """Orders projects by how many (highly ranked) skills they mention, keeping resume order for ties."""
+    weights = {skill.lower(): len(ranked_skills) - rank for rank, skill in enumerate(ranked_skills)}
+
+    def score(project: Dict[str, Any]) -> int:
+        text = f"{project.get('title', '')} {project.get('description', '')}".lower()
+        return sum(weight for skill, weight in weights.items() if re.search(r"(?<!\w)" + re.escape(skill) + r"(?!\w)", text))
+
+    projects = list(resume_info.get("projects", []))
+    return sorted(projects, key=lambda project: -score(project)) # sorted() is stable
+
+
+def build_resume_summary(resume_info: Dict[str, Any], domain: str = "", token_budget: int = 400,
+                         max_project_chars: int = 240) -> Dict[str, Any]:
+    """
+    Builds the resume summary sent with every LLM call of a session, within token_budget.
+    Experience and education are capped, then the highest ranked skills and projects are added
+    until the budget is used. Returns {"text", "tokens", "full_tokens", "skills_dropped", "projects_dropped"};
+    "full_tokens" is the size of the untrimmed summary, so callers can report the tokens saved.
+    """
+    budget_chars = token_budget * 4
+    lines = [
+        f"Candidate Name: {resume_info.get('name') or 'N/A'}",
+        f"Experience: {_truncate(resume_info.get('experience') or 'N/A', budget_chars * 30 // 100)}",
+        f"Education: {_truncate(resume_info.get('education') or 'N/A', budget_chars * 10 // 100)}",
+    ]
+    remaining = budget_chars - sum(len(line) + 1 for line in lines)
+
+    # Skills get up to a third of the rest, projects the remainder.
+    ranked_skills = rank_skills(resume_info, domain)
+    skills_budget = remaining // 3
+    skills = []
+    for skill in ranked_skills:
+        if len(", ".join(skills + [skill])) + len("Skills: ") > skills_budget:
+            break
+        skills.append(skill)
+    skills_line = f"Skills: {', '.join(skills) if skills else 'N/A'}"
+    remaining -= len(skills_line) + 1
+
+    project_lines = []
+    ranked_projects = rank_projects(resume_info, ranked_skills)
+    for project in ranked_projects:
+        title = _truncate(project.get("title") or "Untitled", 80)
+        description = project.get("description") or ""
+        line = f"- {title}: {_truncate(description, max_project_chars)}" if description else f"- {title}"
+        if len(line) + 1 > remaining - len("Projects:"):
+            break
+        project_lines.append(line)
+        remaining -= len(line) + 1
+
+    text = "\n".join(lines[:2] + [skills_line, "Projects:" + (" N/A" if not project_lines else "")] + project_lines + lines[2:])
+    return {
+        "text": text,
+        "tokens": estimate_tokens(text),
+        "full_tokens": estimate_tokens(full_resume_summary(resume_info)),
+        "skills_dropped": len(ranked_skills) - len(skills),
+        "projects_dropped": len(ranked_projects) - len(project_lines),
+    }
@@ -0,0 +1,225 @@
+# session_store.py
+import copy
+import json
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional
+
+
+class SessionNotFoundError(KeyError):
+    """Raised when updating a session that does not exist (or has expired)."""
+
+
+class SessionStore(ABC):
+    """
+    Interface for interview session storage.
+
+    A session is a JSON-serializable dict:
+        {
+            "session_id": str,
+            "domain": str,
+            "resume_info": dict,         # ResumeInfo.dict()
+            "current_question": dict,    # Question.dict()
+            "questions_asked": [{"id": str, "text": str, "type": str}, ...],
+            "answers": [{"question_id": ..., "feedback": ..., "score": ..., ...}, ...],
+            "running_evaluation": dict,  # services/evaluation_summary.py, updated with each answer
+        }
+    get() returns a snapshot; all modifications go through update(), which applies
+    the mutator atomically with respect to other updates of the same session.
+    """
+    @abstractmethod
+    async def create(self, session_id: str, data: Dict[str, Any]):
+        raise NotImplementedError
+
+    @abstractmethod
+    async def get(self, session_id: str) -> Optional[Dict[str, Any]]:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def update(self, session_id: str, mutator: Callable[[Dict[str, Any]], Any]) -> Any:
+        """Applies mutator(session) in place and persists it. Returns the mutator's return value."""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def delete(self, session_id: str):
+        raise NotImplementedError
+
+    @abstractmethod
+    async def count(self) -> int:
+        raise NotImplementedError
+
+    def stats(self) -> Dict[str, Any]:
+        return {}
+
+    async def close(self):
+        pass
+
+
+class InMemorySessionStore(SessionStore):
+    """
+    Per-process session store with idle TTL and LRU eviction.
+    Sessions idle for longer than ttl_seconds expire; beyond max_sessions the least
+    recently used session is evicted. Only suitable for a single worker.
+    """
+    def __init__(self, ttl_seconds: int = 3600, max_sessions: int = 10000):
+        self.ttl_seconds = ttl_seconds
+        self.max_sessions = max_sessions
+        self._sessions: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._last_access: Dict[str, float] = {}
+        self.expired = 0
+        self.evicted = 0
+
+    def _evict_expired(self):
+        # Sessions are kept in access order, so expired ones are at the front.
+        now = time.monotonic()
+        while self._sessions:
+            session_id = next(iter(self._sessions))
+            if now - self._last_access[session_id] < self.ttl_seconds:
+                break
+            self._remove(session_id)
+            self.expired += 1
+
+    def _remove(self, session_id: str):
+        self._sessions.pop(session_id, None)
+        self._last_access.pop(session_id, None)
+
+    def _touch(self, session_id: str):
+        self._sessions.move_to_end(session_id)
+        self._last_access[session_id] = time.monotonic()
+
+    async def create(self, session_id: str, data: Dict[str, Any]):
+        self._evict_expired()
+        self._sessions[session_id] = copy.deepcopy(data)
+        self._touch(session_id)
+        while len(self._sessions) > self.max_sessions:
+            self._remove(next(iter(self._sessions)))
+            self.evicted += 1
+
+    async def get(self, session_id: str) -> Optional[Dict[str, Any]]:
+        self._evict_expired()
+        if session_id not in self._sessions:
+            return None
+        self._touch(session_id)
+        return copy.deepcopy(self._sessions[session_id])
+
+    async def update(self, session_id: str, mutator: Callable[[Dict[str, Any]], Any]) -> Any:
+        # The mutator is synchronous and there is no await in between, so the
+        # read-modify-write cannot interleave with another update on this event loop.
+        self._evict_expired()
+        if session_id not in self._sessions:
+            raise SessionNotFoundError(session_id)
+        self._touch(session_id)
+        return mutator(self._sessions[session_id])
+
+    async def delete(self, session_id: str):
+        self._remove(session_id)
+
+    async def count(self) -> int:
+        self._evict_expired()
+        return len(self._sessions)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "backend": "memory",
+            "sessions": len(self._sessions),
+            "ttl_seconds": self.ttl_seconds,
+            "max_sessions": self.max_sessions,
+            "expired": self.expired,
+            "evicted": self.evicted,
+        }
+
+
+class RedisSessionStore(SessionStore):
+    """
+    Session store on a Redis-protocol server, shared by all workers and replicas.
+    Each session is one JSON value with an idle TTL that is refreshed on every write.
+    Updates use WATCH/MULTI/EXEC optimistic transactions and retry on conflict.
+    Every write also records the session's write time in a sorted set, so count() is a
+    ZCARD after trimming idle entries instead of a SCAN over the keyspace.
+
+    The client can be injected (e.g. fakeredis.aioredis.FakeRedis for a local stand-in);
+    otherwise one is created from url with the optional 'redis' package.
+    """
+    KEY_PREFIX = "ai-interviewer:session:"
+    INDEX_KEY = "ai-interviewer:sessions"
+
+    def __init__(self, url: str = "redis://localhost:6379/0", ttl_seconds: int = 3600, client: Any = None, max_retries: int = 50):
+        if client is None:
+            try:
+                import redis.asyncio as redis_asyncio
+            except ImportError:
+                raise ImportError("SESSION_STORE_BACKEND='redis' requires the 'redis' package (pip install redis).")
+            client = redis_asyncio.from_url(url)
+        self.redis = client
+        self.ttl_seconds = ttl_seconds
+        self.max_retries = max_retries
+        self.conflicts = 0
+
+    def _key(self, session_id: str) -> str:
+        return f"{self.KEY_PREFIX}{session_id}"
+
+    async def create(self, session_id: str, data: Dict[str, Any]):
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.set(self._key(session_id), json.dumps(data), ex=self.ttl_seconds)
+            pipe.zadd(self.INDEX_KEY, {session_id: time.time()})
+            await pipe.execute()
+
+    async def get(self, session_id: str) -> Optional[Dict[str, Any]]:
+        raw = await self.redis.get(self._key(session_id))
+        return json.loads(raw) if raw is not None else None
+
+    async def update(self, session_id: str, mutator: Callable[[Dict[str, Any]], Any]) -> Any:
+        from redis.exceptions import WatchError
+
+        key = self._key(session_id)
+        async with self.redis.pipeline(transaction=True) as pipe:
+            for _ in range(self.max_retries):
+                try:
+                    await pipe.watch(key)
+                    raw = await pipe.get(key)
+                    if raw is None:
+                        raise SessionNotFoundError(session_id)
+                    data = json.loads(raw)
+                    result = mutator(data)
+                    pipe.multi()
+                    pipe.set(key, json.dumps(data), ex=self.ttl_seconds)
+                    pipe.zadd(self.INDEX_KEY, {session_id: time.time()})
+                    await pipe.execute()
+                    return result
+                except WatchError:
+                    # Another worker modified the session in between; re-read and re-apply.
+                    self.conflicts += 1
+                    continue
+                finally:
+                    await pipe.reset()
+        raise RuntimeError(f"Could not update session {session_id}: too many concurrent modifications.")
+
+    async def delete(self, session_id: str):
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.delete(self._key(session_id))
+            pipe.zrem(self.INDEX_KEY, session_id)
+            await pipe.execute()
+
+    async def count(self) -> int:
+        # Sessions not written for ttl_seconds have expired; their index entries are trimmed here.
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.zremrangebyscore(self.INDEX_KEY, "-inf", time.time() - self.ttl_seconds)
+            pipe.zcard(self.INDEX_KEY)
+            _, count = await pipe.execute()
+        return count
+
+    def stats(self) -> Dict[str, Any]:
+        return {"backend": "redis", "ttl_seconds": self.ttl_seconds, "write_conflicts": self.conflicts}
+
+    async def close(self):
+        await self.redis.aclose()
+
+
+def create_session_store(backend: str, ttl_seconds: int, max_sessions: int, redis_url: str) -> SessionStore:
+    """Builds the session store selected by the SESSION_STORE_BACKEND setting."""
+    if backend == "memory":
+        return InMemorySessionStore(ttl_seconds=ttl_seconds, max_sessions=max_sessions)
+    if backend == "redis":
+        return RedisSessionStore(url=redis_url, ttl_seconds=ttl_seconds)
+    raise ValueError(f"Unknown SESSION_STORE_BACKEND '{backend}'. Use 'memory' or 'redis'.")
@@ -0,0 +1,142 @@
+# speculation.py
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class SpeculativeQuestionManager:
+    """
+    Tracks at most one speculatively generated next question per session.
+
+    A speculation is tagged with the length of the question history it was generated
+    from; it is only used if the history still has that length when the next question
+    is needed, otherwise it is stale and discarded. The number of speculations still
+    running is capped per worker so speculative work cannot crowd out real requests.
+
+    Speculations of sessions that are abandoned, expire or continue on another worker are never
+    taken: they are discarded ttl_seconds after being scheduled, and beyond max_entries the
+    oldest one is discarded.
+    """
+    def __init__(self, max_inflight: int = 16, on_discard: Optional[Callable[[str, Any], None]] = None,
+                 ttl_seconds: float = 3600, max_entries: int = 10000):
+        self.max_inflight = max_inflight
+        self.on_discard = on_discard # Called with (session_id, result) for completed but unused speculations
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        # Kept in scheduling order, so expired entries are at the front.
+        self._entries: "OrderedDict[str, Tuple[int, asyncio.Task]]" = OrderedDict()
+        self._scheduled_at: Dict[str, float] = {}
+        self.scheduled = 0
+        self.expired = 0
+        self.evicted = 0
+        self.skipped_at_capacity = 0
+        self.hits = 0
+        self.misses = 0
+        self.failed = 0
+        self.cancelled = 0
+
+    def _evict_expired(self):
+        now = time.monotonic()
+        while self._entries:
+            session_id = next(iter(self._entries))
+            if now - self._scheduled_at[session_id] < self.ttl_seconds:
+                break
+            self.cancel(session_id)
+            self.expired += 1
+
+    def inflight(self) -> int:
+        return sum(1 for _, task in self._entries.values() if not task.done())
+
+    def schedule(self, session_id: str, history_length: int, factory: Callable[[], Awaitable[Any]]) -> bool:
+        """Starts a speculation for session_id unless one already exists or the worker is at capacity."""
+        self._evict_expired()
+        existing = self._entries.get(session_id)
+        if existing is not None:
+            if existing[0] == history_length:
+                return False
+            self.cancel(session_id)
+        if self.inflight() >= self.max_inflight:
+            self.skipped_at_capacity += 1
+            return False
+        task = asyncio.create_task(factory())
+        task.add_done_callback(self._consume_exception)
+        self._entries[session_id] = (history_length, task)
+        self._scheduled_at[session_id] = time.monotonic()
+        self.scheduled += 1
+        while len(self._entries) > self.max_entries:
+            self.cancel(next(iter(self._entries)))
+            self.evicted += 1
+        return True
+
+    async def take(self, session_id: str, history_length: int) -> Optional[Any]:
+        """
+        Returns the speculative result for this history length (waiting for it if still
+        running), or None if there is no usable speculation.
+        """
+        self._evict_expired()
+        scheduled_at = self._scheduled_at.pop(session_id, None)
+        entry = self._entries.pop(session_id, None)
+        if entry is None:
+            self.misses += 1
+            return None
+        speculated_length, task = entry
+        if speculated_length != history_length:
+            self._discard(session_id, task)
+            self.misses += 1
+            return None
+        try:
+            result = await asyncio.shield(task)
+        except asyncio.CancelledError:
+            # The caller was cancelled, not the speculation: keep it for a retry of this turn.
+            if not task.cancelled() and session_id not in self._entries:
+                self._entries[session_id] = entry
+                self._scheduled_at[session_id] = scheduled_at
+            raise
+        except Exception as e:
+            logger.warning("Speculative question failed, generating synchronously: %s", e)
+            self.failed += 1
+            self.misses += 1
+            return None
+        self.hits += 1
+        return result
+
+    def cancel(self, session_id: str):
+        """Cancels/discards the speculation of a session (e.g. the interview was force-ended)."""
+        self._scheduled_at.pop(session_id, None)
+        entry = self._entries.pop(session_id, None)
+        if entry is not None:
+            self._discard(session_id, entry[1])
+
+    def _discard(self, session_id: str, task: asyncio.Task):
+        if not task.done():
+            task.cancel()
+            self.cancelled += 1
+        elif not task.cancelled() and task.exception() is None and self.on_discard is not None:
+            self.on_discard(session_id, task.result())
+
+    def _consume_exception(self, task: asyncio.Task):
+        # Speculations that are never taken should not log "exception was never retrieved".
+        if not task.cancelled():
+            task.exception()
+
+    def stats(self) -> Dict[str, Any]:
+        self._evict_expired()
+        lookups = self.hits + self.misses
+        return {
+            "inflight": self.inflight(),
+            "max_inflight": self.max_inflight,
+            "pending_results": sum(1 for _, task in self._entries.values() if task.done()),
+            "scheduled": self.scheduled,
+            "skipped_at_capacity": self.skipped_at_capacity,
+            "hits": self.hits,
+            "misses": self.misses,
+            "failed": self.failed,
+            "cancelled": self.cancelled,
+            "expired": self.expired,
+            "evicted": self.evicted,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+        }
@@ -0,0 +1,145 @@
+# structured_logging.py
+import atexit
+import contextvars
+import json
+import logging
+import logging.handlers
+import queue
+import random
+import sys
+import time
+from typing import Any, Dict, Optional
+
+# Correlation id of the interview being served. Set once per request; asyncio tasks started
+# from the request (TTS, speculation) inherit it, so their log lines carry the same session id.
+session_id_var: contextvars.ContextVar[str] = contextvars.ContextVar("session_id", default="-")
+
+# LogRecord attributes that are not user supplied `extra` fields.
+_RESERVED_ATTRIBUTES = set(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime", "session_id"}
+
+
+def bind_session(session_id: str):
+    """Tags all log lines of the current request (and tasks it starts) with the session id."""
+    session_id_var.set(session_id)
+
+
+def _truncate(value: Any, max_chars: int) -> Any:
+    if isinstance(value, (int, float, bool)) or value is None:
+        return value
+    text = value if isinstance(value, str) else str(value)
+    if len(text) <= max_chars:
+        return text
+    return f"{text[:max_chars]}... [{len(text) - max_chars} more chars]"
+
+
+class BoundedQueueHandler(logging.handlers.QueueHandler):
+    """
+    Non-blocking handler: the calling coroutine only truncates the record and puts it
+    on a bounded queue; formatting and stdout I/O happen on the listener thread.
+    Records are dropped (and counted) when the queue is full instead of blocking.
+
+    Fields larger than max_field_chars are truncated, and the verbose `payload` field
+    (raw LLM responses, resume JSON) is only kept for a sample of the records.
+    """
+    def __init__(self, log_queue: queue.Queue, max_field_chars: int = 500, payload_sample_rate: float = 0.01):
+        super().__init__(log_queue)
+        self.max_field_chars = max_field_chars
+        self.payload_sample_rate = payload_sample_rate
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record.msg = _truncate(record.getMessage(), self.max_field_chars)
+        record.args = None
+        record.session_id = session_id_var.get()
+        if record.exc_info:
+            # Tracebacks are bounded too (the tail has the raising frame).
+            traceback_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_text = traceback_text[-self.max_field_chars * 4:]
+            record.exc_info = None
+        if hasattr(record, "payload"):
+            if random.random() < self.payload_sample_rate:
+                record.payload = _truncate(record.payload, self.max_field_chars * 4)
+            else:
+                del record.payload
+        for key, value in list(vars(record).items()):
+            if key not in _RESERVED_ATTRIBUTES and key != "payload":
+                setattr(record, key, _truncate(value, self.max_field_chars))
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class JSONFormatter(logging.Formatter):
+    """One JSON object per line: ts, level, logger, session_id, msg and any extra fields."""
+    def format(self, record: logging.LogRecord) -> str:
+        entry: Dict[str, Any] = {
+            "ts": time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(record.created)) + f".{int(record.msecs):03d}Z",
+            "level": record.levelname,
+            "logger": record.name,
+            "session_id": getattr(record, "session_id", "-"),
+            "msg": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RESERVED_ATTRIBUTES:
+                entry[key] = value
+        if record.exc_text:
+            entry["exc"] = record.exc_text
+        return json.dumps(entry, default=str)
+
+
+class TextFormatter(logging.Formatter):
+    """Human readable variant for local development."""
+    def __init__(self):
+        super().__init__("%(asctime)s %(levelname)-7s %(name)s [%(session_id)s] %(message)s")
+
+    def format(self, record: logging.LogRecord) -> str:
+        if not hasattr(record, "session_id"):
+            record.session_id = "-"
+        line = super().format(record)
+        extras = {key: value for key, value in vars(record).items() if key not in _RESERVED_ATTRIBUTES}
+        return f"{line} {json.dumps(extras, default=str)}" if extras else line
+
+
+_listener: Optional[logging.handlers.QueueListener] = None
+_queue_handler: Optional[BoundedQueueHandler] = None
+
+
+def setup_logging(level: str = "INFO", log_format: str = "json", max_field_chars: int = 500,
+                  payload_sample_rate: float = 0.01, queue_size: int = 10000) -> BoundedQueueHandler:
+    """
+    Routes all application logging through a bounded queue to a background thread writing to stdout.
+    Idempotent: a second call returns the handler installed by the first one.
+    """
+    global _listener, _queue_handler
+    if _queue_handler is not None:
+        return _queue_handler
+
+    log_queue: queue.Queue = queue.Queue(maxsize=queue_size)
+    stream_handler = logging.StreamHandler(sys.stdout)
+    stream_handler.setFormatter(JSONFormatter() if log_format == "json" else TextFormatter())
+    _queue_handler = BoundedQueueHandler(log_queue, max_field_chars=max_field_chars, payload_sample_rate=payload_sample_rate)
+
+    root = logging.getLogger()
+    root.handlers = [_queue_handler]
+    root.setLevel(level.upper())
+    # httpx logs every request at INFO; Groq calls are already covered by our own records and metrics.
+    logging.getLogger("httpx").setLevel(max(root.level, logging.WARNING))
+
+    _listener = logging.handlers.QueueListener(log_queue, stream_handler, respect_handler_level=True)
+    _listener.start()
+    atexit.register(_listener.stop) # Flushes queued records on shutdown
+    return _queue_handler
+
+
+def logging_stats() -> Dict[str, Any]:
+    if _queue_handler is None:
+        return {"enabled": False}
+    return {
+        "enabled": True,
+        "queued": _queue_handler.queue.qsize(),
+        "dropped": _queue_handler.dropped,
+    }
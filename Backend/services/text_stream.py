@@ -0,0 +1,94 @@
+# text_stream.py
+import re
+from typing import List, Optional
+
+# Sentence end: terminal punctuation (optionally followed by a closing quote/bracket) and whitespace.
+_SENTENCE_END = re.compile(r"[.!?][\"')\]]*\s+")
+# "SCORE: 0.7", tolerating markdown emphasis and "/1.0" suffixes.
+_SCORE_LINE = re.compile(r"^[\s*_#>-]*score[\s*_]*[:=][\s*_]*(\d+(?:\.\d+)?)", re.IGNORECASE)
+_SCORE_LINE_PREFIX_CHARS = " \t*_#>-"
+# Words whose trailing period does not end a sentence.
+_ABBREVIATIONS = {"e.g.", "i.e.", "etc.", "vs.", "mr.", "mrs.", "ms.", "dr.", "prof.", "sr.", "jr.", "inc.", "ltd.", "approx.", "no."}
+
+
+class SentenceBuffer:
+    """
+    Cuts a stream of text deltas (LLM tokens) into sentences as soon as they are complete,
+    so each sentence can be synthesized while the rest of the text is still being generated.
+    Sentences shorter than min_chars are merged with the next one to avoid choppy audio.
+    """
+    def __init__(self, min_chars: int = 24):
+        self.min_chars = min_chars
+        self._text = ""
+
+    def feed(self, delta: str) -> List[str]:
+        """Adds a text delta; returns the sentences completed by it."""
+        self._text += delta
+        sentences = []
+        start = 0
+        for match in _SENTENCE_END.finditer(self._text):
+            candidate = self._text[start:match.end()].strip()
+            last_word = candidate.split()[-1].lower() if candidate else ""
+            if len(candidate) < self.min_chars or last_word in _ABBREVIATIONS:
+                continue
+            sentences.append(candidate)
+            start = match.end()
+        self._text = self._text[start:]
+        return sentences
+
+    def flush(self) -> str:
+        """Returns the remaining (unterminated) text and resets the buffer."""
+        remainder, self._text = self._text.strip(), ""
+        return remainder
+
+
+class TrailingScoreParser:
+    """
+    Splits a streamed "<feedback text>\nSCORE: <number>" completion into feedback text and the score.
+    Text is passed through as soon as its line can no longer be the score line;
+    only a line that starts like "SCORE" is held back until it is complete.
+    """
+    def __init__(self):
+        self.score: Optional[float] = None
+        self._line = "" # Undecided start of the current line
+        self._passing_line = False # The current line is known to be feedback
+
+    def _take_score_line(self, line: str) -> bool:
+        match = _SCORE_LINE.match(line)
+        if match is None:
+            return False
+        try:
+            self.score = float(match.group(1))
+        except ValueError:
+            return False
+        return True
+
+    def feed(self, delta: str) -> str:
+        """Adds a text delta; returns the feedback text that can be emitted now."""
+        output = []
+        for char in delta:
+            if self._passing_line:
+                output.append(char)
+                if char == "\n":
+                    self._passing_line = False
+                continue
+            self._line += char
+            if char == "\n":
+                if not self._take_score_line(self._line):
+                    output.append(self._line)
+                self._line = ""
+                continue
+            head = self._line.lstrip(_SCORE_LINE_PREFIX_CHARS).upper()
+            if not (head.startswith("SCORE") or "SCORE".startswith(head)):
+                output.append(self._line)
+                self._line = ""
+                self._passing_line = True
+        return "".join(output)
+
+    def finish(self) -> str:
+        """Flushes the last line; returns it unless it was the score line."""
+        line, self._line = self._line, ""
+        self._passing_line = False
+        if self._take_score_line(line):
+            return ""
+        return line
@@ -0,0 +1,107 @@
+# tts_cache.py
+import hashlib
+import logging
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+def tts_cache_key(text: str, lang: str = "en", slow: bool = False, tld: str = "com") -> str:
+    """Content-addressed key for a synthesized clip: hash of the text and all voice settings."""
+    material = f"{lang}|{tld}|{int(slow)}|{text}"
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+class TTSCache:
+    """
+    Two-tier cache for synthesized TTS audio (MP3 bytes).
+    - Memory tier: LRU bounded by entry count and total bytes.
+    - Disk tier (optional): one <key>.mp3 file per clip under disk_dir, shared by
+      restarts and by all workers on the same host.
+    Disk methods are blocking and should be called from the blocking pool.
+    """
+    def __init__(self, max_entries: int = 256, max_bytes: int = 64 * 1024 * 1024, disk_dir: Optional[str] = None):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.disk_dir = disk_dir or None
+        self._entries: "OrderedDict[str, bytes]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        if self.disk_dir:
+            os.makedirs(self.disk_dir, exist_ok=True)
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Memory tier lookup. Does not count a miss, since the disk tier may still hit."""
+        with self._lock:
+            audio = self._entries.get(key)
+            if audio is not None:
+                self._entries.move_to_end(key)
+                self.memory_hits += 1
+            return audio
+
+    def get_from_disk(self, key: str) -> Optional[bytes]:
+        """Disk tier lookup; a hit is promoted into the memory tier."""
+        if not self.disk_dir:
+            return None
+        path = os.path.join(self.disk_dir, f"{key}.mp3")
+        try:
+            with open(path, "rb") as f:
+                audio = f.read()
+        except OSError:
+            return None
+        with self._lock:
+            self.disk_hits += 1
+        self.put(key, audio)
+        return audio
+
+    def record_miss(self):
+        with self._lock:
+            self.misses += 1
+
+    def put(self, key: str, audio: bytes):
+        """Stores audio in the memory tier, evicting least recently used clips."""
+        if len(audio) > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._bytes -= len(self._entries.pop(key))
+            self._entries[key] = audio
+            self._bytes += len(audio)
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= len(evicted)
+                self.evictions += 1
+
+    def write_to_disk(self, key: str, audio: bytes):
+        """Persists audio to the disk tier (atomic rename, so readers never see partial files)."""
+        if not self.disk_dir:
+            return
+        path = os.path.join(self.disk_dir, f"{key}.mp3")
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, "wb") as f:
+                f.write(audio)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning("Could not write TTS cache entry to disk: %s", e)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.memory_hits + self.disk_hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": round((self.memory_hits + self.disk_hits) / lookups, 3) if lookups else 0.0,
+                "disk_tier": bool(self.disk_dir),
+            }
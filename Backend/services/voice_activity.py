@@ -0,0 +1,210 @@
+# voice_activity.py
+import asyncio
+import io
+import logging
+import shutil
+import time
+import wave
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Answer audio is analyzed as 16 kHz mono, in frames of 30 ms.
+SAMPLE_RATE = 16000
+FRAME_SECONDS = 0.03
+# A frame is speech if it is this much louder than the recording's noise floor (and above the absolute threshold).
+NOISE_FLOOR_MARGIN_DB = 10.0
+FFMPEG_TIMEOUT_SECONDS = 20.0
+
+# Containers whose packets ffmpeg can cut without re-encoding, by magic bytes.
+_CONTAINERS = ((b"\x1a\x45\xdf\xa3", "webm"), (b"OggS", "ogg"))
+_CONTENT_TYPES = {"wav": "audio/wav", "webm": "audio/webm", "ogg": "audio/ogg"}
+
+
+class SpeechDetection:
+    """Result of a voice activity pass over a recording (times in seconds)."""
+    def __init__(self, duration: float, speech_seconds: float, speech_start: float, speech_end: float):
+        self.duration = duration
+        self.speech_seconds = speech_seconds
+        self.speech_start = speech_start
+        self.speech_end = speech_end
+
+
+def frame_energies_dbfs(samples: np.ndarray, sample_rate: int = SAMPLE_RATE, frame_seconds: float = FRAME_SECONDS) -> np.ndarray:
+    """RMS level (dBFS) of each full frame of float samples in [-1, 1]."""
+    frame_length = max(1, int(sample_rate * frame_seconds))
+    frame_count = len(samples) // frame_length
+    if frame_count == 0:
+        return np.empty(0, dtype=np.float32)
+    frames = samples[:frame_count * frame_length].reshape(frame_count, frame_length)
+    rms = np.sqrt(np.mean(np.square(frames, dtype=np.float32), axis=1))
+    return 20.0 * np.log10(np.maximum(rms, 1e-6))
+
+
+def detect_speech(samples: np.ndarray, sample_rate: int = SAMPLE_RATE, threshold_dbfs: float = -45.0) -> SpeechDetection:
+    """
+    Energy-based voice activity detection. The threshold adapts to the recording: frames count as
+    speech when they are above threshold_dbfs and NOISE_FLOOR_MARGIN_DB above the noise floor (the
+    10th percentile frame level), so steady background noise is not mistaken for speech.
+    """
+    energies = frame_energies_dbfs(samples, sample_rate)
+    duration = len(samples) / sample_rate
+    if len(energies) == 0:
+        return SpeechDetection(duration, 0.0, 0.0, 0.0)
+    threshold = max(threshold_dbfs, float(np.percentile(energies, 10)) + NOISE_FLOOR_MARGIN_DB)
+    speech_frames = np.flatnonzero(energies > threshold)
+    if len(speech_frames) == 0:
+        return SpeechDetection(duration, 0.0, 0.0, 0.0)
+    return SpeechDetection(duration, len(speech_frames) * FRAME_SECONDS,
+                           speech_frames[0] * FRAME_SECONDS, (speech_frames[-1] + 1) * FRAME_SECONDS)
+
+
+def decode_wav(audio: bytes) -> Optional[Tuple[np.ndarray, Any]]:
+    """Mono float samples and parameters of a 16-bit PCM WAV file, or None for other formats."""
+    try:
+        with wave.open(io.BytesIO(audio)) as wav:
+            params = wav.getparams()
+            if params.sampwidth != 2:
+                return None
+            pcm = np.frombuffer(wav.readframes(params.nframes), dtype="<i2")
+    except (wave.Error, EOFError):
+        return None
+    samples = pcm.reshape(-1, params.nchannels).mean(axis=1) / 32768.0
+    return samples.astype(np.float32), params
+
+
+def trim_wav(audio: bytes, params: Any, start: float, end: float) -> bytes:
+    """The WAV file cut to [start, end) seconds."""
+    with wave.open(io.BytesIO(audio)) as wav:
+        wav.setpos(int(start * params.framerate))
+        frames = wav.readframes(int((end - start) * params.framerate))
+    output = io.BytesIO()
+    with wave.open(output, "wb") as trimmed:
+        trimmed.setnchannels(params.nchannels)
+        trimmed.setsampwidth(params.sampwidth)
+        trimmed.setframerate(params.framerate)
+        trimmed.writeframes(frames)
+    return output.getvalue()
+
+
+def container_format(audio: bytes) -> Optional[str]:
+    for magic, name in _CONTAINERS:
+        if audio.startswith(magic):
+            return name
+    return None
+
+
+def audio_file_type(audio: bytes) -> Tuple[str, str]:
+    """(filename, content type) of a recording for the STT upload: WAV, Ogg or WebM (the browser default)."""
+    audio_format = "wav" if audio.startswith(b"RIFF") else container_format(audio) or "webm"
+    return f"audio.{audio_format}", _CONTENT_TYPES[audio_format]
+
+
+class VoiceActivityDetector:
+    """
+    Local voice activity detection on answer audio before it is sent to Whisper:
+    - silent answers (no speech frames beyond min_speech_seconds) skip STT and the evaluation entirely
+    - leading and trailing silence longer than min_trim_seconds is cut off (keeping padding_seconds
+      around the speech), so fewer bytes are uploaded and transcribed
+
+    WAV is decoded natively. Compressed recordings (WebM/Opus from the browser) are decoded with
+    ffmpeg and cut without re-encoding; without ffmpeg on the PATH they are passed through unanalyzed.
+    Analysis runs on blocking_pool if one is given.
+    """
+    def __init__(self, threshold_dbfs: float = -45.0, min_speech_seconds: float = 0.3, padding_seconds: float = 0.3,
+                 min_trim_seconds: float = 1.0, blocking_pool: Any = None, ffmpeg_path: Optional[str] = None):
+        self.threshold_dbfs = threshold_dbfs
+        self.min_speech_seconds = min_speech_seconds
+        self.padding_seconds = padding_seconds
+        self.min_trim_seconds = min_trim_seconds
+        self.blocking_pool = blocking_pool
+        self.ffmpeg_path = ffmpeg_path or shutil.which("ffmpeg")
+        if self.ffmpeg_path is None:
+            logger.warning("ffmpeg not found; only WAV answer audio is checked for speech.")
+        self.analyzed = 0
+        self.silent = 0
+        self.trimmed = 0
+        self.undecoded = 0
+        self.bytes_saved = 0
+
+    async def _run(self, func, *args):
+        if self.blocking_pool is not None:
+            return await self.blocking_pool.run(func, *args)
+        return func(*args)
+
+    async def _ffmpeg(self, audio: bytes, *args: str) -> Optional[bytes]:
+        process = await asyncio.create_subprocess_exec(
+            self.ffmpeg_path, "-nostdin", "-loglevel", "error", "-i", "pipe:0", *args, "pipe:1",
+            stdin=asyncio.subprocess.PIPE, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
+        )
+        try:
+            stdout, stderr = await asyncio.wait_for(process.communicate(audio), FFMPEG_TIMEOUT_SECONDS)
+        except asyncio.TimeoutError:
+            process.kill()
+            await process.wait()
+            logger.warning("ffmpeg timed out on answer audio.", extra={"bytes": len(audio)})
+            return None
+        if process.returncode != 0:
+            logger.warning("ffmpeg could not process answer audio.", extra={"bytes": len(audio), "detail": stderr.decode(errors="replace")[-300:]})
+            return None
+        return stdout
+
+    async def prepare(self, audio: bytes) -> Tuple[bytes, Optional[bool]]:
+        """
+        Returns (audio to transcribe, has_speech). has_speech is None when the audio could not be
+        decoded; it is then transcribed unchanged.
+        """
+        started = time.perf_counter()
+        wav = await self._run(decode_wav, audio) if audio.startswith(b"RIFF") else None
+        container = None
+        if wav is not None:
+            samples, params = wav
+            sample_rate = params.framerate
+        else:
+            container = container_format(audio)
+            pcm = await self._ffmpeg(audio, "-f", "s16le", "-ac", "1", "-ar", str(SAMPLE_RATE)) if self.ffmpeg_path else None
+            if not pcm:
+                self.undecoded += 1
+                return audio, None
+            samples = np.frombuffer(pcm[:len(pcm) - len(pcm) % 2], dtype="<i2").astype(np.float32) / 32768.0
+            sample_rate = SAMPLE_RATE
+
+        detection = await self._run(detect_speech, samples, sample_rate, self.threshold_dbfs)
+        self.analyzed += 1
+        if detection.speech_seconds < self.min_speech_seconds:
+            self.silent += 1
+            logger.info("No speech detected in answer audio.", extra={"duration_s": round(detection.duration, 2),
+                                                                       "speech_s": round(detection.speech_seconds, 2)})
+            return audio, False
+
+        start = max(0.0, detection.speech_start - self.padding_seconds)
+        end = min(detection.duration, detection.speech_end + self.padding_seconds)
+        if start + (detection.duration - end) < self.min_trim_seconds:
+            return audio, True
+        if wav is not None:
+            trimmed = await self._run(trim_wav, audio, params, start, end)
+        elif container is not None:
+            # Packet-level cut without re-encoding; Whisper accepts the shorter container as is.
+            trimmed = await self._ffmpeg(audio, "-ss", f"{start:.3f}", "-to", f"{end:.3f}", "-c", "copy", "-f", container)
+        else:
+            trimmed = None
+        if not trimmed or len(trimmed) >= len(audio):
+            return audio, True
+        self.trimmed += 1
+        self.bytes_saved += len(audio) - len(trimmed)
+        logger.debug("Trimmed silence from answer audio.", extra={"start_s": round(start, 2), "end_s": round(end, 2),
+                                                                   "bytes": len(audio), "trimmed_bytes": len(trimmed),
+                                                                   "ms": round(1000 * (time.perf_counter() - started), 1)})
+        return trimmed, True
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "ffmpeg": self.ffmpeg_path is not None,
+            "analyzed": self.analyzed,
+            "silent": self.silent,
+            "trimmed": self.trimmed,
+            "undecoded": self.undecoded,
+            "bytes_saved": self.bytes_saved,
+        }
@@ -0,0 +1,68 @@
+# ws_channel.py
+import asyncio
+import json
+import logging
+import time
+from typing import Any, Dict, Optional, Union
+
+from services.metrics import PAYLOAD_BYTES, WEBSOCKET_SEND_WAIT_SECONDS
+
+logger = logging.getLogger(__name__)
+
+
+class WebSocketSender:
+    """
+    Outbound side of an interview WebSocket, with backpressure: messages go through a bounded queue
+    drained by a single task, so producers (turn events, question audio) wait when the client reads
+    slowly instead of buffering without limit. Text messages are JSON objects, binary messages audio.
+    """
+    def __init__(self, websocket, max_queued: int = 32):
+        self.websocket = websocket
+        self._queue: "asyncio.Queue[Optional[Union[str, bytes]]]" = asyncio.Queue(maxsize=max_queued)
+        self.task: Optional[asyncio.Task] = None
+        self.messages_sent = 0
+        self.bytes_sent = 0
+
+    def start(self) -> asyncio.Task:
+        self.task = asyncio.create_task(self._run())
+        return self.task
+
+    async def _run(self):
+        while (message := await self._queue.get()) is not None:
+            if isinstance(message, bytes):
+                await self.websocket.send_bytes(message)
+            else:
+                await self.websocket.send_text(message)
+            self.messages_sent += 1
+            self.bytes_sent += len(message)
+
+    async def _put(self, message: Union[str, bytes]):
+        if self._queue.full():
+            started = time.perf_counter()
+            await self._queue.put(message)
+            WEBSOCKET_SEND_WAIT_SECONDS.observe(time.perf_counter() - started)
+        else:
+            self._queue.put_nowait(message)
+
+    async def send_json(self, data: Dict[str, Any]):
+        message = json.dumps(data)
+        PAYLOAD_BYTES.observe(len(message), kind="ws_message")
+        await self._put(message)
+
+    async def send_bytes(self, data: bytes):
+        await self._put(data)
+
+    async def close(self, timeout: float = 5.0):
+        """Sends the queued messages (waiting at most timeout seconds for the client), then stops."""
+        if self.task is None or self.task.done():
+            return
+        try:
+            await asyncio.wait_for(self._drain(), timeout)
+        except asyncio.TimeoutError:
+            logger.warning("WebSocket client did not read the remaining messages.", extra={"queued": self._queue.qsize()})
+            self.task.cancel()
+            await asyncio.gather(self.task, return_exceptions=True)
+
+    async def _drain(self):
+        await self._queue.put(None)
+        await self.task
@@ -11,15 +11,12 @@ function App() {
   const [interviewResult, setInterviewResult] = useState(null);
   const [initialQuestionData, setInitialQuestionData] = useState(null);
 
-  const handleStartInterview = (parsedData, selectedDomain, newSessionId, firstQuestion, firstQuestionAudioRawBase64) => {
+  const handleStartInterview = (parsedData, selectedDomain, newSessionId, firstQuestion, firstQuestionAudioUrl) => {
     setResumeData(parsedData);
     setDomain(selectedDomain);
     setSessionId(newSessionId);
     
-    // CRITICAL FIX: Prepend the data URI prefix to the raw base64 audio string
-    const formattedAudioUrl = `data:audio/mpeg;base64,${firstQuestionAudioRawBase64}`;
-    
-    setInitialQuestionData({ question: firstQuestion, audio_base64: formattedAudioUrl });
+    setInitialQuestionData({ question: firstQuestion, audio_url: firstQuestionAudioUrl });
     setStage('interview'); 
   };
 
@@ -54,7 +51,7 @@ function App() {
             domain={domain}
             sessionId={sessionId}
             initialQuestion={initialQuestionData.question}
-            initialAudioUrl={initialQuestionData.audio_base64} // This will now be a full data URI
+            initialAudioUrl={initialQuestionData.audio_url} // Absolute URL of the streamed question audio
             onEndInterview={handleEndInterview}
           />
         )}
@@ -2,12 +2,27 @@ import React, { useState, useEffect, useRef, useCallback } from 'react';
 import { StopIcon, ArrowPathIcon, SpeakerWaveIcon, HandRaisedIcon } from '@heroicons/react/24/solid';
 
 const INTERVIEW_TIME_LIMIT_MS = 5 * 60 * 1000; // 5 minutes
+// The answer is recorded in segments of this length. Each completed segment is uploaded (and transcribed
+// by the backend) while the candidate keeps talking, so submitting only sends the last, partial segment.
+const ANSWER_SEGMENT_MS = 15 * 1000;
+const API_BASE_URL = 'http://127.0.0.1:8000';
+
+// On slow connections (or with data saver on), asks the backend for smaller question audio:
+// Opus/WebM where the browser can play it, low-bitrate MP3 otherwise. Fast connections get the default MP3.
+function withQuestionAudioFormat(audioUrl) {
+  const connection = navigator.connection;
+  const slowLink = connection && (connection.saveData || ['slow-2g', '2g', '3g'].includes(connection.effectiveType));
+  if (!slowLink) return audioUrl;
+  const format = new Audio().canPlayType('audio/webm; codecs="opus"') ? 'opus' : 'mp3-low';
+  return `${audioUrl}${audioUrl.includes('?') ? '&' : '?'}format=${format}`;
+}
 
 function InterviewPanel({ sessionId, initialQuestion, initialAudioUrl, onEndInterview }) {
   const [currentQuestion, setCurrentQuestion] = useState(null);
   const [questionAudioUrl, setQuestionAudioUrl] = useState(null);
   const [isRecording, setIsRecording] = useState(false);
   const [transcript, setTranscript] = useState('');
+  const [feedback, setFeedback] = useState('');
   const [isLoading, setIsLoading] = useState(true);
   const [interviewStatus, setInterviewStatus] = useState('Preparing interview...');
   const [error, setError] = useState('');
@@ -17,6 +32,9 @@ function InterviewPanel({ sessionId, initialQuestion, initialAudioUrl, onEndInte
 
   const mediaRecorderRef = useRef(null);
   const audioChunksRef = useRef([]);
+  const segmentIntervalRef = useRef(null);
+  const segmentCountRef = useRef(0); // Segments of the current answer handed to uploadAnswerSegment
+  const segmentUploadsRef = useRef([]); // Their upload promises ({ index, blob, uploaded }), awaited before the answer is submitted
   const answerTimerRef = useRef(null);
   const countdownIntervalRef = useRef(null);
   const audioRef = useRef(new Audio());
@@ -26,14 +44,42 @@ function InterviewPanel({ sessionId, initialQuestion, initialAudioUrl, onEndInte
   const clearAnswerTimer = useCallback(() => {
     clearTimeout(answerTimerRef.current);
     clearInterval(countdownIntervalRef.current);
+    clearInterval(segmentIntervalRef.current);
     answerTimerRef.current = null;
     countdownIntervalRef.current = null;
+    segmentIntervalRef.current = null;
     setTimeLeft(INTERVIEW_TIME_LIMIT_MS / 1000);
     console.log("Frontend: Answer timer and countdown cleared.");
   }, []);
 
   // --- API Interaction ---
-  const sendAnswerToServer = useCallback(async (audioBlob, isTimeout = false, forceEnd = false) => {
+  const uploadAnswerSegment = useCallback(async (segmentBlob, index, questionId) => {
+    const formData = new FormData();
+    formData.append('audio_file', segmentBlob, `segment-${index}.webm`);
+    formData.append('session_id', sessionId);
+    formData.append('question_id', questionId);
+    formData.append('index', index);
+    try {
+      const response = await fetch(`${API_BASE_URL}/answer-audio/segment`, {
+        method: 'POST',
+        body: formData,
+      });
+      if (!response.ok) {
+        const errorData = await response.json();
+        throw new Error(errorData.detail || 'Failed to upload answer segment.');
+      }
+      console.log("Frontend: Uploaded answer segment", index);
+      return true;
+    } catch (err) {
+      // The segment is uploaded again before the answer is submitted; the backend rejects answers with missing segments.
+      console.error('Frontend Error: Error uploading answer segment:', index, err);
+      return false;
+    }
+  }, [sessionId]);
+
+  // segments: the answer's uploaded segments ({ index, blob }), kept so that missing ones can be uploaded again.
+  const sendAnswerToServer = useCallback(async (audioBlob, isTimeout = false, forceEnd = false, segments = [], isRetry = false) => {
+    const segmentCount = segments.length;
     setIsLoading(true);
     setInterviewStatus("Processing your answer...");
     setError('');
@@ -46,11 +92,16 @@ function InterviewPanel({ sessionId, initialQuestion, initialAudioUrl, onEndInte
     formData.append('question_id', currentQuestion?.id);
     formData.append('is_timeout', isTimeout);
     formData.append('force_end', forceEnd);
+    formData.append('segment_count', segmentCount);
 
-    console.log("Frontend: Sending answer. Timeout:", isTimeout, "Force End:", forceEnd, "Question ID:", currentQuestion?.id);
+    console.log("Frontend: Sending answer. Timeout:", isTimeout, "Force End:", forceEnd, "Segments:", segmentCount, "Question ID:", currentQuestion?.id);
+    setTranscript('');
+    setFeedback('');
     let responseData = null;
+    let retrying = false;
     try {
-      const response = await fetch('http://127.0.0.1:8000/submit-answer', {
+      // Server-sent events: transcript, feedback deltas, score, then the next question or the final evaluation.
+      const response = await fetch(`${API_BASE_URL}/submit-answer/stream`, {
         method: 'POST',
         body: formData,
       });
@@ -58,38 +109,125 @@ function InterviewPanel({ sessionId, initialQuestion, initialAudioUrl, onEndInte
         const errorData = await response.json();
         throw new Error(errorData.detail || 'Failed to submit answer.');
       }
-      responseData = await response.json();
+
+      const reader = response.body.getReader();
+      const decoder = new TextDecoder();
+      let buffer = '';
+      while (!responseData) {
+        const { value, done } = await reader.read();
+        if (done) {
+          throw new Error('The connection closed before the answer was processed.');
+        }
+        buffer += decoder.decode(value, { stream: true });
+        let boundary;
+        while (!responseData && (boundary = buffer.indexOf('\n\n')) !== -1) {
+          const rawEvent = buffer.slice(0, boundary);
+          buffer = buffer.slice(boundary + 2);
+          const eventName = (rawEvent.match(/^event: (.*)$/m) || [])[1];
+          const eventData = JSON.parse((rawEvent.match(/^data: (.*)$/m) || [])[1] || '{}');
+
+          if (eventName === 'transcript') {
+            setTranscript(eventData.transcript || (isTimeout ? 'Answer timed out.' : 'No speech detected.'));
+            setInterviewStatus('Evaluating your answer...');
+          } else if (eventName === 'feedback') {
+            setFeedback(prev => prev + eventData.delta);
+          } else if (eventName === 'score') {
+            setFeedback(eventData.feedback);
+            setInterviewStatus('Answer evaluated. Preparing the next step...');
+          } else if (eventName === 'error') {
+            const eventError = new Error(eventData.detail || 'Failed to submit answer.');
+            eventError.missingSegments = eventData.missing_segments;
+            throw eventError;
+          } else if (eventName === 'question' || eventName === 'overall_evaluation') {
+            responseData = eventData;
+          }
+        }
+      }
+      reader.cancel();
       console.log('Frontend: Submit answer response:', responseData);
-      setTranscript(responseData.transcript || (isTimeout ? 'Answer timed out.' : 'No speech detected.'));
-      setInterviewStatus(responseData.message || 'Answer processed.');
 
       if (responseData.next_action === 'next_question' && responseData.question) {
+        setInterviewStatus("Answer processed. Here's your next question.");
         setCurrentQuestion(responseData.question);
-        setQuestionAudioUrl(`data:audio/mpeg;base64,${responseData.audio_base64}`);
+        setQuestionAudioUrl(`${API_BASE_URL}${responseData.audio_url}`);
         setIsRecording(false); // Reset for next question
         audioPlayedForCurrentQuestionRef.current = false; // Reset for the new question's audio
       } else if (responseData.next_action === 'end_interview') {
+        setInterviewStatus('Interview completed! Here is your performance report.');
         setInterviewComplete(true);
         onEndInterview(responseData.overall_evaluation);
       }
     } catch (err) {
+      if (err.missingSegments && !isRetry) {
+        // The backend never received these segments (nothing was recorded yet): upload them again and resubmit once.
+        console.warn('Frontend: Answer segments missing on the server, uploading again:', err.missingSegments);
+        retrying = true;
+        await Promise.all(err.missingSegments.filter(index => segments[index])
+          .map(index => uploadAnswerSegment(segments[index].blob, index, currentQuestion?.id)));
+        await sendAnswerToServer(audioBlob, isTimeout, forceEnd, segments, true);
+        return;
+      }
       console.error('Frontend Error: Error sending answer:', err);
       setError(err.message || 'An unexpected error occurred.');
       setInterviewStatus("Interview interrupted due to an error.");
       setIsRecording(false);
     } finally {
-      if (!(responseData && responseData.next_action === 'next_question' && responseData.question) && !interviewComplete) {
+      if (!retrying && !(responseData && responseData.next_action === 'next_question' && responseData.question) && !interviewComplete) {
         setIsLoading(false);
       }
       console.log("Frontend: Finished sending answer processing.");
     }
-  }, [sessionId, currentQuestion, onEndInterview]);
+  }, [sessionId, currentQuestion, onEndInterview, uploadAnswerSegment]);
 
   // --- Recording and Timer Logic ---
+  // Starts a new MediaRecorder (one per answer segment) on the microphone stream.
+  const startSegmentRecorder = useCallback((stream) => {
+    const chunks = [];
+    const recorder = new MediaRecorder(stream, { mimeType: 'audio/webm' });
+    recorder.ondataavailable = (event) => {
+      if (event.data.size > 0) chunks.push(event.data);
+    };
+    mediaRecorderRef.current = recorder;
+    audioChunksRef.current = chunks;
+    recorder.start();
+  }, []);
+
+  // Closes the current segment and keeps recording into a new one. Each recorder produces a complete
+  // WebM file, which the backend can transcribe on its own. The next recorder starts before the previous
+  // one stops, so no speech is lost between segments.
+  const rotateAnswerSegment = useCallback(() => {
+    const previousRecorder = mediaRecorderRef.current;
+    if (!previousRecorder || previousRecorder.state !== "recording") return;
+    const previousChunks = audioChunksRef.current;
+    const index = segmentCountRef.current;
+    const questionId = currentQuestion?.id;
+    segmentCountRef.current += 1;
+    startSegmentRecorder(previousRecorder.stream);
+    segmentUploadsRef.current.push(new Promise(resolve => {
+      previousRecorder.onstop = () => {
+        const blob = new Blob(previousChunks, { type: 'audio/webm' });
+        uploadAnswerSegment(blob, index, questionId).then(uploaded => resolve({ index, blob, uploaded }));
+      };
+    }));
+    previousRecorder.stop();
+  }, [currentQuestion, startSegmentRecorder, uploadAnswerSegment]);
+
   const handleStopAndSubmit = useCallback((isTimeout = false, forceEnd = false) => {
     console.log(`Frontend: handleStopAndSubmit called. isTimeout: ${isTimeout}, forceEnd: ${forceEnd}, isRecording: ${isRecording}`);
     clearAnswerTimer();
 
+    // Only the audio after the last uploaded segment is sent with the answer.
+    const submitAfterSegmentUploads = async (audioBlob) => {
+      const segmentUploads = segmentUploadsRef.current;
+      segmentCountRef.current = 0;
+      segmentUploadsRef.current = [];
+      const segments = await Promise.all(segmentUploads);
+      // Segments whose upload failed get one more attempt before the answer is submitted.
+      await Promise.all(segments.filter(segment => !segment.uploaded)
+        .map(segment => uploadAnswerSegment(segment.blob, segment.index, currentQuestion?.id)));
+      sendAnswerToServer(audioBlob, isTimeout, forceEnd, segments);
+    };
+
     if (isRecording && mediaRecorderRef.current && mediaRecorderRef.current.state === "recording") {
       mediaRecorderRef.current.onstop = () => {
         const audioBlob = audioChunksRef.current.length > 0 ? new Blob(audioChunksRef.current, { type: 'audio/webm' }) : null;
@@ -97,7 +235,7 @@ function InterviewPanel({ sessionId, initialQuestion, initialAudioUrl, onEndInte
             mediaRecorderRef.current.stream.getTracks().forEach(track => track.stop());
         }
         console.log(`Frontend: Recording stopped. Submitting. Timeout: ${isTimeout}, Force End: ${forceEnd}`);
-        sendAnswerToServer(audioBlob, isTimeout, forceEnd);
+        submitAfterSegmentUploads(audioBlob);
         audioChunksRef.current = [];
         if (mediaRecorderRef.current) mediaRecorderRef.current.onstop = null;
       };
@@ -105,11 +243,11 @@ function InterviewPanel({ sessionId, initialQuestion, initialAudioUrl, onEndInte
     } else {
       const audioBlob = audioChunksRef.current.length > 0 ? new Blob(audioChunksRef.current, { type: 'audio/webm' }) : null;
       console.log(`Frontend: Not actively recording, but submitting. Timeout: ${isTimeout}, Force End: ${forceEnd}`);
-      sendAnswerToServer(audioBlob, isTimeout, forceEnd);
+      submitAfterSegmentUploads(audioBlob);
       audioChunksRef.current = [];
     }
     setIsRecording(false);
-  }, [isRecording, clearAnswerTimer, sendAnswerToServer]);
+  }, [isRecording, clearAnswerTimer, sendAnswerToServer, uploadAnswerSegment, currentQuestion]);
 
   const startAnswerTimer = useCallback(() => {
     clearAnswerTimer();
@@ -143,26 +281,20 @@ function InterviewPanel({ sessionId, initialQuestion, initialAudioUrl, onEndInte
     }
 
     setTranscript('');
+    setFeedback('');
     audioChunksRef.current = [];
+    segmentCountRef.current = 0;
+    segmentUploadsRef.current = [];
     console.log("Frontend: Attempting to start recording...");
 
     try {
       const stream = await navigator.mediaDevices.getUserMedia({ audio: true });
-      mediaRecorderRef.current = new MediaRecorder(stream, { mimeType: 'audio/webm' });
-      mediaRecorderRef.current.ondataavailable = (event) => {
-        if (event.data.size > 0) audioChunksRef.current.push(event.data);
-      };
-      mediaRecorderRef.current.onstop = () => {
-        console.log("Frontend: MediaRecorder stopped (onstop event). Stream tracks stopping.");
-        if (mediaRecorderRef.current && mediaRecorderRef.current.stream) {
-            mediaRecorderRef.current.stream.getTracks().forEach(track => track.stop());
-        }
-      };
-      mediaRecorderRef.current.start();
+      startSegmentRecorder(stream);
       setIsRecording(true);
       setInterviewStatus("Listening... You have up to 5 minutes. Click 'Submit Answer' when done.");
       setError(''); // Clear any previous errors like "autoplay failed"
       startAnswerTimer();
+      segmentIntervalRef.current = setInterval(rotateAnswerSegment, ANSWER_SEGMENT_MS);
     } catch (err) {
       console.error('Frontend Error: Error accessing microphone:', err);
       setError('Could not access microphone. Please ensure it is connected and permissions are granted.');
@@ -172,9 +304,10 @@ function InterviewPanel({ sessionId, initialQuestion, initialAudioUrl, onEndInte
   // Dependencies for startRecording:
   // - interviewComplete: to prevent starting if interview is over.
   // - startAnswerTimer: it calls this function.
+  // - startSegmentRecorder, rotateAnswerSegment: record the answer in uploaded segments.
   // We are intentionally leaving out isRecording, isLoading, isAudioPlaying from deps
   // to make startRecording more stable and rely on the calling context (handleAudioEnded) to ensure preconditions.
-  }, [interviewComplete, startAnswerTimer]);
+  }, [interviewComplete, startAnswerTimer, startSegmentRecorder, rotateAnswerSegment]);
   // Effect to initialize the first question
   useEffect(() => {
     // This effect should only run when initialQuestion or initialAudioUrl actually change identity
@@ -212,11 +345,12 @@ function InterviewPanel({ sessionId, initialQuestion, initialAudioUrl, onEndInte
     console.log("Frontend: Audio effect - Setting up for question:", currentQuestion?.id);
     setIsLoading(true); // We are about to load/play
     setInterviewStatus("Loading question audio...");
-    audio.src = questionAudioUrl;
+    audio.src = withQuestionAudioFormat(questionAudioUrl);
     audio.load();
 
-    const handleCanPlayThrough = () => {
-      console.log("Frontend: Audio can play through for:", currentQuestion?.id);
+    // The audio is streamed while it is still being synthesized, so start as soon as playback is possible.
+    const handleCanPlay = () => {
+      console.log("Frontend: Audio can play for:", currentQuestion?.id);
       if (audio.paused && !isAudioPlaying && !interviewComplete && !isRecording && !audioPlayedForCurrentQuestionRef.current) {
         audioPlayedForCurrentQuestionRef.current = true; // Mark as attempted to play
         audio.play()
@@ -259,13 +393,13 @@ function InterviewPanel({ sessionId, initialQuestion, initialAudioUrl, onEndInte
       audioPlayedForCurrentQuestionRef.current = false; // Allow retry
     };
 
-    audio.addEventListener('canplaythrough', handleCanPlayThrough);
+    audio.addEventListener('canplay', handleCanPlay);
     audio.addEventListener('ended', handleAudioEnded);
     audio.addEventListener('error', handleError);
 
     return () => {
       console.log("Frontend: Cleaning up audio effect for:", currentQuestion?.id);
-      audio.removeEventListener('canplaythrough', handleCanPlayThrough);
+      audio.removeEventListener('canplay', handleCanPlay);
       audio.removeEventListener('ended', handleAudioEnded);
       audio.removeEventListener('error', handleError);
       if (audio.src && !audio.paused) {
@@ -362,10 +496,16 @@ function InterviewPanel({ sessionId, initialQuestion, initialAudioUrl, onEndInte
         {isLoading && !isRecording && !isAudioPlaying && <p className="text-xs mt-1 animate-pulse">Processing...</p>}
       </div>
 
-      {transcript && !isLoading && (
+      {transcript && (
           <div className="w-full bg-green-50 p-3 rounded-lg border border-green-200 shadow-sm">
             <p className="text-green-800 font-semibold text-sm">Your last transcribed answer:</p>
             <p className="text-green-700 text-xs mt-1 italic">{(transcript.length > 150 ? transcript.substring(0, 147) + "..." : transcript)}</p>
+            {feedback && (
+              <>
+                <p className="text-green-800 font-semibold text-sm mt-2">Feedback:</p>
+                <p className="text-green-700 text-xs mt-1 whitespace-pre-line">{feedback}</p>
+              </>
+            )}
           </div>
         )}
 
@@ -1,6 +1,8 @@
 import React, { useState } from 'react';
 import { CloudArrowUpIcon, BriefcaseIcon, AcademicCapIcon, BoltIcon } from '@heroicons/react/24/solid';
 
+const API_BASE_URL = 'http://127.0.0.1:8000';
+
 /**
  * UploadResume Component
  * Allows candidates to upload their resume file (PDF or DOCX) and
@@ -68,7 +70,7 @@ function UploadResume({ onStartInterview }) {
     console.log("Frontend: Sending resume and domain to backend...");
 
     try {
-      const response = await fetch('http://127.0.0.1:8000/start-interview', {
+      const response = await fetch(`${API_BASE_URL}/start-interview`, {
         method: 'POST',
         body: formData,
       });
@@ -81,13 +83,13 @@ function UploadResume({ onStartInterview }) {
       const data = await response.json();
       console.log('Frontend: Backend response:', data);
 
-      // Pass the raw base64 string to App.js, which will then format it into a data URI
+      // The question audio is streamed from the backend, so playback can start before synthesis finishes
       onStartInterview(
         data.resume_info,
         effectiveDomain,
         data.session_id,
         data.question,
-        data.audio_base64 // This is the raw base64 string from the backend
+        `${API_BASE_URL}${data.audio_url}`
       );
     } catch (err) {
       console.error('Frontend Error: Error starting interview:', err);